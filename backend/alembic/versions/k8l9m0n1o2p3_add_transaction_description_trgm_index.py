@@ -0,0 +1,32 @@
+"""add pg_trgm GIN index on transactions.description
+
+Revision ID: k8l9m0n1o2p3
+Revises: j7k8l9m0n1o2
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = 'k8l9m0n1o2p3'
+down_revision = 'j7k8l9m0n1o2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Trigram indexes are PostgreSQL-only; other dialects fall back to LIKE scans
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_transactions_description_trgm',
+        'transactions',
+        ['description'],
+        postgresql_using='gin',
+        postgresql_ops={'description': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_transactions_description_trgm', table_name='transactions')
@@ -0,0 +1,41 @@
+"""add debt payment link index and debt_due_status table
+
+Revision ID: l9m0n1o2p3q4
+Revises: k8l9m0n1o2p3
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'l9m0n1o2p3q4'
+down_revision = 'k8l9m0n1o2p3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # ── transactions: "was this debt paid this month" range lookups ───────────
+    op.create_index(
+        'ix_transactions_debt_payment_link_date',
+        'transactions',
+        ['debt_payment_link', 'date'],
+    )
+
+    # ── debt_due_status: precomputed due-soon rows ────────────────────────────
+    op.create_table(
+        'debt_due_status',
+        sa.Column('debt_id',         sa.Integer(), nullable=False, primary_key=True),
+        sa.Column('user_id',         sa.Integer(), nullable=False),
+        sa.Column('due_on',          sa.Date(),    nullable=False),
+        sa.Column('paid_this_month', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('computed_on',     sa.Date(),    nullable=False),
+        sa.ForeignKeyConstraint(['debt_id'], ['debts.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+    )
+    op.create_index('ix_debt_due_status_user_id', 'debt_due_status', ['user_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_debt_due_status_user_id', table_name='debt_due_status')
+    op.drop_table('debt_due_status')
+    op.drop_index('ix_transactions_debt_payment_link_date', table_name='transactions')
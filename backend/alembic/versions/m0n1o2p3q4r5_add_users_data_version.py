@@ -0,0 +1,21 @@
+"""add users.data_version
+
+Revision ID: m0n1o2p3q4r5
+Revises: l9m0n1o2p3q4
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'm0n1o2p3q4r5'
+down_revision = 'l9m0n1o2p3q4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('data_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'data_version')
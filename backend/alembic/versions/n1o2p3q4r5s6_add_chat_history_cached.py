@@ -0,0 +1,21 @@
+"""add chat_history.cached
+
+Revision ID: n1o2p3q4r5s6
+Revises: m0n1o2p3q4r5
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'n1o2p3q4r5s6'
+down_revision = 'm0n1o2p3q4r5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('chat_history', sa.Column('cached', sa.Boolean(), nullable=False, server_default=sa.false()))
+
+
+def downgrade() -> None:
+    op.drop_column('chat_history', 'cached')
@@ -0,0 +1,27 @@
+"""add chat_history.timings and chat_history.llm_calls
+
+Also indexes chat_history.created_at for the /chatbot/stats time window.
+
+Revision ID: o2p3q4r5s6t7
+Revises: n1o2p3q4r5s6
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'o2p3q4r5s6t7'
+down_revision = 'n1o2p3q4r5s6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('chat_history', sa.Column('timings', sa.JSON(), nullable=True))
+    op.add_column('chat_history', sa.Column('llm_calls', sa.JSON(), nullable=True))
+    op.create_index('ix_chat_history_created_at', 'chat_history', ['created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_chat_history_created_at', table_name='chat_history')
+    op.drop_column('chat_history', 'llm_calls')
+    op.drop_column('chat_history', 'timings')
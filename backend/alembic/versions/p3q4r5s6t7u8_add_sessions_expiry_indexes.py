@@ -0,0 +1,25 @@
+"""index sessions.expires_at and (user_id, expires_at)
+
+Backs the chunked expired-session purge and the per-user live-session cap.
+
+Revision ID: p3q4r5s6t7u8
+Revises: o2p3q4r5s6t7
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'p3q4r5s6t7u8'
+down_revision = 'o2p3q4r5s6t7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_sessions_expires_at', 'sessions', ['expires_at'])
+    op.create_index('ix_sessions_user_id_expires_at', 'sessions', ['user_id', 'expires_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sessions_user_id_expires_at', table_name='sessions')
+    op.drop_index('ix_sessions_expires_at', table_name='sessions')
@@ -3,6 +3,7 @@ from fastapi import Response, Cookie
 from app.users.auth_google import verify_google_token
 from app.core.config import GOOGLE_CLIENT_ID, IS_PRODUCTION
 from app.users.service import get_user_by_email, create_user
+from app.core.auth import forget_session
 from app.sessions.service import create_session
 from app.sessions.models import Session as SessionModel
 from app.core.dependencies import get_db
@@ -74,12 +75,13 @@ def logout(
         response.delete_cookie("session_id")
         return {"message": "Logged out"}
 
-    # Delete session from DB
+    # Delete session from DB, then from this worker's auth cache
     session = db.query(SessionModel).filter_by(session_id=session_id).first()
 
     if session:
         db.delete(session)
         db.commit()
+    forget_session(session_id)
 
     # Clear cookie
     response.delete_cookie("session_id")
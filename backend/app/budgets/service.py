@@ -4,6 +4,7 @@ from app.budgets.models import Budget
 from app.budgets.schemas import BudgetCreate, BudgetUpdate, BudgetStatusResponse
 from app.transactions.models import Transaction
 from app.transactions.filters import category_spending_filter
+from app.users.service import bump_data_version
 from decimal import Decimal
 from datetime import datetime
 
@@ -25,6 +26,7 @@ def create_budget(db: Session, user_id: int, budget_data: BudgetCreate) -> Budge
         month=budget_data.month
     )
     db.add(budget)
+    bump_data_version(db, user_id)
     db.commit()
     db.refresh(budget)
     return budget
@@ -40,11 +42,13 @@ def get_budget_by_id(db: Session, budget_id: int) -> Budget | None:
 
 def update_budget(db: Session, budget: Budget, update_data: BudgetUpdate) -> Budget:
     budget.monthly_limit = update_data.monthly_limit
+    bump_data_version(db, budget.user_id)
     db.commit()
     db.refresh(budget)
     return budget
 
 def delete_budget(db: Session, budget: Budget) -> None:
+    bump_data_version(db, budget.user_id)
     db.delete(budget)
     db.commit()
 
@@ -15,13 +15,14 @@ def categorize_with_overrides(
 
     Priority:
       1. User's manual category_overrides (category_source='manual', confidence=1.0)
+         — type-only overrides (category='', see store_type_override) are skipped
       2. ML model prediction             (category_source='ml',     if confidence >= 0.7)
       3. Rule-based categorization       (category_source='rule')
     """
     upper = description.upper()
     overrides = get_user_overrides(db, user_id)
     for override in overrides:
-        if override.description_pattern.upper() in upper:
+        if override.category and override.description_pattern.upper() in upper:
             return override.category, "manual", 1.0
 
     # ── ML prediction ─────────────────────────────────────────────────────────
@@ -39,6 +40,78 @@ def categorize_with_overrides(
     return category, "rule", confidence
 
 
+def categorize_batch(
+    db: Session, user_id: int, descriptions: list[str]
+) -> list[tuple[str, str, float]]:
+    """
+    Batch version of categorize_with_overrides() with the same priority chain
+    (type-only overrides are skipped there too).
+
+    Overrides are loaded once, and the ML model is loaded once and scored on
+    all unique descriptions in a single call — instead of one override query
+    and one model load per transaction.
+    """
+    unique = list(dict.fromkeys(descriptions))
+    overrides = [
+        (o.description_pattern.upper(), o.category)
+        for o in get_user_overrides(db, user_id)
+        if o.category
+    ]
+
+    results: dict[str, tuple[str, str, float]] = {}
+    pending: list[str] = []
+    for description in unique:
+        upper = description.upper()
+        for pattern, category in overrides:
+            if pattern in upper:
+                results[description] = (category, "manual", 1.0)
+                break
+        else:
+            pending.append(description)
+
+    # ── ML prediction ─────────────────────────────────────────────────────────
+    try:
+        from app.ml.categorizer import predict_batch as ml_predict_batch
+        ml_results = ml_predict_batch(db, user_id, pending) if pending else None
+        if ml_results is not None:
+            remaining = []
+            for description, (ml_category, ml_confidence) in zip(pending, ml_results):
+                if ml_confidence >= 0.7:
+                    results[description] = (ml_category, "ml", ml_confidence)
+                else:
+                    remaining.append(description)
+            pending = remaining
+    except Exception:
+        pass  # never let ML errors block the import flow
+
+    for description in pending:
+        category, confidence = categorize_transaction(description)
+        results[description] = (category, "rule", confidence)
+
+    return [results[d] for d in descriptions]
+
+
+def get_type_overrides_batch(
+    db: Session, user_id: int, descriptions: list[str]
+) -> list[str | None]:
+    """Batch version of get_type_override(): one override query for all descriptions."""
+    overrides = [
+        (o.description_pattern.upper(), o.transaction_type)
+        for o in get_user_overrides(db, user_id)
+        if o.transaction_type
+    ]
+    if not overrides:
+        return [None] * len(descriptions)
+
+    found: dict[str, str | None] = {}
+    for description in dict.fromkeys(descriptions):
+        upper = description.upper()
+        found[description] = next(
+            (txn_type for pattern, txn_type in overrides if pattern in upper), None
+        )
+    return [found[d] for d in descriptions]
+
+
 def store_category_override(
     db: Session, user_id: int, description_pattern: str, category: str
 ) -> CategoryOverride:
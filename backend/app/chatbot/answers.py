@@ -0,0 +1,214 @@
+"""
+Templated answers for intents whose calculation already is the answer.
+
+budget_check, comparison, spending_analysis and savings_projection reduce to
+exact figures in app.chatbot.engine.run_calculation; asking the LLM to phrase
+them costs a second round trip (about a second) and can misquote the numbers.
+render_answer() builds the reply straight from the calculation dict instead.
+Open-ended intents (what_if, debt_question, general_tips) still go to the
+LLM, as does any question sent with use_llm=true.
+
+Wording lives in data/answer_templates.json (str.format placeholders).  Point
+CHATBOT_ANSWER_TEMPLATES at a JSON file with the same shape to override
+individual phrases; keys it leaves out keep the bundled wording.
+"""
+import json
+import os
+from functools import lru_cache
+
+from app.core.config import CHATBOT_ANSWER_TEMPLATES
+
+TEMPLATES_PATH = os.path.join(os.path.dirname(__file__), "data", "answer_templates.json")
+
+
+def load_templates() -> dict[str, dict[str, str]]:
+    return _load_templates(CHATBOT_ANSWER_TEMPLATES)
+
+
+@lru_cache(maxsize=4)
+def _load_templates(override_path: str | None) -> dict[str, dict[str, str]]:
+    with open(TEMPLATES_PATH, encoding="utf-8") as f:
+        templates = json.load(f)
+    if override_path:
+        with open(override_path, encoding="utf-8") as f:
+            for intent, phrases in json.load(f).items():
+                templates.setdefault(intent, {}).update(phrases)
+    return templates
+
+
+def _money(n: float) -> str:
+    return f"-${-n:,.2f}" if n < 0 else f"${n:,.2f}"
+
+
+def _pct(n: float) -> str:
+    return f"{abs(n):.1f}%"
+
+
+def _join(items: list[str]) -> str:
+    if len(items) <= 1:
+        return "".join(items)
+    return ", ".join(items[:-1]) + " and " + items[-1]
+
+
+def _mentioned(names, message: str) -> str | None:
+    """The longest category name that appears in the question, if any."""
+    text = message.lower()
+    hits = [n for n in names if n and n.lower() in text]
+    return max(hits, key=len) if hits else None
+
+
+# ── Per-intent renderers ─────────────────────────────────────────────────────
+
+def _budget_check(t: dict, calc: dict, message: str) -> str:
+    if calc["no_budgets_configured"]:
+        return t["none_configured"]
+
+    month = calc["current_month"]
+    items = calc["over_budget_items"] + calc["on_track_items"]
+
+    def fields(b: dict) -> dict:
+        return {
+            "category":  b["category"],
+            "spent":     _money(b["spent"]),
+            "limit":     _money(b["limit"]),
+            "pct_used":  f"{b['pct_used']:.0f}",
+            "remaining": _money(abs(b["limit"] - b["spent"])),
+            "month":     month,
+        }
+
+    asked = _mentioned([b["category"] for b in items], message)
+    if asked:
+        b = next(b for b in items if b["category"] == asked)
+        return t["single_over" if b["over"] else "single_on_track"].format(**fields(b))
+
+    if not calc["over_budget_count"]:
+        return t["all_on_track"].format(total_budgets=calc["total_budgets"], month=month)
+
+    parts = [t["some_over"].format(
+        over_budget_count=calc["over_budget_count"],
+        total_budgets=calc["total_budgets"],
+        over_items=_join([t["item"].format(**fields(b)) for b in calc["over_budget_items"]]),
+        month=month,
+    )]
+    if calc["on_track_count"]:
+        parts.append(t["others_on_track"].format(on_track_count=calc["on_track_count"]))
+    return " ".join(parts)
+
+
+def _comparison(t: dict, calc: dict, message: str) -> str:
+    fields = {
+        "current_spending": _money(calc["current_spending"]),
+        "month":            calc["current_month"],
+    }
+    change = calc["pct_change_vs_last_month"]
+    if change is None:
+        parts = [t["no_previous"].format(**fields)]
+    elif abs(change) < 0.5:
+        parts = [t["flat"].format(**fields)]
+    else:
+        parts = [t["up" if change > 0 else "down"].format(pct=_pct(change), **fields)]
+
+    if len(calc["trend"]) > 1:
+        parts.append(t["trend"].format(trend=", ".join(
+            f"{e['month']} {_money(e['spending'])}" for e in calc["trend"]
+        )))
+    return " ".join(parts)
+
+
+def _merchant_spending(t: dict, matches: dict) -> str:
+    fields = {
+        "merchants": _join([term.title() for term in matches["query_terms"]]),
+        "period":    matches["period"],
+    }
+    if not matches["count"]:
+        return t["merchant_none"].format(**fields)
+    parts = [t["merchant"].format(
+        spent=_money(matches["total_spent"]),
+        transactions=f"{matches['count']} transaction{'s' if matches['count'] != 1 else ''}",
+        last_date=matches["last_date"],
+        **fields,
+    )]
+    if matches["total_received"]:
+        parts.append(t["merchant_refunds"].format(received=_money(matches["total_received"])))
+    return " ".join(parts)
+
+
+def _spending_analysis(t: dict, calc: dict, message: str) -> str:
+    if calc.get("matching_transactions"):
+        return _merchant_spending(t, calc["matching_transactions"])
+
+    month = calc["current_month"]
+    total = calc["total_spending"]
+    if total <= 0:
+        return t["none"].format(month=month)
+
+    parts = [t["total"].format(
+        total_spending=_money(total),
+        credit_card_spending=_money(calc["credit_card_spending"]),
+        chequing_spending=_money(calc["chequing_spending"]),
+        month=month,
+    )]
+
+    ranked = calc["by_category_ranked"]
+    asked = _mentioned(ranked, message)
+    top = {"name": asked, "amount": ranked[asked]} if asked else calc["top_category"]
+    if top:
+        parts.append(t["top"].format(
+            name=top["name"],
+            amount=_money(top["amount"]),
+            share=f"{top['amount'] / total * 100:.0f}",
+        ))
+        if not asked:
+            others = [f"{name} {_money(amount)}" for name, amount in list(ranked.items())[1:4]]
+            if others:
+                parts.append(t["ranked"].format(others=_join(others)))
+
+    change = calc["pct_change_vs_last_month"]
+    if change is not None and abs(change) >= 0.5:
+        parts.append(t["up" if change > 0 else "down"].format(pct=_pct(change)))
+    return " ".join(parts)
+
+
+def _savings_projection(t: dict, calc: dict, message: str) -> str:
+    if "error" in calc:
+        return t["no_income"]
+
+    savings = calc["monthly_savings"]
+    fields = {
+        "monthly_income":   _money(calc["monthly_income"]),
+        "monthly_spending": _money(calc["monthly_spending"]),
+    }
+    if savings >= 0:
+        parts = [t["saving"].format(
+            monthly_savings=_money(savings),
+            savings_rate_pct=f"{calc['savings_rate_pct']:.1f}",
+            annual_savings_estimate=_money(calc["annual_savings_estimate"]),
+            **fields,
+        )]
+    else:
+        parts = [t["deficit"].format(
+            monthly_shortfall=_money(-savings),
+            annual_shortfall=_money(-calc["annual_savings_estimate"]),
+            **fields,
+        )]
+    if calc["income_is_estimated"]:
+        parts.append(t["estimated"])
+    return " ".join(parts)
+
+
+_RENDERERS = {
+    "budget_check":       _budget_check,
+    "comparison":         _comparison,
+    "spending_analysis":  _spending_analysis,
+    "savings_projection": _savings_projection,
+}
+
+TEMPLATED_INTENTS = frozenset(_RENDERERS)
+
+
+def render_answer(intent: str, calc: dict, message: str = "") -> str | None:
+    """The final answer for a templated intent, or None if the LLM should phrase it."""
+    renderer = _RENDERERS.get(intent)
+    if renderer is None:
+        return None
+    return renderer(load_templates()[intent], calc, message)
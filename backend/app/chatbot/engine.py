@@ -2,8 +2,9 @@
 Chatbot engine: intent-based calculation functions.
 
 Each function receives the full financial context dict and the user's raw
-message, and returns a structured dict with the computed figures.  The
-results are later passed to the AI to format a natural-language response.
+message, and returns a structured dict with the computed figures.  Results for
+the computable intents are rendered directly by app.chatbot.answers; the rest
+are passed to the AI to format a natural-language response.
 """
 
 INTENTS = {
@@ -17,8 +18,11 @@ INTENTS = {
 }
 
 
-def run_calculation(intent: str, ctx: dict, user_message: str) -> dict:
-    """Dispatch to the appropriate calculation function."""
+def run_calculation(intent: str, ctx: dict, user_message: str, matches: dict | None = None) -> dict:
+    """
+    Dispatch to the appropriate calculation function.  `matches` are the
+    transactions the question names (app.chatbot.retrieval), if any.
+    """
     _handlers = {
         "savings_projection": _savings_projection,
         "spending_analysis":  _spending_analysis,
@@ -29,7 +33,10 @@ def run_calculation(intent: str, ctx: dict, user_message: str) -> dict:
         "general_tips":       _general_tips,
     }
     handler = _handlers.get(intent, _general_tips)
-    return handler(ctx, user_message)
+    result = handler(ctx, user_message)
+    if matches:
+        result["matching_transactions"] = matches
+    return result
 
 
 # ── Individual handlers ──────────────────────────────────────────────────────
@@ -65,6 +72,7 @@ def _spending_analysis(ctx: dict, msg: str) -> dict:
     top = by_cat[0] if by_cat else None
 
     return {
+        "current_month":           ctx["current_month"],
         "total_spending":          sp["total"],
         "credit_card_spending":    sp["cc_spending"],
         "chequing_spending":       sp["chequing_spending"],
@@ -81,6 +89,7 @@ def _budget_check(ctx: dict, msg: str) -> dict:
     on_track = [b for b in ctx["budgets"] if not b["over"]]
 
     return {
+        "current_month":         ctx["current_month"],
         "total_budgets":         len(ctx["budgets"]),
         "on_track_count":        len(on_track),
         "over_budget_count":     len(over),
@@ -0,0 +1,225 @@
+"""
+In-process intent classifier for /chatbot/ask.
+
+Character n-gram TF-IDF + logistic regression, trained from the bundled
+labelled question set (data/intent_questions.csv) when the app starts (see
+app.main's lifespan), so no request pays for the fit on the event loop.  Questions the
+model is unsure about (top probability below INTENT_CONFIDENCE_THRESHOLD)
+return None and the router falls back to the LLM classifier.
+
+Scoring a single question through Pipeline.predict_proba costs ~1 ms, almost
+all of it sklearn input validation and sparse-matrix construction.  After
+fitting, the vocabulary, idf weights and coefficients are copied out and a
+question is scored with one analyzer pass and a small dense dot product
+(tens of microseconds, same probabilities).
+
+Offline report (bundled-set cross-validation, plus agreement with the LLM's
+labels from chat_history or a CSV of question,intent rows):
+
+    python -m app.chatbot.intent_classifier [--threshold 0.5] [--csv labels.csv] [--db]
+"""
+import argparse
+import csv
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+
+from app.chatbot.engine import INTENTS
+
+# ── Constants ──────────────────────────────────────────────────────────────────
+
+DATASET_PATH = os.path.join(os.path.dirname(__file__), "data", "intent_questions.csv")
+INTENT_CONFIDENCE_THRESHOLD = 0.5   # ~70% of questions, ~94% accurate (5-fold CV)
+
+
+@dataclass
+class IntentPrediction:
+    intent:     str
+    confidence: float
+
+
+def load_dataset(path: str = DATASET_PATH) -> tuple[list[str], list[str]]:
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = [r for r in csv.DictReader(f) if r["intent"] in INTENTS]
+    return [r["question"] for r in rows], [r["intent"] for r in rows]
+
+
+def build_pipeline() -> Pipeline:
+    return Pipeline([
+        ("tfidf", TfidfVectorizer(
+            analyzer="char_wb",   # robust to typos and missing punctuation
+            ngram_range=(2, 4),
+            sublinear_tf=True,
+        )),
+        ("clf", LogisticRegression(max_iter=2000, C=10.0)),
+    ])
+
+
+class IntentClassifier:
+    """A fitted pipeline flattened into plain lookups for fast single-question scoring."""
+
+    def __init__(self, pipeline: Pipeline):
+        tfidf: TfidfVectorizer = pipeline.named_steps["tfidf"]
+        clf: LogisticRegression = pipeline.named_steps["clf"]
+
+        self._analyze: Callable[[str], list[str]] = tfidf.build_analyzer()
+        self._vocabulary: dict[str, int] = tfidf.vocabulary_
+        self._idf = tfidf.idf_
+        self._coef_t = np.ascontiguousarray(clf.coef_.T)   # (features, classes)
+        self._intercept = clf.intercept_
+        self.classes: list[str] = clf.classes_.tolist()
+
+    @classmethod
+    def train(cls, questions: list[str], intents: list[str]) -> "IntentClassifier":
+        pipeline = build_pipeline()
+        pipeline.fit(questions, intents)
+        return cls(pipeline)
+
+    def predict_proba(self, message: str) -> np.ndarray:
+        counts: dict[int, int] = {}
+        for gram in self._analyze(message):
+            j = self._vocabulary.get(gram)
+            if j is not None:
+                counts[j] = counts.get(j, 0) + 1
+
+        logits = self._intercept.copy()
+        if counts:
+            idx = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+            tf = np.fromiter((1.0 + math.log(c) for c in counts.values()), dtype=float, count=len(counts))
+            weights = tf * self._idf[idx]
+            weights /= np.sqrt(weights @ weights)
+            logits += weights @ self._coef_t[idx]
+
+        logits -= logits.max()
+        proba = np.exp(logits)
+        return proba / proba.sum()
+
+    def predict(self, message: str) -> IntentPrediction:
+        proba = self.predict_proba(message)
+        top = int(proba.argmax())
+        return IntentPrediction(intent=self.classes[top], confidence=float(proba[top]))
+
+
+# ── Shared instance ────────────────────────────────────────────────────────────
+
+_classifier: IntentClassifier | None = None
+_classifier_lock = threading.Lock()
+
+
+def get_classifier() -> IntentClassifier:
+    """
+    Train on the bundled set on first call (~100 ms) and reuse afterwards;
+    the app's lifespan makes that first call off the event loop at startup.
+    """
+    global _classifier
+    with _classifier_lock:
+        if _classifier is None:
+            _classifier = IntentClassifier.train(*load_dataset())
+        return _classifier
+
+
+def classify_intent(
+    message: str,
+    threshold: float = INTENT_CONFIDENCE_THRESHOLD,
+) -> IntentPrediction | None:
+    """Local prediction, or None if its confidence is below `threshold`."""
+    prediction = get_classifier().predict(message)
+    return prediction if prediction.confidence >= threshold else None
+
+
+# ── Offline report ─────────────────────────────────────────────────────────────
+
+def _report(name: str, labels: list[str], predictions: list[IntentPrediction], threshold: float) -> None:
+    confident = [(p, y) for p, y in zip(predictions, labels) if p.confidence >= threshold]
+    agree_all = sum(p.intent == y for p, y in zip(predictions, labels))
+    agree_confident = sum(p.intent == y for p, y in confident)
+
+    print(f"\n{name}: {len(labels)} questions")
+    if not labels:
+        return
+    print(f"  top-1 agreement (all):          {agree_all / len(labels):6.1%}")
+    print(f"  handled locally (≥ {threshold:.2f}):      {len(confident) / len(labels):6.1%}")
+    if confident:
+        print(f"  agreement on local answers:     {agree_confident / len(confident):6.1%}")
+    print(f"  {'intent':<20} {'n':>4} {'local':>7} {'agree':>7}")
+    for intent in sorted(INTENTS):
+        rows = [(p, y) for p, y in zip(predictions, labels) if y == intent]
+        local = [(p, y) for p, y in rows if p.confidence >= threshold]
+        agree = sum(p.intent == y for p, y in local)
+        local_pct = f"{len(local) / len(rows):.0%}" if rows else "-"
+        agree_pct = f"{agree / len(local):.0%}" if local else "-"
+        print(f"  {intent:<20} {len(rows):>4} {local_pct:>7} {agree_pct:>7}")
+
+
+def _chat_history_labels(limit: int) -> tuple[list[str], list[str]]:
+    from app.database.session import SessionLocal  # deferred: reads DATABASE_URL
+    from app.chatbot.models import ChatHistory
+    # Import every model so relationship() targets resolve
+    from app.users import models as _users  # noqa: F401
+    from app.transactions import models as _transactions  # noqa: F401
+    from app.bank_statements import models as _statements  # noqa: F401
+    from app.categorization import models as _categorization  # noqa: F401
+    from app.budgets import models as _budgets  # noqa: F401
+    from app.debts import models as _debts  # noqa: F401
+
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(ChatHistory.message, ChatHistory.intent)
+            .filter(ChatHistory.intent.in_(INTENTS))
+            .order_by(ChatHistory.id.desc())
+            .limit(limit)
+            .all()
+        )
+    finally:
+        db.close()
+    return [r.message for r in rows], [r.intent for r in rows]
+
+
+def main() -> None:
+    from sklearn.model_selection import StratifiedKFold
+
+    parser = argparse.ArgumentParser(description="Offline accuracy report for the local intent classifier.")
+    parser.add_argument("--threshold", type=float, default=INTENT_CONFIDENCE_THRESHOLD)
+    parser.add_argument("--csv", help="CSV of question,intent rows labelled by the LLM classifier")
+    parser.add_argument("--db", action="store_true", help="compare against intents stored in chat_history")
+    parser.add_argument("--limit", type=int, default=5000, help="max chat_history rows (newest first)")
+    args = parser.parse_args()
+
+    questions, intents = load_dataset()
+
+    # 5-fold cross-validation on the bundled set
+    predictions: list[IntentPrediction | None] = [None] * len(questions)
+    folds = StratifiedKFold(n_splits=5, shuffle=True, random_state=0)
+    for train_idx, test_idx in folds.split(questions, intents):
+        model = IntentClassifier.train([questions[i] for i in train_idx], [intents[i] for i in train_idx])
+        for i in test_idx:
+            predictions[i] = model.predict(questions[i])
+    _report("bundled set, 5-fold CV", intents, predictions, args.threshold)
+
+    model = get_classifier()
+    sources = []
+    if args.csv:
+        sources.append((f"LLM labels from {args.csv}", *load_dataset(args.csv)))
+    if args.db:
+        sources.append(("LLM labels from chat_history", *_chat_history_labels(args.limit)))
+    for name, texts, labels in sources:
+        _report(name, labels, [model.predict(t) for t in texts], args.threshold)
+
+    start = time.perf_counter()
+    for q in questions:
+        model.predict(q)
+    per_question = (time.perf_counter() - start) / len(questions)
+    print(f"\nlatency: {per_question * 1e6:.0f} µs per question")
+
+
+if __name__ == "__main__":
+    main()
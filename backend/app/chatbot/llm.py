@@ -0,0 +1,176 @@
+"""
+Process-wide async LLM client for the chatbot.
+
+- One AsyncOpenAI client per process (per event loop), so requests reuse the
+  SDK's keep-alive HTTP connection pool instead of opening a fresh TLS
+  connection every time.
+- At most `max_concurrency` upstream requests are in flight.  Callers beyond
+  that wait for a slot up to `queue_timeout` seconds, then get LLMOverloaded
+  (the router turns it into a 503) instead of piling up unbounded.
+- 429, 5xx and connection errors are retried up to `max_retries` times with
+  full-jitter exponential backoff, honouring Retry-After.  The SDK's own
+  retries are disabled so every attempt is bounded and counted here.
+- Queue depth, waits, attempts and upstream latency go to
+  app.chatbot.metrics.llm_metrics.
+
+asyncio primitives and httpx pools belong to the loop that created them, so
+the client and semaphore are rebuilt if a different loop calls in (the test
+client and scripts each run their own).
+"""
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+import anyio
+
+from app.chatbot.metrics import LLMMetrics, llm_metrics
+from app.core.config import (
+    LLM_MAX_CONCURRENCY,
+    LLM_MAX_RETRIES,
+    LLM_QUEUE_TIMEOUT,
+    LLM_REQUEST_TIMEOUT,
+    OPENAI_API_KEY,
+    OPENAI_BASE_URL,
+)
+
+BACKOFF_BASE = 0.5    # seconds; attempt n waits up to BACKOFF_BASE · 2^n
+BACKOFF_CAP = 8.0
+
+
+class LLMOverloaded(Exception):
+    """No upstream slot became free within the queue timeout."""
+
+
+def _retryable(exc: Exception) -> bool:
+    import openai
+
+    if isinstance(exc, openai.APIConnectionError):   # includes timeouts
+        return True
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code == 429 or exc.status_code >= 500
+    return False
+
+
+def _retry_after(exc: Exception) -> float | None:
+    response = getattr(exc, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class LLMClient:
+    def __init__(
+        self,
+        api_key: str | None,
+        base_url: str | None = None,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        queue_timeout: float = LLM_QUEUE_TIMEOUT,
+        max_retries: int = LLM_MAX_RETRIES,
+        request_timeout: float = LLM_REQUEST_TIMEOUT,
+        metrics: LLMMetrics = llm_metrics,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.max_retries = max_retries
+        self.request_timeout = request_timeout
+        self.metrics = metrics
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._client = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    def _bind(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            from openai import AsyncOpenAI
+
+            self._client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                max_retries=0,
+                timeout=self.request_timeout,
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._client, self._semaphore
+
+    @asynccontextmanager
+    async def _slot(self) -> AsyncIterator[None]:
+        _, semaphore = self._bind()
+        self.metrics.enqueued()
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.metrics.dequeued(time.monotonic() - start, admitted=False)
+            raise LLMOverloaded(f"no LLM slot free within {self.queue_timeout:g}s")
+        except BaseException:
+            self.metrics.dequeued(time.monotonic() - start, admitted=False)
+            raise
+        self.metrics.dequeued(time.monotonic() - start, admitted=True)
+        try:
+            yield
+        finally:
+            semaphore.release()
+            self.metrics.released()
+
+    async def _with_retries(self, call: Callable[[], Awaitable[Any]]) -> Any:
+        for attempt in range(self.max_retries + 1):
+            start = time.monotonic()
+            try:
+                result = await call()
+            except Exception as exc:
+                self.metrics.attempt(time.monotonic() - start, retry=attempt > 0)
+                if attempt == self.max_retries or not _retryable(exc):
+                    self.metrics.failed()
+                    raise
+                delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+                retry_after = _retry_after(exc)
+                if retry_after is not None:
+                    delay = max(delay, min(retry_after, BACKOFF_CAP))
+                await asyncio.sleep(delay)
+            else:
+                self.metrics.attempt(time.monotonic() - start, retry=attempt > 0)
+                return result
+
+    async def complete(self, **kwargs) -> Any:
+        """chat.completions.create(**kwargs) through the pool; returns the completion."""
+        client, _ = self._bind()
+        async with self._slot():
+            return await self._with_retries(lambda: client.chat.completions.create(**kwargs))
+
+    @asynccontextmanager
+    async def stream(self, **kwargs) -> AsyncIterator[Any]:
+        """
+        Streaming chat completion.  The slot is held until the block exits and
+        the upstream stream is always closed, even when the caller is
+        cancelled (client disconnect).  Only opening the stream is retried.
+        """
+        client, _ = self._bind()
+        async with self._slot():
+            stream = await self._with_retries(
+                lambda: client.chat.completions.create(stream=True, **kwargs)
+            )
+            try:
+                yield stream
+            finally:
+                with anyio.CancelScope(shield=True):
+                    await stream.close()
+
+
+_llm: LLMClient | None = None
+
+
+def get_llm() -> LLMClient:
+    """The process-wide client.  Raises ImportError if openai is not installed."""
+    global _llm
+    import openai  # noqa: F401 — fail fast before any request is queued
+
+    if _llm is None:
+        _llm = LLMClient(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL)
+    return _llm
@@ -0,0 +1,221 @@
+"""
+Chatbot instrumentation.
+
+LLMMetrics / StageMetrics: in-process counters and latency samples (LLM pool
+health, per-intent stage timings).  Per-process like app.core.cache (each
+uvicorn worker reports its own numbers).  Latencies keep the most recent
+SAMPLE_WINDOW observations, so percentiles describe recent traffic rather
+than the whole uptime.
+
+RequestTrace: one /chatbot/ask request's stage timings and LLM token usage,
+stored on its chat_history row.  summarize_traces() turns a user's rows into
+per-intent histograms for GET /chatbot/stats.
+"""
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+import numpy as np
+
+SAMPLE_WINDOW = 1000
+
+# Stages of one request, in pipeline order.  "persist" times the row's INSERT
+# (the commit that follows is not included).
+STAGES = ("context", "intent", "calculation", "formatting", "persist")
+HISTOGRAM_EDGES_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def _percentiles(samples: deque) -> dict:
+    if not samples:
+        return {"count": 0, "p50_ms": None, "p95_ms": None, "max_ms": None}
+    values = np.fromiter(samples, dtype=float, count=len(samples)) * 1000
+    p50, p95 = np.percentile(values, (50, 95))
+    return {
+        "count":  len(values),
+        "p50_ms": round(float(p50), 1),
+        "p95_ms": round(float(p95), 1),
+        "max_ms": round(float(values.max()), 1),
+    }
+
+
+class LLMMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests        = 0   # calls made through the pooled client
+            self.attempts        = 0   # upstream HTTP attempts, retries included
+            self.retries         = 0
+            self.failures        = 0   # calls that gave up (after retries)
+            self.rejected        = 0   # timed out waiting for a slot
+            self.in_flight       = 0
+            self.queue_depth     = 0
+            self.max_queue_depth = 0
+            self._upstream: deque = deque(maxlen=SAMPLE_WINDOW)
+            self._queue_wait: deque = deque(maxlen=SAMPLE_WINDOW)
+
+    def enqueued(self) -> None:
+        with self._lock:
+            self.requests += 1
+            self.queue_depth += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+
+    def dequeued(self, waited: float, admitted: bool) -> None:
+        with self._lock:
+            self.queue_depth -= 1
+            self._queue_wait.append(waited)
+            if admitted:
+                self.in_flight += 1
+            else:
+                self.rejected += 1
+
+    def released(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def attempt(self, latency: float, retry: bool) -> None:
+        with self._lock:
+            self.attempts += 1
+            self.retries += retry
+            self._upstream.append(latency)
+
+    def failed(self) -> None:
+        with self._lock:
+            self.failures += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "requests":         self.requests,
+                "attempts":         self.attempts,
+                "retries":          self.retries,
+                "failures":         self.failures,
+                "rejected":         self.rejected,
+                "in_flight":        self.in_flight,
+                "queue_depth":      self.queue_depth,
+                "max_queue_depth":  self.max_queue_depth,
+                "upstream_latency": _percentiles(self._upstream),
+                "queue_wait":       _percentiles(self._queue_wait),
+            }
+
+
+llm_metrics = LLMMetrics()
+
+
+class StageMetrics:
+    """Recent stage timings per (intent, stage) for this worker."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples: dict[tuple[str, str], deque] = defaultdict(lambda: deque(maxlen=SAMPLE_WINDOW))
+
+    def record(self, intent: str | None, timings: dict[str, float]) -> None:
+        with self._lock:
+            for stage, ms in timings.items():
+                self._samples[(intent or "unknown", stage)].append(ms / 1000)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            samples = {key: deque(values) for key, values in self._samples.items()}
+        out: dict[str, dict] = defaultdict(dict)
+        for (intent, stage), values in sorted(samples.items()):
+            out[intent][stage] = _percentiles(values)
+        return dict(out)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+
+stage_metrics = StageMetrics()
+
+
+# ── Per-request trace ────────────────────────────────────────────────────────
+
+class RequestTrace:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.timings: dict[str, float] = {}    # stage -> ms
+        self.llm_calls: list[dict] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.timings[name] = round(self.timings.get(name, 0.0) + elapsed, 2)
+
+    def llm_call(self, call: str, model: str | None, usage) -> None:
+        """Record one upstream call; `usage` is the SDK's CompletionUsage (or None)."""
+        self.llm_calls.append({
+            "call":              call,
+            "model":             model,
+            "prompt_tokens":     getattr(usage, "prompt_tokens", None),
+            "completion_tokens": getattr(usage, "completion_tokens", None),
+        })
+
+    def stored_timings(self) -> dict[str, float]:
+        """Stage timings plus the total so far, as written to chat_history."""
+        return {**self.timings, "total": round((time.perf_counter() - self.started) * 1000, 2)}
+
+
+# ── Aggregation for /chatbot/stats ───────────────────────────────────────────
+
+def _histogram(values_ms: list[float]) -> dict:
+    arr = np.asarray(values_ms, dtype=float)
+    counts = np.histogram(arr, bins=(0, *HISTOGRAM_EDGES_MS, np.inf))[0]
+    p50, p95 = np.percentile(arr, (50, 95))
+    return {
+        "count":   len(arr),
+        "p50_ms":  round(float(p50), 1),
+        "p95_ms":  round(float(p95), 1),
+        "max_ms":  round(float(arr.max()), 1),
+        "buckets": [
+            {"le_ms": edge, "count": int(n)}
+            for edge, n in zip((*HISTOGRAM_EDGES_MS, None), counts)
+        ],
+    }
+
+
+def summarize_traces(rows: Iterable) -> dict:
+    """
+    Per-intent aggregates over chat_history rows with (intent, cached,
+    timings, llm_calls): stage latency histograms and token totals per model.
+    """
+    stages: dict[str, dict[str, list[float]]] = defaultdict(lambda: defaultdict(list))
+    counts: dict[str, list[int]] = defaultdict(lambda: [0, 0])
+    tokens: dict[str, dict[str, dict]] = defaultdict(dict)
+
+    for row in rows:
+        intent = row.intent or "unknown"
+        counts[intent][0] += 1
+        counts[intent][1] += bool(row.cached)
+        for stage, ms in (row.timings or {}).items():
+            stages[intent][stage].append(ms)
+        for call in row.llm_calls or []:
+            model = tokens[intent].setdefault(call.get("model") or "unknown", {
+                "calls": 0, "prompt_tokens": 0, "completion_tokens": 0,
+            })
+            model["calls"] += 1
+            model["prompt_tokens"] += call.get("prompt_tokens") or 0
+            model["completion_tokens"] += call.get("completion_tokens") or 0
+
+    order = {stage: i for i, stage in enumerate((*STAGES, "total"))}
+    return {
+        intent: {
+            "requests": total,
+            "cached":   cached,
+            "stages": {
+                stage: _histogram(values)
+                for stage, values in sorted(stages[intent].items(), key=lambda kv: order.get(kv[0], 99))
+            },
+            "tokens": tokens[intent],
+        }
+        for intent, (total, cached) in sorted(counts.items())
+    }
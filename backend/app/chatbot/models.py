@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import JSON, Boolean, Column, Integer, String, Text, DateTime, ForeignKey, false
 from sqlalchemy.orm import relationship
 
 from app.database.base import Base
@@ -14,6 +14,11 @@ class ChatHistory(Base):
     message    = Column(Text, nullable=False)
     intent     = Column(String(64), nullable=True)
     response   = Column(Text, nullable=False)
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    cached     = Column(Boolean, nullable=False, default=False, server_default=false())  # served from the answer cache
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    # Instrumentation (app.chatbot.metrics.RequestTrace)
+    timings    = Column(JSON, nullable=True)   # stage -> ms, plus "total"
+    llm_calls  = Column(JSON, nullable=True)   # [{call, model, prompt_tokens, completion_tokens}]
 
     user = relationship("User", back_populates="chat_history")
@@ -0,0 +1,135 @@
+"""
+Compact, intent-aware prompt context for the chatbot's LLM calls.
+
+The full snapshot (build_context_text) runs to several hundred tokens, most
+of it irrelevant to any one question: a budget question does not need the
+payoff order, a debt question does not need last week's coffee.  Each intent
+gets only the context sections in INTENT_SECTIONS, most useful first, and the
+prompt is held to CHATBOT_PROMPT_TOKEN_BUDGET:
+
+  - The calculation result is always sent whole, as compact JSON — it holds
+    the figures the answer is built on.
+  - Context sections fill the rest of the budget in priority order; the
+    first one that does not fit is cut at a line boundary, and the rest are
+    dropped.
+
+Tokens are counted with tiktoken (the gpt-4o encoding) when it is installed.
+Without it, a word/punctuation count stands in — close enough for budgeting
+figures-heavy text, but prompts may land a little over or under.
+"""
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from app.core.config import CHATBOT_PROMPT_TOKEN_BUDGET
+
+logger = logging.getLogger(__name__)
+
+TOKENIZER_ENCODING = "o200k_base"   # gpt-4o / gpt-4o-mini
+CLASSIFY_TOKEN_BUDGET = 200         # context for the intent classifier call
+
+# Sections from app.chatbot.service.CONTEXT_SECTIONS, most relevant first
+INTENT_SECTIONS = {
+    "savings_projection": ("income", "spending", "cash_flow", "trend"),
+    "spending_analysis":  ("spending", "categories", "transactions", "trend"),
+    "budget_check":       ("budgets", "spending", "categories"),
+    "comparison":         ("spending", "trend", "categories"),
+    "what_if":            ("income", "spending", "categories", "cash_flow", "budgets", "debts"),
+    "debt_question":      ("debts", "payoff", "income", "cash_flow"),
+    "general_tips":       ("spending", "categories", "cash_flow", "budgets", "income", "debts", "trend"),
+}
+CLASSIFY_SECTIONS = ("spending", "categories", "budgets", "debts")
+
+_WORD_OR_PUNCT = re.compile(r"\w+|[^\w\s]")
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(TOKENIZER_ENCODING)
+    except Exception:   # not installed, or the BPE file cannot be fetched
+        return None
+
+
+def count_tokens(text: str) -> int:
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return len(_WORD_OR_PUNCT.findall(text))
+
+
+@dataclass
+class PromptContext:
+    context_text: str
+    calc_json: str
+    tokens: int                               # context_text + calc_json
+    sections: list[str] = field(default_factory=list)
+    dropped: list[str] = field(default_factory=list)
+
+
+def compact_json(data: dict) -> str:
+    return json.dumps(data, separators=(",", ":"), default=str)
+
+
+def _fit_sections(
+    sections: dict[str, list[str]],
+    names: tuple[str, ...],
+    budget: int,
+) -> tuple[str, int, list[str], list[str]]:
+    """Pack `names` (in order) into `budget` tokens: (text, tokens, included, dropped)."""
+    blocks: list[str] = []
+    used = 0
+    included: list[str] = []
+    dropped: list[str] = []
+    for name in names:
+        lines = [line.lstrip("\n") for line in sections.get(name, []) if line]
+        if not lines:
+            continue
+        if dropped:          # an earlier section was already cut — keep priorities strict
+            dropped.append(name)
+            continue
+        kept: list[str] = []
+        for line in lines:
+            cost = count_tokens(line) + 1   # + newline
+            if used + cost > budget:
+                break
+            kept.append(line)
+            used += cost
+        if len(kept) > 1 or (kept and len(lines) == 1):   # a bare heading is not worth sending
+            blocks.append("\n".join(kept))
+            included.append(name)
+        if len(kept) < len(lines):
+            dropped.append(name)
+    return "\n".join(blocks), used, included, dropped
+
+
+def build_prompt_context(
+    sections: dict[str, list[str]],
+    intent: str | None,
+    calc_result: dict | None = None,
+    budget: int = CHATBOT_PROMPT_TOKEN_BUDGET,
+) -> PromptContext:
+    """
+    Context for one LLM call.  intent=None builds the (smaller) context for
+    the intent classifier; otherwise INTENT_SECTIONS[intent] plus the
+    calculation result.
+    """
+    if intent is None:
+        names, calc_json = CLASSIFY_SECTIONS, ""
+        budget = min(budget, CLASSIFY_TOKEN_BUDGET)
+    else:
+        names = INTENT_SECTIONS.get(intent, INTENT_SECTIONS["general_tips"])
+        calc_json = compact_json(calc_result or {})
+    calc_tokens = count_tokens(calc_json) if calc_json else 0
+
+    text, used, included, dropped = _fit_sections(sections, names, max(budget - calc_tokens, 0))
+    prompt = PromptContext(text, calc_json, used + calc_tokens, included, dropped)
+    logger.info(
+        "chatbot prompt intent=%s tokens=%d budget=%d sections=%s dropped=%s",
+        intent or "<classify>", prompt.tokens, budget,
+        ",".join(included) or "-", ",".join(dropped) or "-",
+    )
+    return prompt
@@ -0,0 +1,313 @@
+"""
+Per-user BM25 index over transaction descriptions, for chatbot questions
+about specific merchants ("how much did I spend at Costco last year?").
+
+The financial context only carries monthly aggregates and the last 15
+transactions.  retrieve_transactions() finds the descriptions the question
+names, filters their transactions to the period it mentions, and returns
+aggregates plus the most recent few — a handful of prompt tokens however
+long the history is.
+
+The index lives in-process, one per user:
+
+  - Documents are distinct descriptions, not transactions, so a merchant
+    seen 300 times is scored once and common merchants do not drown out the
+    idf of rarer ones.  Each document keeps its transactions' (date, amount,
+    category) rows for aggregation.
+  - It is tagged with the users.data_version it reflects and rebuilt when
+    the version moves on.  /transactions/confirm appends the rows it just
+    inserted instead (add_transactions), so uploading a statement does not
+    force a full rebuild on the next question.
+"""
+import math
+import re
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.transactions.models import Transaction
+from app.users.models import User
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+MIN_RELATIVE_SCORE = 0.5    # keep descriptions scoring at least half the best match
+MAX_TRANSACTIONS = 10       # most recent matches included verbatim
+MAX_DESCRIPTIONS = 5
+INDEX_CACHE_TTL = 30 * 60   # seconds
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:['&][a-z0-9]+)*")
+
+# Question and finance words that never name a merchant
+STOPWORDS = frozenset("""
+    a about afford all am amount an and any are as at average be been bought
+    budget budgets buy by can categories category charge charged charges compared
+    cost costs day days debt debts did do does each every expenses for from get
+    go going got had has have how i in income is it last let loan me money month
+    months much my of often on or over paid past pay per purchase purchases
+    save saving savings since so spend spending spent that the there this those
+    times tips to total transactions versus vs was we week weeks were what when
+    where which who with year years you your ytd
+""".split())
+
+_MONTHS = {
+    name: i
+    for i, names in enumerate(
+        [("january", "jan"), ("february", "feb"), ("march", "mar"), ("april", "apr"),
+         ("may",), ("june", "jun"), ("july", "jul"), ("august", "aug"),
+         ("september", "sep", "sept"), ("october", "oct"), ("november", "nov"),
+         ("december", "dec")],
+        start=1,
+    )
+    for name in names
+}
+
+
+def tokenize(text: str) -> list[str]:
+    """Lower-case word tokens; bare numbers (store #, card digits) are dropped."""
+    return [t for t in _TOKEN.findall(text.lower()) if not t.isdigit()]
+
+
+def _query_terms(message: str, ignore: set[str]) -> list[str]:
+    terms = []
+    for t in tokenize(message):
+        if t in STOPWORDS or t in _MONTHS or t in ignore or len(t) < 2 or t in terms:
+            continue
+        terms.append(t)
+    return terms
+
+
+# ── Period parsing ────────────────────────────────────────────────────────────
+
+@dataclass
+class Period:
+    label: str                  # reads after a verb: "in 2025", "so far in 2026"
+    start: date | None = None
+    end: date | None = None
+
+    def contains(self, d: date) -> bool:
+        return (self.start is None or d >= self.start) and (self.end is None or d <= self.end)
+
+
+def _month_end(year: int, month: int) -> date:
+    return (date(year + month // 12, month % 12 + 1, 1)) - timedelta(days=1)
+
+
+def parse_period(message: str, today: date) -> Period:
+    """The time window a question asks about; all time when it names none."""
+    text = message.lower()
+
+    if m := re.search(r"\b(?:last|past|previous)\s+(\d+)\s+(day|week|month|year)s?\b", text):
+        n, unit = int(m.group(1)), m.group(2)
+        days = {"day": 1, "week": 7, "month": 30, "year": 365}[unit] * n
+        return Period(f"in the last {n} {unit}s", today - timedelta(days=days), today)
+    if re.search(r"\blast year\b", text):
+        y = today.year - 1
+        return Period(f"in {y}", date(y, 1, 1), date(y, 12, 31))
+    if re.search(r"\b(?:this year|ytd|year to date)\b", text):
+        return Period(f"so far in {today.year}", date(today.year, 1, 1), today)
+    if re.search(r"\blast month\b", text):
+        first = today.replace(day=1)
+        prev = first - timedelta(days=1)
+        return Period(f"in {prev:%Y-%m}", prev.replace(day=1), prev)
+    if re.search(r"\bthis month\b", text):
+        return Period(f"so far in {today:%Y-%m}", today.replace(day=1), today)
+
+    year = re.search(r"\b(20\d{2})\b", text)
+    for word in tokenize(text):
+        if word in _MONTHS:
+            month = _MONTHS[word]
+            y = int(year.group(1)) if year else (today.year if month <= today.month else today.year - 1)
+            return Period(f"in {y:04d}-{month:02d}", date(y, month, 1), _month_end(y, month))
+    if year:
+        y = int(year.group(1))
+        return Period(f"in {y}", date(y, 1, 1), date(y, 12, 31))
+    return Period("across all your transactions")
+
+
+# ── Index ─────────────────────────────────────────────────────────────────────
+
+@dataclass
+class _Row:
+    id: int
+    date: date
+    amount: Decimal
+    category: str
+
+
+@dataclass
+class TransactionIndex:
+    data_version: int
+    descriptions: list[str] = field(default_factory=list)
+    rows: list[list[_Row]] = field(default_factory=list)
+    lengths: list[int] = field(default_factory=list)
+    total_length: int = 0
+    postings: dict[str, dict[int, int]] = field(default_factory=lambda: defaultdict(dict))
+    category_tokens: set[str] = field(default_factory=set)
+    _doc_ids: dict[str, int] = field(default_factory=dict)
+    _seen: set[int] = field(default_factory=set)
+
+    def add(self, txn_id: int, txn_date: date, description: str, amount, category: str) -> None:
+        if txn_id in self._seen:
+            return
+        self._seen.add(txn_id)
+        self.category_tokens.update(tokenize(category or ""))
+        doc = self._doc_ids.get(description)
+        if doc is None:
+            doc = self._doc_ids[description] = len(self.descriptions)
+            tokens = tokenize(description)
+            self.descriptions.append(description)
+            self.rows.append([])
+            self.lengths.append(len(tokens))
+            self.total_length += len(tokens)
+            for token in tokens:
+                self.postings[token][doc] = self.postings[token].get(doc, 0) + 1
+        self.rows[doc].append(_Row(txn_id, txn_date, Decimal(str(amount)), category))
+
+    def search(self, terms: list[str]) -> list[tuple[int, float]]:
+        """(document, BM25 score) for documents matching any term, best first."""
+        n_docs = len(self.descriptions)
+        if not n_docs:
+            return []
+        avg_len = self.total_length / n_docs or 1.0
+        scores: dict[int, float] = defaultdict(float)
+        for term in terms:
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+            for doc, tf in posting.items():
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[doc] / avg_len)
+                scores[doc] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+_indexes = TTLCache(maxsize=256, ttl=INDEX_CACHE_TTL)
+_build_lock = threading.Lock()
+
+
+def build_index(db: Session, user_id: int, data_version: int) -> TransactionIndex:
+    index = TransactionIndex(data_version)
+    rows = (
+        db.query(Transaction.id, Transaction.date, Transaction.description,
+                 Transaction.amount, Transaction.category)
+        .filter(Transaction.user_id == user_id)
+        .order_by(Transaction.id)
+        .yield_per(2000)
+    )
+    for row in rows:
+        index.add(*row)
+    return index
+
+
+def get_index(db: Session, user: User) -> TransactionIndex:
+    index = _indexes.get(user.id)
+    if index is None or index.data_version != user.data_version:
+        with _build_lock:
+            index = _indexes.get(user.id)
+            if index is None or index.data_version != user.data_version:
+                index = build_index(db, user.id, user.data_version)
+                _indexes.set(user.id, index)
+    return index
+
+
+def add_transactions(
+    user_id: int,
+    rows: list[tuple[int, date, str, Decimal, str]],
+    from_version: int,
+    to_version: int,
+    bumps: int,
+) -> None:
+    """
+    Append freshly inserted (id, date, description, amount, category) rows to
+    the user's index, if it is still at `from_version`, and mark it current as
+    of `to_version`.  `bumps` is how many data_version bumps the caller's own
+    commits made; if the version moved further, or the index has drifted,
+    some other write happened and the index is dropped and rebuilt on the
+    next question instead.
+    """
+    with _build_lock:
+        index = _indexes.get(user_id)
+        if index is None:
+            return
+        if index.data_version != from_version or to_version != from_version + bumps:
+            _indexes.pop(user_id)
+            return
+        for row in rows:
+            index.add(*row)
+        index.data_version = to_version
+
+
+# ── Retrieval ─────────────────────────────────────────────────────────────────
+
+def _money(d: Decimal) -> float:
+    return float(d.quantize(Decimal("0.01")))
+
+
+def retrieve_transactions(
+    db: Session,
+    user: User,
+    message: str,
+    today: date | None = None,
+) -> dict | None:
+    """
+    Aggregates over the transactions whose descriptions the question names,
+    within the period it mentions; None when it names no known description.
+    Category names are ignored — the context already aggregates by category.
+    """
+    if not _query_terms(message, set()):
+        return None
+    index = get_index(db, user)
+    terms = _query_terms(message, index.category_tokens)
+    hits = index.search(terms)
+    if not hits:
+        return None
+    best = hits[0][1]
+    docs = [doc for doc, score in hits if score >= best * MIN_RELATIVE_SCORE]
+
+    period = parse_period(message, today or date.today())
+    matched_terms = [t for t in terms if any(doc in index.postings.get(t, {}) for doc in docs)]
+
+    spent = received = Decimal("0")
+    by_description: dict[str, list] = {}
+    by_month: dict[str, Decimal] = defaultdict(Decimal)
+    rows: list[tuple[_Row, str]] = []
+    for doc in docs:
+        description = index.descriptions[doc]
+        for row in index.rows[doc]:
+            if not period.contains(row.date):
+                continue
+            rows.append((row, description))
+            entry = by_description.setdefault(description, [0, Decimal("0")])
+            entry[0] += 1
+            if row.amount < 0:
+                spent -= row.amount
+                entry[1] -= row.amount
+                by_month[f"{row.date:%Y-%m}"] -= row.amount
+            else:
+                received += row.amount
+
+    rows.sort(key=lambda item: (item[0].date, item[0].id), reverse=True)
+    ranked = sorted(by_description.items(), key=lambda item: (-item[1][1], item[0]))
+    return {
+        "query_terms":       matched_terms,
+        "period":            period.label,
+        "count":             len(rows),
+        "total_spent":       _money(spent),
+        "total_received":    _money(received),
+        "first_date":        str(rows[-1][0].date) if rows else None,
+        "last_date":         str(rows[0][0].date) if rows else None,
+        "by_description": [
+            {"description": d, "count": count, "spent": _money(amount)}
+            for d, (count, amount) in ranked[:MAX_DESCRIPTIONS]
+        ],
+        "by_month": {m: _money(v) for m, v in sorted(by_month.items())[-12:]},
+        "transactions": [
+            {"date": str(r.date), "description": d, "amount": _money(r.amount), "category": r.category}
+            for r, d in rows[:MAX_TRANSACTIONS]
+        ],
+    }
@@ -1,23 +1,49 @@
 """
-Chatbot router — POST /chatbot/ask, GET /chatbot/history.
+Chatbot router — POST /chatbot/ask, POST /chatbot/ask/stream, GET /chatbot/history,
+GET /chatbot/metrics, GET /chatbot/stats.
 
-Two-step GPT pipeline:
-  1. Classify intent (gpt-4o-mini, temperature=0, max_tokens=20)
-  2. Format natural-language answer (gpt-4o-mini, temperature=0.7, max_tokens=350)
+Pipeline:
+  1. Classify intent — in-process classifier (app.chatbot.intent_classifier);
+     only low-confidence questions go to gpt-4o-mini (temperature=0, max_tokens=20)
+  2. Format natural-language answer — templated from the calculation for
+     computable intents (app.chatbot.answers); open-ended intents, or any
+     question sent with use_llm=true, go to gpt-4o-mini (temperature=0.7,
+     max_tokens=350)
+
+LLM calls go through the pooled async client in app.chatbot.llm.
 """
 import json
-from datetime import datetime
+import logging
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.core.auth import get_current_user
+from app.core.auth import get_current_user, with_current_data_version
 from app.core.config import OPENAI_API_KEY
 from app.core.dependencies import get_db
+from app.core.responses import ORJSONResponse
 from app.chatbot.models import ChatHistory
 from app.chatbot.schemas import ChatRequest, ChatResponse, ChatHistoryItem
-from app.chatbot.service import get_financial_context, build_context_text
+from app.chatbot.service import (
+    cache_answer,
+    cache_intent,
+    get_cached_answer,
+    get_cached_intent,
+    get_context_snapshot,
+)
 from app.chatbot.engine import run_calculation, INTENTS
+from app.chatbot.answers import render_answer
+from app.chatbot.intent_classifier import classify_intent
+from app.chatbot.llm import LLMClient, LLMOverloaded, get_llm
+from app.chatbot.metrics import RequestTrace, llm_metrics, stage_metrics, summarize_traces
+from app.chatbot.prompt import build_prompt_context
+from app.chatbot.retrieval import retrieve_transactions
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/chatbot", tags=["chatbot"])
 
@@ -47,114 +73,352 @@ _RESPONSE_SYSTEM = (
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
-def _openai_client():
-    """Return an initialised OpenAI client or raise 503."""
+def _llm() -> LLMClient:
+    """Return the pooled LLM client or raise 503."""
     if not OPENAI_API_KEY:
         raise HTTPException(
             status_code=503,
             detail="OpenAI API key is not configured. Add OPENAI_API_KEY to .env.",
         )
     try:
-        from openai import OpenAI
-        return OpenAI(api_key=OPENAI_API_KEY)
+        return get_llm()
     except ImportError:
         raise HTTPException(status_code=503, detail="openai package not installed.")
 
 
-def _classify_intent(client, user_message: str, context_text: str) -> str:
-    resp = client.chat.completions.create(
+def _intent_messages(user_message: str, sections: dict) -> list[dict]:
+    context_text = build_prompt_context(sections, None).context_text
+    return [
+        {"role": "system", "content": _INTENT_SYSTEM},
+        {
+            "role": "user",
+            "content": (
+                f"Financial context:\n{context_text}\n\n"
+                f"User question: {user_message}"
+            ),
+        },
+    ]
+
+
+def _response_messages(
+    user_message: str,
+    intent: str,
+    sections: dict,
+    calc_result: dict,
+) -> list[dict]:
+    prompt = build_prompt_context(sections, intent, calc_result)
+    user_content = (
+        f"User question: {user_message}\n\n"
+        f"Financial context:\n{prompt.context_text}\n\n"
+        f"Calculated analysis (intent: {intent}):\n"
+        f"{prompt.calc_json}\n\n"
+        "Please provide a clear, helpful response to the user's question."
+    )
+    return [
+        {"role": "system", "content": _RESPONSE_SYSTEM},
+        {"role": "user",   "content": user_content},
+    ]
+
+
+async def _classify_intent(llm: LLMClient, user_message: str, sections: dict, trace: RequestTrace) -> str:
+    resp = await llm.complete(
         model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": _INTENT_SYSTEM},
-            {
-                "role": "user",
-                "content": (
-                    f"Financial context:\n{context_text}\n\n"
-                    f"User question: {user_message}"
-                ),
-            },
-        ],
+        messages=_intent_messages(user_message, sections),
         max_tokens=20,
         temperature=0,
     )
-    raw = resp.choices[0].message.content.strip().lower()
+    trace.llm_call("intent", resp.model, resp.usage)
+    raw = (resp.choices[0].message.content or "").strip().lower()
     return raw if raw in INTENTS else "general_tips"
 
 
-def _format_response(
-    client,
+async def _format_response(
+    llm: LLMClient,
     user_message: str,
     intent: str,
-    context_text: str,
+    sections: dict,
     calc_result: dict,
+    trace: RequestTrace,
 ) -> str:
-    user_content = (
-        f"User question: {user_message}\n\n"
-        f"Financial context:\n{context_text}\n\n"
-        f"Calculated analysis (intent: {intent}):\n"
-        f"{json.dumps(calc_result, indent=2, default=str)}\n\n"
-        "Please provide a clear, helpful response to the user's question."
-    )
-    resp = client.chat.completions.create(
+    resp = await llm.complete(
         model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": _RESPONSE_SYSTEM},
-            {"role": "user",   "content": user_content},
-        ],
+        messages=_response_messages(user_message, intent, sections, calc_result),
         max_tokens=350,
         temperature=0.7,
     )
+    trace.llm_call("format", resp.model, resp.usage)
     return resp.choices[0].message.content.strip()
 
 
+async def _prepare(db: Session, user, message: str, trace: RequestTrace) -> tuple[str, dict, dict]:
+    """Steps 1–3 shared by /ask and /ask/stream: (intent, context sections, calc_result)."""
+    # 1. Build financial context (cached until the user's data changes)
+    with trace.stage("context"):
+        context, sections = await run_in_threadpool(get_context_snapshot, db, user)
+
+    # 2. Classify intent (LLM only when the local classifier is unsure)
+    with trace.stage("intent"):
+        local = classify_intent(message)
+        if local:
+            intent = local.intent
+        else:
+            intent = get_cached_intent(user, message)
+            if intent is None:
+                intent = await _classify_intent(_llm(), message, sections, trace)
+                cache_intent(user, message, intent)
+
+    # 3. Run calculation, with the transactions the question names (if any)
+    with trace.stage("calculation"):
+        matches = await run_in_threadpool(retrieve_transactions, db, user, message)
+        calc_result = run_calculation(intent, context, message, matches)
+    return intent, sections, calc_result
+
+
+def _save_history(
+    db: Session,
+    user_id: int,
+    message: str,
+    intent: str,
+    response: str,
+    trace: RequestTrace,
+    cached: bool = False,
+) -> ChatHistory:
+    entry = ChatHistory(
+        user_id=user_id,
+        message=message,
+        intent=intent,
+        response=response,
+        cached=cached,
+        llm_calls=trace.llm_calls or None,
+        created_at=datetime.utcnow(),
+    )
+    # Time the INSERT, then stamp the timings (persist included) on the row
+    # in the same transaction.
+    with trace.stage("persist"):
+        db.add(entry)
+        db.flush()
+    entry.timings = trace.stored_timings()
+    db.commit()
+    db.refresh(entry)
+    stage_metrics.record(intent, trace.timings)
+    return entry
+
+
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="The assistant is busy right now. Please try again in a moment.",
+        headers={"Retry-After": "5"},
+    )
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _stream_answer(
+    llm: LLMClient,
+    db: Session,
+    user,
+    message: str,
+    intent: str,
+    sections: dict,
+    calc_result: dict,
+    trace: RequestTrace,
+) -> AsyncIterator[str]:
+    """
+    SSE body for /ask/stream: `intent`, then one `token` event per content
+    delta, then `done` once the answer is stored and cached (or `error`).
+
+    Starlette cancels this generator when the client disconnects; leaving
+    llm.stream() then closes the upstream stream, so the OpenAI request is
+    aborted rather than read to completion in the background.  Answers cut
+    short by a disconnect are not saved.
+    """
+    yield _sse("intent", {"intent": intent})
+
+    parts: list[str] = []
+    model = usage = None
+    try:
+        with trace.stage("formatting"):
+            async with llm.stream(
+                model="gpt-4o-mini",
+                messages=_response_messages(message, intent, sections, calc_result),
+                max_tokens=350,
+                temperature=0.7,
+                stream_options={"include_usage": True},
+            ) as stream:
+                async for chunk in stream:
+                    model = chunk.model or model
+                    usage = chunk.usage or usage   # sent on a final, choice-less chunk
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        parts.append(delta)
+                        yield _sse("token", {"text": delta})
+    except LLMOverloaded:
+        yield _sse("error", {"detail": _busy().detail})
+        return
+    except Exception as e:   # upstream failure mid-answer: tell the client, save nothing
+        logger.warning("chatbot stream failed: %s", e)
+        yield _sse("error", {"detail": "The assistant is unavailable right now. Please try again."})
+        return
+
+    trace.llm_call("format", model, usage)
+    response_text = "".join(parts).strip()
+    cache_answer(user, intent, message, response_text)
+    entry = await run_in_threadpool(_save_history, db, user.id, message, intent, response_text, trace)
+    yield _sse("done", {"response": response_text, "created_at": entry.created_at, "cached": False})
+
+
+async def _ready_stream(
+    db: Session,
+    user_id: int,
+    message: str,
+    intent: str,
+    response_text: str,
+    cached: bool,
+    trace: RequestTrace,
+) -> AsyncIterator[str]:
+    """/ask/stream for a templated or cached answer: the same events, one `token` carrying it all."""
+    yield _sse("intent", {"intent": intent})
+    yield _sse("token", {"text": response_text})
+    entry = await run_in_threadpool(
+        _save_history, db, user_id, message, intent, response_text, trace, cached
+    )
+    yield _sse("done", {"response": response_text, "created_at": entry.created_at, "cached": cached})
+
+
+def _ready_answer(user, payload: ChatRequest, intent: str, calc_result: dict) -> tuple[str | None, bool]:
+    """(answer, cached) when no LLM call is needed: a template, or a cached LLM answer."""
+    if not payload.use_llm:
+        templated = render_answer(intent, calc_result, payload.message)
+        if templated is not None:
+            return templated, False
+    cached = get_cached_answer(user, intent, payload.message)
+    return cached, cached is not None
+
+
 # ── Endpoints ─────────────────────────────────────────────────────────────────
 
 @router.post("/ask", response_model=ChatResponse)
-def ask_chatbot(
+async def ask_chatbot(
     payload: ChatRequest,
     current_user=Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     if not current_user:
         raise HTTPException(status_code=401, detail="Not authenticated")
+    # Context, retrieval and answer caches are keyed on the live data_version
+    current_user = await run_in_threadpool(with_current_data_version, db, current_user)
 
-    client = _openai_client()
-
-    # 1. Build financial context
-    context      = get_financial_context(db, current_user.id)
-    context_text = build_context_text(context)
-
-    # 2. Classify intent
-    intent = _classify_intent(client, payload.message, context_text)
-
-    # 3. Run calculation
-    calc_result = run_calculation(intent, context, payload.message)
+    trace = RequestTrace()
+    try:
+        intent, sections, calc_result = await _prepare(db, current_user, payload.message, trace)
 
-    # 4. Format natural-language response
-    response_text = _format_response(
-        client, payload.message, intent, context_text, calc_result
-    )
+        # 4. Format natural-language response (templated unless open-ended or
+        #    opted in; LLM answers are reused while the user's data is unchanged)
+        with trace.stage("formatting"):
+            response_text, cached = _ready_answer(current_user, payload, intent, calc_result)
+            if response_text is None:
+                response_text = await _format_response(
+                    _llm(), payload.message, intent, sections, calc_result, trace
+                )
+                cache_answer(current_user, intent, payload.message, response_text)
+    except LLMOverloaded:
+        raise _busy()
 
     # 5. Persist
-    entry = ChatHistory(
-        user_id=current_user.id,
-        message=payload.message,
-        intent=intent,
-        response=response_text,
-        created_at=datetime.utcnow(),
+    entry = await run_in_threadpool(
+        _save_history, db, current_user.id, payload.message, intent, response_text, trace, cached
     )
-    db.add(entry)
-    db.commit()
-    db.refresh(entry)
 
     return ChatResponse(
         intent=intent,
         response=response_text,
+        cached=cached,
         created_at=entry.created_at,
     )
 
 
-@router.get("/history", response_model=list[ChatHistoryItem])
+@router.post("/ask/stream")
+async def ask_chatbot_stream(
+    payload: ChatRequest,
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Same pipeline as /ask, but the answer is streamed as server-sent events
+    while the model generates it (see _stream_answer for the event types).
+    """
+    if not current_user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    # Context, retrieval and answer caches are keyed on the live data_version
+    current_user = await run_in_threadpool(with_current_data_version, db, current_user)
+
+    trace = RequestTrace()
+    try:
+        intent, sections, calc_result = await _prepare(db, current_user, payload.message, trace)
+    except LLMOverloaded:
+        raise _busy()
+
+    with trace.stage("formatting"):
+        response_text, cached = _ready_answer(current_user, payload, intent, calc_result)
+    if response_text is not None:
+        body = _ready_stream(db, current_user.id, payload.message, intent, response_text, cached, trace)
+    else:
+        body = _stream_answer(
+            _llm(), db, current_user, payload.message, intent, sections, calc_result, trace
+        )
+
+    return StreamingResponse(
+        body,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/metrics")
+def get_llm_metrics(current_user=Depends(get_current_user)):
+    """
+    Per-worker live metrics: LLM pool (queue depth, retries, upstream
+    latency) and recent stage timings per intent.
+    """
+    if not current_user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    return {**llm_metrics.snapshot(), "stages": stage_metrics.snapshot()}
+
+
+@router.get("/stats")
+def get_chat_stats(
+    days: int = Query(7, ge=1, le=90),
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Per-intent latency histograms (context, intent, calculation, formatting,
+    persist, total) and LLM token usage per model over the current user's
+    requests in the last `days`, from the timings stored on chat_history
+    (across all workers).
+    """
+    if not current_user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+
+    since = datetime.utcnow() - timedelta(days=days)
+    rows = (
+        db.query(ChatHistory.intent, ChatHistory.cached, ChatHistory.timings, ChatHistory.llm_calls)
+        .filter(
+            ChatHistory.user_id == current_user.id,
+            ChatHistory.created_at >= since,
+            ChatHistory.timings.isnot(None),
+        )
+        .yield_per(1000)
+    )
+    return {"days": days, "intents": summarize_traces(rows)}
+
+
+@router.get("/history", response_model=list[ChatHistoryItem], response_class=ORJSONResponse)
 def get_history(
     current_user=Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -162,10 +426,18 @@ def get_history(
     if not current_user:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
-    return (
-        db.query(ChatHistory)
+    rows = (
+        db.query(
+            ChatHistory.id,
+            ChatHistory.message,
+            ChatHistory.intent,
+            ChatHistory.response,
+            ChatHistory.cached,
+            ChatHistory.created_at,
+        )
         .filter(ChatHistory.user_id == current_user.id)
         .order_by(ChatHistory.created_at.desc())
         .limit(20)
         .all()
     )
+    return ORJSONResponse([row._asdict() for row in rows])
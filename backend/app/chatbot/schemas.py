@@ -4,11 +4,13 @@ from pydantic import BaseModel
 
 class ChatRequest(BaseModel):
     message: str
+    use_llm: bool = False   # phrase computable answers with the LLM instead of a template
 
 
 class ChatResponse(BaseModel):
     intent: str | None
     response: str
+    cached: bool = False
     created_at: datetime
 
     class Config:
@@ -20,6 +22,7 @@ class ChatHistoryItem(BaseModel):
     message: str
     intent: str | None
     response: str
+    cached: bool = False
     created_at: datetime
 
     class Config:
@@ -2,45 +2,122 @@
 Chatbot service: build a rich financial context from the user's DB data
 and convert it to a readable text summary for the AI.
 """
+import re
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 from decimal import Decimal
+from typing import Callable
 
-from sqlalchemy.orm import Session
 from sqlalchemy import desc
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import SingletonThreadPool, StaticPool
 
+from app.core.cache import TTLCache
 from app.transactions.models import Transaction
 from app.insights.service import get_summary, get_trend, latest_month_with_data
 from app.budgets.service import get_budgets_status
-from app.debts.service import get_debts, get_debt_summary, get_payoff_plan
+from app.debts.service import get_debts, summarize_debts, summarize_payoff
+from app.users.models import User
 
+# ── Context snapshot cache ────────────────────────────────────────────────────
+#
+# Keyed by users.data_version (bumped on every transaction, budget, debt and
+# income write) and today's date (trend, payoff dates and "current month" are
+# relative to it), so a cached snapshot is never stale and follow-up
+# questions skip every query below.
 
-def get_financial_context(db: Session, user_id: int) -> dict:
-    """
-    Pull all relevant financial data for the user and return a structured dict.
+CONTEXT_CACHE_TTL = 30 * 60   # seconds
+_context_cache = TTLCache(maxsize=1024, ttl=CONTEXT_CACHE_TTL)
 
-    Uses the current month (based on most recent transaction).
+
+def get_context_snapshot(db: Session, user: User) -> tuple[dict, dict[str, list[str]]]:
+    """
+    Return (get_financial_context, build_context_sections) for `user`, cached.
+    Both are shared between requests and must not be mutated.
     """
-    year, month = latest_month_with_data(db, user_id)
-    month_str = f"{year:04d}-{month:02d}"
+    key = (user.id, user.data_version, date.today())
+    snapshot = _context_cache.get(key)
+    if snapshot is None:
+        # Older versions for this user can never be hit again
+        _context_cache.evict(lambda k: k[0] == user.id)
+        context = get_financial_context(db, user.id)
+        snapshot = (context, build_context_sections(context))
+        _context_cache.set(key, snapshot)
+    return snapshot
 
-    summary = get_summary(db, user_id, year, month)
-    budgets = get_budgets_status(db, user_id, month_str)
 
-    recent_txns = (
-        db.query(Transaction)
-        .filter(Transaction.user_id == user_id)
-        .order_by(desc(Transaction.date), desc(Transaction.id))
-        .limit(15)
-        .all()
-    )
+# ── Answer cache ──────────────────────────────────────────────────────────────
+#
+# LLM-phrased answers, per user, keyed by (intent, normalized question) and
+# valid for one (data_version, date) — the same inputs as the context above,
+# so a repeated question gets the answer the LLM would have been asked to
+# rephrase from identical figures.  The outer cache holds one small LRU per
+# user; a new data version or day replaces it wholesale.  Intents the LLM had
+# to classify are remembered too, so a hit costs no upstream call at all.
 
-    trend = get_trend(db, user_id)
+ANSWER_CACHE_TTL      = 30 * 60   # seconds
+ANSWER_CACHE_PER_USER = 64        # questions kept per user
+_answer_cache = TTLCache(maxsize=1024, ttl=ANSWER_CACHE_TTL)   # user_id -> (version, TTLCache)
 
-    debts_list   = get_debts(db, user_id)
-    debt_summary = get_debt_summary(db, user_id)
-    payoff       = get_payoff_plan(db, user_id, "avalanche", Decimal("0")) if debts_list else None
+_NON_WORD = re.compile(r"[^\w$%.]+")
+_THOUSANDS = re.compile(r"(?<=\d),(?=\d{3})")
+
+
+def normalize_question(message: str) -> str:
+    """Case-, punctuation- and whitespace-insensitive form of a question."""
+    text = _THOUSANDS.sub("", unicodedata.normalize("NFKC", message).casefold())
+    return " ".join(_NON_WORD.sub(" ", text).replace(". ", " ").split()).rstrip(".")
+
+
+def _user_answers(user: User, create: bool) -> TTLCache | None:
+    version = (user.data_version, date.today())
+    entry = _answer_cache.get(user.id)
+    if entry is None or entry[0] != version:
+        if not create:
+            return None
+        entry = (version, TTLCache(maxsize=ANSWER_CACHE_PER_USER, ttl=ANSWER_CACHE_TTL))
+    _answer_cache.set(user.id, entry)   # refresh the user's TTL on every write
+    return entry[1]
+
+
+def get_cached_intent(user: User, message: str) -> str | None:
+    answers = _user_answers(user, create=False)
+    return answers.get(("intent", normalize_question(message))) if answers else None
+
+
+def cache_intent(user: User, message: str, intent: str) -> None:
+    _user_answers(user, create=True).set(("intent", normalize_question(message)), intent)
+
+
+def get_cached_answer(user: User, intent: str, message: str) -> str | None:
+    answers = _user_answers(user, create=False)
+    return answers.get((intent, normalize_question(message))) if answers else None
+
+
+def cache_answer(user: User, intent: str, message: str, response: str) -> None:
+    _user_answers(user, create=True).set((intent, normalize_question(message)), response)
 
+
+# ── Context assembly ──────────────────────────────────────────────────────────
+#
+# The sections below are independent reads, so on a pooled engine each runs
+# on its own short-lived Session in _context_pool and the total wall time is
+# roughly the slowest section instead of the sum of all of them.  Single-
+# connection engines (in-memory SQLite: StaticPool / SingletonThreadPool)
+# cannot be shared across threads and assemble sequentially on the caller's
+# session.  Sections may read from slightly different snapshots if a write
+# lands mid-assembly; that write bumps data_version, so the mixed result is
+# cached under a key that is never looked up again.
+
+CONTEXT_WORKERS = 4
+_context_pool = ThreadPoolExecutor(max_workers=CONTEXT_WORKERS, thread_name_prefix="chat-context")
+
+
+def _summary_section(db: Session, user_id: int, year: int, month: int) -> dict:
+    summary = get_summary(db, user_id, year, month)
     return {
-        "current_month": month_str,
         "income": {
             "base_income":        float(summary.get("base_income") or 0),
             "side_income":        float(summary.get("side_income") or 0),
@@ -67,6 +144,11 @@ def get_financial_context(db: Session, user_id: int) -> dict:
             else None
         ),
         "pct_change": summary.get("previous_month_comparison"),
+    }
+
+
+def _budgets_section(db: Session, user_id: int, month_str: str) -> dict:
+    return {
         "budgets": [
             {
                 "category": b.category,
@@ -75,8 +157,20 @@ def get_financial_context(db: Session, user_id: int) -> dict:
                 "pct_used": b.percentage_used,
                 "over":     b.over_budget,
             }
-            for b in budgets
+            for b in get_budgets_status(db, user_id, month_str)
         ],
+    }
+
+
+def _recent_transactions_section(db: Session, user_id: int) -> dict:
+    recent_txns = (
+        db.query(Transaction)
+        .filter(Transaction.user_id == user_id)
+        .order_by(desc(Transaction.date), desc(Transaction.id))
+        .limit(15)
+        .all()
+    )
+    return {
         "recent_transactions": [
             {
                 "date":        str(t.date),
@@ -88,10 +182,24 @@ def get_financial_context(db: Session, user_id: int) -> dict:
             }
             for t in recent_txns
         ],
+    }
+
+
+def _trend_section(db: Session, user_id: int) -> dict:
+    return {
         "trend": [
             {"month": t["month"], "spending": float(t["spending"])}
-            for t in trend
+            for t in get_trend(db, user_id)
         ],
+    }
+
+
+def _debts_section(db: Session, user_id: int) -> dict:
+    debts_list   = get_debts(db, user_id)
+    payoff       = summarize_payoff(debts_list, "avalanche", Decimal("0")) if debts_list else None
+    debt_summary = summarize_debts(debts_list, avalanche=payoff)
+
+    return {
         "debts": {
             "count":                    len(debts_list),
             "total_debt":               float(debt_summary.total_debt),
@@ -122,127 +230,228 @@ def get_financial_context(db: Session, user_id: int) -> dict:
                     "months_to_payoff": d.months_to_payoff,
                     "total_interest":   float(d.total_interest),
                 }
-                for d in payoff.payoff_order
+                for d in payoff.outcomes
             ] if payoff else [],
         },
     }
 
 
-def build_context_text(ctx: dict) -> str:
+def _can_parallelize(db: Session) -> bool:
+    pool = db.get_bind().pool
+    return CONTEXT_WORKERS > 1 and not isinstance(pool, (StaticPool, SingletonThreadPool))
+
+
+def _run_isolated(engine: Engine, section: Callable[..., dict], *args) -> dict:
+    with Session(bind=engine) as session:
+        return section(session, *args)
+
+
+def get_financial_context(db: Session, user_id: int, parallel: bool | None = None) -> dict:
     """
-    Convert the financial context dict into a human-readable text block
-    suitable for including in an AI prompt.
+    Pull all relevant financial data for the user and return a structured dict.
+
+    Uses the current month (based on most recent transaction).  Sections run
+    concurrently on independent sessions when the engine allows it (see
+    above); pass parallel=False to force one session.
     """
-    def fmt(n):
-        if n is None:
-            return "N/A"
-        return f"${n:,.2f}"
+    if parallel is None:
+        parallel = _can_parallelize(db)
+
+    if not parallel:
+        year, month = latest_month_with_data(db, user_id)
+        month_str = f"{year:04d}-{month:02d}"
+        parts = [
+            _summary_section(db, user_id, year, month),
+            _budgets_section(db, user_id, month_str),
+            _recent_transactions_section(db, user_id),
+            _trend_section(db, user_id),
+            _debts_section(db, user_id),
+        ]
+    else:
+        engine = db.get_bind()
+        independent = [
+            _context_pool.submit(_run_isolated, engine, section, user_id)
+            for section in (_recent_transactions_section, _trend_section, _debts_section)
+        ]
+        # The month lookup gates summary and budgets; the rest are already running
+        year, month = latest_month_with_data(db, user_id)
+        month_str = f"{year:04d}-{month:02d}"
+        budgets = _context_pool.submit(_run_isolated, engine, _budgets_section, user_id, month_str)
+        parts = [_summary_section(db, user_id, year, month), budgets.result()]
+        parts.extend(f.result() for f in independent)
+
+    context = {"current_month": month_str}
+    for part in parts:
+        context.update(part)
+    return context
+
+
+def _fmt(n) -> str:
+    if n is None:
+        return "N/A"
+    return f"${n:,.2f}"
 
-    lines = [
-        f"FINANCIAL SNAPSHOT — {ctx['current_month']}",
-        "=" * 42,
-    ]
 
-    # ── Income ────────────────────────────────────────────────────────────────
+def _income_lines(ctx: dict) -> list[str]:
     inc = ctx["income"]
-    lines.append("\nINCOME:")
+    lines = ["\nINCOME:"]
     if inc["base_income"] > 0:
-        lines.append(f"  Base salary:        {fmt(inc['base_income'])}/month")
+        lines.append(f"  Base salary:        {_fmt(inc['base_income'])}/month")
     if inc["side_income"] > 0:
-        lines.append(f"  Side income:        {fmt(inc['side_income'])}/month")
+        lines.append(f"  Side income:        {_fmt(inc['side_income'])}/month")
     if inc["transaction_income"] > 0:
-        lines.append(f"  Chequing deposits:  {fmt(inc['transaction_income'])}")
+        lines.append(f"  Chequing deposits:  {_fmt(inc['transaction_income'])}")
     if inc["total_income"] is not None:
         est = " (manual income included)" if inc["is_estimated"] else ""
-        lines.append(f"  Total income:       {fmt(inc['total_income'])}{est}")
+        lines.append(f"  Total income:       {_fmt(inc['total_income'])}{est}")
     else:
         lines.append("  Total income:       N/A — no income data set")
+    return lines
 
-    # ── Spending ──────────────────────────────────────────────────────────────
+
+def _spending_lines(ctx: dict) -> list[str]:
     sp = ctx["spending"]
-    lines.append("\nSPENDING:")
-    lines.append(f"  Total:              {fmt(sp['total'])}")
-    lines.append(f"  Credit card:        {fmt(sp['cc_spending'])}")
-    lines.append(f"  Chequing:           {fmt(sp['chequing_spending'])}")
+    lines = [
+        "\nSPENDING:",
+        f"  Total:              {_fmt(sp['total'])}",
+        f"  Credit card:        {_fmt(sp['cc_spending'])}",
+        f"  Chequing:           {_fmt(sp['chequing_spending'])}",
+    ]
     if ctx.get("pct_change") is not None:
         direction = "↑" if ctx["pct_change"] > 0 else "↓"
         lines.append(f"  vs last month:      {direction} {abs(ctx['pct_change']):.1f}%")
+    return lines
 
-    # Top categories
-    if sp["by_category"]:
-        sorted_cats = sorted(sp["by_category"].items(), key=lambda x: x[1], reverse=True)[:5]
-        lines.append("\nTOP SPENDING CATEGORIES:")
-        for i, (cat, amt) in enumerate(sorted_cats, 1):
-            lines.append(f"  {i}. {cat}: {fmt(amt)}")
 
-    # Net cash flow
+def _category_lines(ctx: dict) -> list[str]:
+    by_category = ctx["spending"]["by_category"]
+    if not by_category:
+        return []
+    sorted_cats = sorted(by_category.items(), key=lambda x: x[1], reverse=True)[:5]
+    lines = ["\nTOP SPENDING CATEGORIES:"]
+    for i, (cat, amt) in enumerate(sorted_cats, 1):
+        lines.append(f"  {i}. {cat}: {_fmt(amt)}")
+    return lines
+
+
+def _cash_flow_lines(ctx: dict) -> list[str]:
     ncf = ctx.get("net_cash_flow")
-    lines.append(f"\nNET CASH FLOW: {fmt(ncf) if ncf is not None else 'N/A (no income data)'}")
-
-    # ── Budgets ───────────────────────────────────────────────────────────────
-    if ctx["budgets"]:
-        lines.append("\nBUDGET STATUS:")
-        for b in ctx["budgets"]:
-            status = "OVER BUDGET ⚠" if b["over"] else "on track ✓"
-            lines.append(
-                f"  {b['category']}: {fmt(b['spent'])} / {fmt(b['limit'])} "
-                f"({b['pct_used']:.0f}%) — {status}"
-            )
-    else:
-        lines.append("\nBUDGETS: None configured")
+    return [f"\nNET CASH FLOW: {_fmt(ncf) if ncf is not None else 'N/A (no income data)'}"]
+
+
+def _budget_lines(ctx: dict) -> list[str]:
+    if not ctx["budgets"]:
+        return ["\nBUDGETS: None configured"]
+    lines = ["\nBUDGET STATUS:"]
+    for b in ctx["budgets"]:
+        status = "OVER BUDGET ⚠" if b["over"] else "on track ✓"
+        lines.append(
+            f"  {b['category']}: {_fmt(b['spent'])} / {_fmt(b['limit'])} "
+            f"({b['pct_used']:.0f}%) — {status}"
+        )
+    return lines
+
 
-    # ── Recent transactions ───────────────────────────────────────────────────
+def _transaction_lines(ctx: dict) -> list[str]:
     recent = ctx["recent_transactions"]
-    if recent:
-        lines.append("\nRECENT TRANSACTIONS (last 5):")
-        for t in recent[:5]:
-            src = t["source"] or "unknown"
-            sign = "-" if t["amount"] < 0 else "+"
-            lines.append(
-                f"  {t['date']}: {t['description']} "
-                f"— {sign}{fmt(abs(t['amount']))} ({t['category']}, {src})"
-            )
+    if not recent:
+        return []
+    lines = ["\nRECENT TRANSACTIONS (last 5):"]
+    for t in recent[:5]:
+        src = t["source"] or "unknown"
+        sign = "-" if t["amount"] < 0 else "+"
+        lines.append(
+            f"  {t['date']}: {t['description']} "
+            f"— {sign}{_fmt(abs(t['amount']))} ({t['category']}, {src})"
+        )
+    return lines
+
+
+def _trend_lines(ctx: dict) -> list[str]:
+    if not ctx["trend"]:
+        return []
+    lines = ["\nSPENDING TREND (recent months):"]
+    for entry in ctx["trend"]:
+        lines.append(f"  {entry['month']}: {_fmt(entry['spending'])}")
+    return lines
 
-    # ── Spending trend ────────────────────────────────────────────────────────
-    if ctx["trend"]:
-        lines.append("\nSPENDING TREND (recent months):")
-        for entry in ctx["trend"]:
-            lines.append(f"  {entry['month']}: {fmt(entry['spending'])}")
 
-    # ── Debts ─────────────────────────────────────────────────────────────────
+def _debt_lines(ctx: dict) -> list[str]:
     debts = ctx.get("debts", {})
-    if debts.get("count", 0) > 0:
-        lines.append("\nDEBTS:")
-        lines.append(f"  Count:               {debts['count']} debt(s)")
-        lines.append(f"  Total debt:          {fmt(debts['total_debt'])}")
-        lines.append(f"  Monthly minimums:    {fmt(debts['total_minimum_payments'])}")
-        if debts.get("weighted_average_rate") is not None:
-            lines.append(f"  Avg interest rate:   {debts['weighted_average_rate']:.2f}%")
-        if debts.get("debt_free_date"):
-            lines.append(
-                f"  Debt-free date (av.): {debts['debt_free_date']} "
-                f"({debts['avalanche_months']} months)"
-            )
-        if debts.get("total_interest_paid", 0) > 0:
-            lines.append(f"  Total interest (av.): {fmt(debts['total_interest_paid'])}")
-        lines.append("\n  Individual debts:")
-        for d in debts["list"]:
-            lines.append(
-                f"    • {d['name']} ({d['debt_type']}): "
-                f"{fmt(d['balance'])} @ {d['interest_rate']:.2f}% APR, "
-                f"min {fmt(d['minimum_payment'])}/mo"
+    if not debts.get("count", 0) > 0:
+        return ["\nDEBTS: None tracked"]
+    lines = [
+        "\nDEBTS:",
+        f"  Count:               {debts['count']} debt(s)",
+        f"  Total debt:          {_fmt(debts['total_debt'])}",
+        f"  Monthly minimums:    {_fmt(debts['total_minimum_payments'])}",
+    ]
+    if debts.get("weighted_average_rate") is not None:
+        lines.append(f"  Avg interest rate:   {debts['weighted_average_rate']:.2f}%")
+    if debts.get("debt_free_date"):
+        lines.append(
+            f"  Debt-free date (av.): {debts['debt_free_date']} "
+            f"({debts['avalanche_months']} months)"
+        )
+    if debts.get("total_interest_paid", 0) > 0:
+        lines.append(f"  Total interest (av.): {_fmt(debts['total_interest_paid'])}")
+    lines.append("\n  Individual debts:")
+    for d in debts["list"]:
+        lines.append(
+            f"    • {d['name']} ({d['debt_type']}): "
+            f"{_fmt(d['balance'])} @ {d['interest_rate']:.2f}% APR, "
+            f"min {_fmt(d['minimum_payment'])}/mo"
+        )
+    return lines
+
+
+def _payoff_lines(ctx: dict) -> list[str]:
+    payoff_order = ctx.get("debts", {}).get("payoff_order")
+    if not payoff_order:
+        return []
+    lines = ["\n  Avalanche payoff order:"]
+    for d in payoff_order:
+        entry = f"    #{d['order']}: {d['name']}"
+        if d.get("payoff_date"):
+            entry += (
+                f" — {d['payoff_date']} "
+                f"({d['months_to_payoff']} mo, {_fmt(d['total_interest'])} interest)"
             )
-        if debts.get("payoff_order"):
-            lines.append("\n  Avalanche payoff order:")
-            for d in debts["payoff_order"]:
-                entry = f"    #{d['order']}: {d['name']}"
-                if d.get("payoff_date"):
-                    entry += (
-                        f" — {d['payoff_date']} "
-                        f"({d['months_to_payoff']} mo, {fmt(d['total_interest'])} interest)"
-                    )
-                lines.append(entry)
-    else:
-        lines.append("\nDEBTS: None tracked")
+        lines.append(entry)
+    return lines
 
+
+# Section name -> renderer, in the order build_context_text prints them.
+# app.chatbot.prompt picks a subset of these per intent.
+CONTEXT_SECTIONS = {
+    "income":       _income_lines,
+    "spending":     _spending_lines,
+    "categories":   _category_lines,
+    "cash_flow":    _cash_flow_lines,
+    "budgets":      _budget_lines,
+    "transactions": _transaction_lines,
+    "trend":        _trend_lines,
+    "debts":        _debt_lines,
+    "payoff":       _payoff_lines,
+}
+
+
+def build_context_sections(ctx: dict) -> dict[str, list[str]]:
+    """Render each CONTEXT_SECTIONS entry to its lines (empty sections included)."""
+    return {name: render(ctx) for name, render in CONTEXT_SECTIONS.items()}
+
+
+def build_context_text(ctx: dict, sections: dict[str, list[str]] | None = None) -> str:
+    """
+    Convert the financial context dict into a human-readable text block
+    suitable for including in an AI prompt.
+    """
+    if sections is None:
+        sections = build_context_sections(ctx)
+    lines = [
+        f"FINANCIAL SNAPSHOT — {ctx['current_month']}",
+        "=" * 42,
+    ]
+    for section in sections.values():
+        lines.extend(section)
     return "\n".join(lines)
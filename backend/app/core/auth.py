@@ -1,9 +1,103 @@
+"""
+Cookie-session authentication.
+
+Resolving the session cookie takes two queries (session, then user) before
+the endpoint does any work.  Hot sessions skip both, via two per-worker
+caches:
+
+  - _sessions: session_id → (user_id, expires_at).  An entry past the
+    session's own expiry is treated as a miss, so caching never extends a
+    session.
+  - _users: user_id → CurrentUser, a frozen snapshot of the users row.
+    Endpoints get the snapshot, not an ORM object; code that writes to the
+    user loads the row itself.
+
+Both are dropped explicitly: /auth/logout forgets its session, and any
+transaction that called bump_data_version() (income updates, transaction,
+budget and debt writes) forgets the user's snapshot once it commits.  Other
+workers only notice after AUTH_CACHE_TTL seconds, so code that keys caches on
+data_version re-reads it with get_data_version() rather than trusting the
+snapshot.
+"""
+from dataclasses import dataclass, replace
+from datetime import datetime
+from decimal import Decimal
+
 from fastapi import Request, Depends
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
+from app.core.cache import TTLCache
+from app.core.config import AUTH_CACHE_SIZE, AUTH_CACHE_TTL
 from app.core.dependencies import get_db
 from app.sessions.service import get_session
-from app.users.service import get_user_by_id
+from app.users.service import CHANGED_USERS, get_data_version, get_user_by_id
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    id: int
+    email: str
+    full_name: str | None
+    picture_url: str | None
+    base_income: Decimal | None
+    side_income: Decimal | None
+    income_updated_at: datetime | None
+    data_version: int
+
+    @classmethod
+    def from_user(cls, user) -> "CurrentUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            picture_url=user.picture_url,
+            base_income=user.base_income,
+            side_income=user.side_income,
+            income_updated_at=user.income_updated_at,
+            data_version=user.data_version,
+        )
+
+
+_sessions = TTLCache(maxsize=AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL)
+_users = TTLCache(maxsize=AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL)
+
+
+def forget_session(session_id: str) -> None:
+    _sessions.pop(session_id)
+
+
+def forget_user(user_id: int) -> None:
+    _users.pop(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _forget_changed_users(session) -> None:
+    for user_id in session.info.pop(CHANGED_USERS, ()):
+        forget_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session) -> None:
+    session.info.pop(CHANGED_USERS, None)
+
+
+def with_current_data_version(db: Session, user: CurrentUser) -> CurrentUser:
+    """The snapshot with data_version re-read, for callers caching on it."""
+    version = get_data_version(db, user.id)
+    return user if version == user.data_version else replace(user, data_version=version)
+
+
+def _load_user(db: Session, user_id: int) -> CurrentUser | None:
+    snapshot = _users.get(user_id)
+    if snapshot is None:
+        user = get_user_by_id(db, user_id)
+        if not user:
+            return None
+        snapshot = CurrentUser.from_user(user)
+        _users.set(user_id, snapshot)
+    return snapshot
+
 
 async def get_current_user(
     request: Request,
@@ -15,11 +109,15 @@ async def get_current_user(
     if not session_id:
         return None  # User is not logged in
 
-    # 2. Look up session from DB
-    session = get_session(db, session_id)
-    if not session:
-        return None  # Invalid or expired session
+    # 2. Look up session (cached, but never past its expiry)
+    entry = _sessions.get(session_id)
+    if entry is None or entry[1] < datetime.utcnow():
+        session = get_session(db, session_id)
+        if not session:
+            forget_session(session_id)
+            return None  # Invalid or expired session
+        entry = (session.user_id, session.expires_at)
+        _sessions.set(session_id, entry)
 
     # 3. Load user from session
-    user = get_user_by_id(db, session.user_id)
-    return user
+    return _load_user(db, entry[0])
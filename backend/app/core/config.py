@@ -11,3 +11,17 @@ if not GOOGLE_CLIENT_ID:
 IS_PRODUCTION = os.getenv("IS_PRODUCTION", "false").lower() == "true"
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")  # Optional — chatbot disabled if not set
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None  # Optional — OpenAI-compatible endpoint (proxy, local stub)
+
+CHATBOT_ANSWER_TEMPLATES = os.getenv("CHATBOT_ANSWER_TEMPLATES") or None  # Optional — JSON overriding chatbot answer wording
+CHATBOT_PROMPT_TOKEN_BUDGET = int(os.getenv("CHATBOT_PROMPT_TOKEN_BUDGET", "800"))  # context + calculation per LLM answer
+
+# Pooled chatbot LLM client (app/chatbot/llm.py)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))         # in-flight upstream requests per worker
+LLM_QUEUE_TIMEOUT   = float(os.getenv("LLM_QUEUE_TIMEOUT", "10"))        # seconds to wait for a free slot
+LLM_MAX_RETRIES     = int(os.getenv("LLM_MAX_RETRIES", "3"))             # on 429 / 5xx / connection errors
+LLM_REQUEST_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", "30"))      # seconds per upstream attempt
+
+# Per-worker cache of authenticated sessions (app/core/auth.py)
+AUTH_CACHE_TTL  = float(os.getenv("AUTH_CACHE_TTL", "60"))      # seconds a session/user snapshot is trusted
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))    # sessions (and users) held per worker
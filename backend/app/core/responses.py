@@ -0,0 +1,49 @@
+"""
+Fast JSON responses backed by orjson.
+
+FastAPI's default path runs every return value through `jsonable_encoder`,
+which walks the structure in Python and converts each Decimal / date one by
+one.  Endpoints that return large lists (transaction history, payoff
+projections) hand their data to ORJSONResponse instead:
+
+  - plain dicts / lists are serialised by orjson (dates and datetimes
+    natively, Decimals through jsonable_encoder's own decimal_encoder, so
+    numbers come out exactly as they did before)
+  - pydantic models are serialised by pydantic-core directly to JSON bytes,
+    skipping the response_model re-validation pass
+"""
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.encoders import decimal_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+
+def _default(obj: Any) -> Any:
+    """orjson fallback for types it does not serialise natively."""
+    if isinstance(obj, Decimal):
+        return decimal_encoder(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialise `content` to JSON bytes using the same rules as ORJSONResponse."""
+    if isinstance(content, BaseModel):
+        return to_json(content)
+    return orjson.dumps(
+        content,
+        default=_default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+    )
+
+
+class ORJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
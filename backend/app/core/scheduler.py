@@ -0,0 +1,71 @@
+"""
+Periodic background jobs run inside the API process.
+
+Jobs are sync callables taking a Session; each one gets a fresh session per
+run and runs on a worker thread so the event loop stays free.  Every uvicorn
+worker runs its own scheduler, so jobs must be idempotent.  A failing run is
+logged and retried at the next interval.
+
+Set SCHEDULER_ENABLED=false to skip them (scripts, tests, extra workers).
+"""
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "true").lower() == "true"
+
+
+@dataclass
+class Job:
+    name:     str
+    interval: float                   # seconds between runs
+    func:     Callable[[Session], object]
+
+
+_jobs: list[Job] = []
+_tasks: list[asyncio.Task] = []
+
+
+def register(name: str, interval: float, func: Callable[[Session], object]) -> None:
+    """Run `func(db)` at startup and then every `interval` seconds."""
+    _jobs.append(Job(name=name, interval=interval, func=func))
+
+
+def run_job(job: Job) -> object:
+    from app.database.session import SessionLocal  # deferred: reads DATABASE_URL
+
+    db = SessionLocal()
+    try:
+        return job.func(db)
+    finally:
+        db.close()
+
+
+async def _loop(job: Job) -> None:
+    while True:
+        try:
+            result = await asyncio.to_thread(run_job, job)
+            logger.info("scheduler job %s finished: %s", job.name, result)
+        except Exception:
+            logger.exception("scheduler job %s failed", job.name)
+        await asyncio.sleep(job.interval)
+
+
+def start() -> None:
+    if not SCHEDULER_ENABLED or _tasks:
+        return
+    for job in _jobs:
+        _tasks.append(asyncio.create_task(_loop(job), name=f"scheduler:{job.name}"))
+
+
+async def stop() -> None:
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
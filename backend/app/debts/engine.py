@@ -0,0 +1,582 @@
+"""
+Vectorized integer-cent payoff engine.
+
+Same month-by-month rules as service._simulate_payoff (the Decimal reference
+engine), but every debt is advanced at once with NumPy:
+
+  balances      int64 cents,            shape (levels, debts)
+  rates         int64 basis points of % (19.99% → 1999)
+  minimums      int64 cents
+
+Monthly interest is round_half_up(balance × rate / 1200) computed exactly in
+integers:  (2 · cents · bp + 120000) // 240000.  The reference engine works
+with a 28-digit Decimal monthly rate, which can land a hair either side of an
+exact half-cent; those (rare) exact ties are re-evaluated with the reference
+arithmetic so both engines agree to the cent.
+
+The leading "levels" axis lets one run evaluate several extra-payment levels
+side by side; a normal payoff plan is simply a single level.
+
+Inputs the integer representation cannot reproduce exactly — an extra
+payment with sub-cent precision, or balances growing past int64-safe range
+under negative amortisation — raise EngineFallback so callers can use the
+Decimal engine instead.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
+
+import numpy as np
+
+from app.debts.models import Debt
+from app.debts.schemas import PayoffColumnarResponse, PayoffResponse
+
+MAX_MONTHS = 600   # 50 years cap, shared with the reference engine
+
+# 2 · balance · rate_bp must stay below 2**63; rate_bp ≤ 10_000 (100%)
+_MAX_SAFE_CENTS = 10 ** 14
+_TWO = Decimal("0.01")
+
+# Months per sample point for each projection resolution
+_PERIODS = {"month": 1, "quarter": 3, "year": 12}
+
+
+class EngineFallback(Exception):
+    """Raised when the inputs need the Decimal reference engine."""
+
+
+def month_label(base: date, offset: int) -> str:
+    """Return 'YYYY-MM' string for base + offset months."""
+    total = base.month - 1 + offset
+    year  = base.year + total // 12
+    month = total % 12 + 1
+    return f"{year:04d}-{month:02d}"
+
+
+def sample_months(base: date, months: int, resolution: str = "month") -> list[int]:
+    """
+    1-based month numbers to keep when downsampling a projection: every month,
+    or only quarter / year ends (by calendar month) — always including the
+    final month so the payoff point is never dropped.
+    """
+    if resolution == "month":
+        return list(range(1, months + 1))
+    period = _PERIODS[resolution]
+    points = [mo for mo in range(1, months + 1) if (base.month + mo) % period == 0]
+    if months and (not points or points[-1] != months):
+        points.append(months)
+    return points
+
+
+def to_cents(amount: Decimal) -> int:
+    """
+    Exact Decimal → integer cents; raises EngineFallback on sub-cent precision
+    or amounts past _MAX_SAFE_CENTS, which the int64 month step cannot hold.
+    """
+    cents = Decimal(amount) * 100
+    if abs(cents) > _MAX_SAFE_CENTS:
+        raise EngineFallback(f"{amount} exceeds the int64-safe range")
+    if cents != cents.to_integral_value():
+        raise EngineFallback(f"{amount} has sub-cent precision")
+    return int(cents)
+
+
+def from_cents(cents: int) -> Decimal:
+    """Integer cents → Decimal with two decimal places (matches _round2 output)."""
+    return Decimal(cents).scaleb(-2)
+
+
+@dataclass
+class Portfolio:
+    """A user's debts as parallel arrays, in the order get_debts() returned them."""
+    debt_ids:       list[int]
+    names:          list[str]
+    interest_rates: list[Decimal]
+    balances:       np.ndarray   # int64 cents
+    rates_bp:       np.ndarray   # int64, annual % × 100
+    minimums:       np.ndarray   # int64 cents
+    monthly_rates:  list[Decimal]  # reference-engine monthly rate, for tie handling
+
+    @classmethod
+    def from_debts(cls, debts: list[Debt]) -> "Portfolio":
+        rates = [Decimal(str(d.interest_rate)) for d in debts]
+        return cls(
+            debt_ids       = [d.id for d in debts],
+            names          = [d.name for d in debts],
+            interest_rates = rates,
+            balances       = np.array([to_cents(Decimal(str(d.balance))) for d in debts], dtype=np.int64),
+            rates_bp       = np.array([to_cents(r) for r in rates], dtype=np.int64),
+            minimums       = np.array([to_cents(Decimal(str(d.minimum_payment))) for d in debts], dtype=np.int64),
+            monthly_rates  = [r / 100 / 12 for r in rates],
+        )
+
+    def __len__(self) -> int:
+        return len(self.debt_ids)
+
+    def priority(self, strategy: str) -> np.ndarray:
+        """
+        Indices in payoff-priority order (stable, like sorted()).
+          avalanche: highest rate first, then lowest balance
+          snowball:  lowest balance first, then highest rate
+        """
+        if strategy == "avalanche":
+            keys = (self.balances, -self.rates_bp)
+        else:
+            keys = (-self.rates_bp, self.balances)
+        return np.lexsort(keys).astype(np.intp)
+
+
+@dataclass
+class DebtOutcome:
+    """Per-debt result of a summary-only simulation."""
+    debt_id:          int
+    name:             str
+    months_to_payoff: int | None
+    payoff_date:      str | None
+    total_interest:   Decimal
+    order:            int
+
+
+@dataclass
+class PayoffSummary:
+    """
+    Headline numbers of a payoff plan without the month-by-month projection —
+    all that the debt summary and the chatbot context need.
+    """
+    strategy:            str
+    extra_payment:       Decimal
+    total_months:        int | None
+    debt_free_date:      str | None
+    total_interest_paid: Decimal
+    outcomes:            list[DebtOutcome]   # sorted by payoff order
+
+    @classmethod
+    def from_response(cls, plan: PayoffResponse) -> "PayoffSummary":
+        return cls(
+            strategy            = plan.strategy,
+            extra_payment       = plan.extra_payment,
+            total_months        = plan.total_months,
+            debt_free_date      = plan.debt_free_date,
+            total_interest_paid = plan.total_interest_paid,
+            outcomes            = [
+                DebtOutcome(
+                    debt_id          = d.debt_id,
+                    name             = d.name,
+                    months_to_payoff = d.months_to_payoff,
+                    payoff_date      = d.payoff_date,
+                    total_interest   = d.total_interest,
+                    order            = d.order,
+                )
+                for d in plan.payoff_order
+            ],
+        )
+
+
+@dataclass
+class PayoffRun:
+    """Raw result of a simulation; per-level arrays have a leading levels axis."""
+    portfolio:      Portfolio
+    strategy:       str
+    start:          date
+    months:         np.ndarray          # (levels,) months simulated per level
+    paid_off_month: np.ndarray          # (levels, debts) 0 = not paid off
+    interest:       np.ndarray          # (levels, debts) accrued interest, cents
+    history:        np.ndarray | None   # (points, debts) balances, cents — single level only
+    history_months: list[int]           # 1-based month of each history row
+    resolution:     str = "month"       # sampling of the recorded history
+
+    def all_paid_off(self) -> np.ndarray:
+        return (self.paid_off_month > 0).all(axis=1)
+
+    def payoff_ranks(self, level: int = 0) -> list[int]:
+        """1-based payoff order per debt (len + 1 for debts never paid off)."""
+        paid = self.paid_off_month[level]
+        n = len(self.portfolio)
+        ranks = [n + 1] * n
+        ordered = sorted((i for i in range(n) if paid[i] > 0), key=lambda i: paid[i])
+        for rank, i in enumerate(ordered, start=1):
+            ranks[i] = rank
+        return ranks
+
+    def level_totals(self) -> tuple[list[int | None], list[Decimal], list[str | None]]:
+        """Per-level (total_months, total_interest_paid, debt_free_date) columns."""
+        done = self.all_paid_off().tolist()
+        months = self.months.tolist()
+        total_months = [m if ok else None for m, ok in zip(months, done)]
+        return (
+            total_months,
+            [from_cents(c) for c in self.interest.sum(axis=1).tolist()],
+            [month_label(self.start, m) if m is not None else None for m in total_months],
+        )
+
+    def to_summary(self, extra_payment: Decimal, level: int = 0) -> PayoffSummary:
+        """Headline results for one level; works with or without history."""
+        pf = self.portfolio
+        months = int(self.months[level])
+        ranks = self.payoff_ranks(level)
+        paid = self.paid_off_month[level].tolist()
+        interest = self.interest[level].tolist()
+
+        outcomes = [
+            DebtOutcome(
+                debt_id          = pf.debt_ids[i],
+                name             = pf.names[i],
+                months_to_payoff = paid[i] or None,
+                payoff_date      = month_label(self.start, paid[i]) if paid[i] else None,
+                total_interest   = from_cents(interest[i]),
+                order            = ranks[i],
+            )
+            for i in range(len(pf))
+        ]
+        outcomes.sort(key=lambda o: o.order)
+
+        all_paid_off = bool(self.all_paid_off()[level])
+        return PayoffSummary(
+            strategy            = self.strategy,
+            extra_payment       = extra_payment,
+            total_months        = months if all_paid_off else None,
+            debt_free_date      = month_label(self.start, months) if all_paid_off else None,
+            total_interest_paid = from_cents(sum(interest)),
+            outcomes            = outcomes,
+        )
+
+    def to_response(self, extra_payment: Decimal) -> PayoffResponse:
+        """
+        Build the same PayoffResponse the reference engine returns (single
+        level), downsampled to the run's recorded `resolution`.
+        """
+        assert self.history is not None, "to_response() needs a run with history"
+        pf = self.portfolio
+        n = len(pf)
+        months = int(self.months[0])
+        points = self.history_months
+        labels = [month_label(self.start, mo) for mo in points]
+
+        # Convert the cents matrix once; tolist() yields Python ints quickly
+        sampled = self.history
+        history = [[from_cents(c) for c in row] for row in sampled.tolist()]
+        totals = [from_cents(c) for c in sampled.sum(axis=1).tolist()]
+
+        ranks = self.payoff_ranks()
+        paid = self.paid_off_month[0].tolist()
+        interest = self.interest[0].tolist()
+
+        # Build plain dicts and validate once: pydantic-core does the nesting in
+        # C, far cheaper than constructing ~months × debts models in Python.
+        payoff_order = []
+        for i in range(n):
+            m2p = paid[i] or None
+            payoff_order.append({
+                "debt_id":          pf.debt_ids[i],
+                "name":             pf.names[i],
+                "original_balance": from_cents(int(pf.balances[i])),
+                "interest_rate":    pf.interest_rates[i],
+                "months_to_payoff": m2p,
+                "payoff_date":      month_label(self.start, m2p) if m2p else None,
+                "total_interest":   from_cents(interest[i]),
+                "order":            ranks[i],
+                "monthly_balances": [
+                    {"month": mo, "date": label, "balance": row[i]}
+                    for mo, label, row in zip(points, labels, history)
+                ],
+            })
+        payoff_order.sort(key=lambda d: d["order"])
+
+        monthly_projection = [
+            {
+                "month":         mo,
+                "date":          label,
+                "total_balance": total,
+                "breakdown":     dict(zip(pf.names, row)),
+            }
+            for mo, label, total, row in zip(points, labels, totals, history)
+        ]
+
+        all_paid_off = bool(self.all_paid_off()[0])
+        return PayoffResponse.model_validate({
+            "strategy":            self.strategy,
+            "extra_payment":       extra_payment,
+            "total_months":        months if all_paid_off else None,
+            "debt_free_date":      month_label(self.start, months) if all_paid_off else None,
+            "total_interest_paid": from_cents(sum(interest)),
+            "payoff_order":        payoff_order,
+            "monthly_projection":  monthly_projection,
+        })
+
+    def to_columnar(self, extra_payment: Decimal) -> PayoffColumnarResponse:
+        """Parallel-array form of to_response(): one balance list per debt."""
+        assert self.history is not None, "to_columnar() needs a run with history"
+        summary = self.to_summary(extra_payment)
+        points = self.history_months
+        sampled = self.history
+        columns = [[from_cents(c) for c in col] for col in sampled.T.tolist()]
+        index = {debt_id: i for i, debt_id in enumerate(self.portfolio.debt_ids)}
+
+        return PayoffColumnarResponse.model_validate({
+            "strategy":            summary.strategy,
+            "extra_payment":       extra_payment,
+            "total_months":        summary.total_months,
+            "debt_free_date":      summary.debt_free_date,
+            "total_interest_paid": summary.total_interest_paid,
+            "resolution":          self.resolution,
+            "months":              points,
+            "dates":               [month_label(self.start, mo) for mo in points],
+            "total_balance":       [from_cents(c) for c in sampled.sum(axis=1).tolist()],
+            "debts": [
+                {
+                    "debt_id":          o.debt_id,
+                    "name":             o.name,
+                    "original_balance": from_cents(int(self.portfolio.balances[index[o.debt_id]])),
+                    "interest_rate":    self.portfolio.interest_rates[index[o.debt_id]],
+                    "months_to_payoff": o.months_to_payoff,
+                    "payoff_date":      o.payoff_date,
+                    "total_interest":   o.total_interest,
+                    "order":            o.order,
+                    "balances":         columns[index[o.debt_id]],
+                }
+                for o in summary.outcomes
+            ],
+        })
+
+
+# ── Reshaping reference-engine plans (EngineFallback path) ────────────────────
+
+def downsample_response(plan: PayoffResponse, start: date, resolution: str) -> PayoffResponse:
+    """Keep only the `resolution` sample points of a full PayoffResponse."""
+    if resolution == "month":
+        return plan
+    keep = set(sample_months(start, len(plan.monthly_projection), resolution))
+    return plan.model_copy(update={
+        "monthly_projection": [p for p in plan.monthly_projection if p.month in keep],
+        "payoff_order": [
+            d.model_copy(update={"monthly_balances": [b for b in d.monthly_balances if b.month in keep]})
+            for d in plan.payoff_order
+        ],
+    })
+
+
+def columnar_from_response(plan: PayoffResponse, start: date, resolution: str) -> PayoffColumnarResponse:
+    """Columnar form of a full PayoffResponse."""
+    plan = downsample_response(plan, start, resolution)
+    return PayoffColumnarResponse(
+        strategy            = plan.strategy,
+        extra_payment       = plan.extra_payment,
+        total_months        = plan.total_months,
+        debt_free_date      = plan.debt_free_date,
+        total_interest_paid = plan.total_interest_paid,
+        resolution          = resolution,
+        months              = [p.month for p in plan.monthly_projection],
+        dates               = [p.date for p in plan.monthly_projection],
+        total_balance       = [p.total_balance for p in plan.monthly_projection],
+        debts               = [
+            {
+                **d.model_dump(exclude={"monthly_balances"}),
+                "balances": [b.balance for b in d.monthly_balances],
+            }
+            for d in plan.payoff_order
+        ],
+    )
+
+
+def _accrue_interest(
+    balances: np.ndarray,
+    rates_bp: np.ndarray,
+    monthly_rates: list[Decimal],
+    orders: np.ndarray,
+) -> np.ndarray:
+    """Monthly interest in cents, ROUND_HALF_UP, matching the reference engine."""
+    numerator = balances * rates_bp                         # cents · bp (balances ≥ 0)
+    interest, remainder = np.divmod(2 * numerator + 120_000, 240_000)
+
+    # A zero remainder means an exact half-cent tie.  The reference engine's
+    # 28-digit monthly rate may sit just below the true rate, so defer to its
+    # arithmetic for these.
+    ties = remainder == 0
+    if ties.any():
+        for level, i in zip(*np.nonzero(ties)):
+            reference = (from_cents(int(balances[level, i])) * monthly_rates[orders[level, i]]).quantize(
+                _TWO, rounding=ROUND_HALF_UP
+            )
+            interest[level, i] = int(reference * 100)
+    return interest
+
+
+def simulate(
+    pf: Portfolio,
+    strategy: str,
+    extra_cents: np.ndarray,
+    start: date | None = None,
+    record_history: bool = True,
+    resolution: str = "month",
+    max_months: int = MAX_MONTHS,
+    orders: np.ndarray | None = None,
+    weights: np.ndarray | None = None,
+    prune_above: int | None = None,
+) -> PayoffRun:
+    """
+    Run the payoff simulation for every level at once.  A level is one
+    extra-payment amount (`extra_cents`, shape (levels,)) and, optionally, its
+    own allocation policy:
+
+      orders:      (levels, debts) priority order per level; defaults to the
+                   avalanche / snowball order given by `strategy`
+      weights:     (levels, debts) per-mille share of the monthly pool sent to
+                   each debt before the rest cascades down the priority order
+      prune_above: stop simulating levels whose accrued interest passes this
+                   many cents (checked yearly; they end up not paid off)
+
+    With record_history, balances are kept only at the `resolution` sample
+    points (see sample_months), so a quarterly or yearly plan never holds or
+    converts the months it would drop.
+
+    Each month, for every level:
+      1. Accrue monthly interest on every remaining balance.
+      2. Pay the minimum on every debt (or full balance if smaller).
+      3. Apply freed-up minimums + extra payment: weighted shares first, then
+         the remainder to debts in priority order.
+      4. Record balances at period ends (single-level runs with
+         record_history only), plus the final month.
+
+    Minimums freed by a payoff only join the pool the following month, so
+    payoffs from steps 2 and 3 can be booked together at the end of the month.
+    """
+    if record_history and len(extra_cents) != 1:
+        raise ValueError("history can only be recorded for a single level")
+    extra_cents = np.asarray(extra_cents, dtype=np.int64)
+    if (extra_cents > _MAX_SAFE_CENTS).any():
+        raise EngineFallback("extra payment exceeds the int64-safe range")
+
+    levels = len(extra_cents)
+    n = len(pf)
+    start = start or date.today()
+    period = _PERIODS[resolution]
+
+    # Work in each level's priority order; results are mapped back at the end.
+    if orders is None:
+        orders = np.tile(pf.priority(strategy), (levels, 1))
+    rates_bp = pf.rates_bp[orders]
+    minimums = pf.minimums[orders]
+    shares = np.take_along_axis(weights, orders, axis=1) if weights is not None else None
+
+    balances = pf.balances[orders]
+    paid     = np.zeros((levels, n), dtype=np.int32)
+    interest = np.zeros((levels, n), dtype=np.int64)
+    freed    = np.zeros(levels, dtype=np.int64)
+    months   = np.zeros(levels, dtype=np.int32)
+    history  = np.zeros((max_months // period + 2, n), dtype=np.int64) if record_history else None
+    recorded: list[int] = []
+
+    owing = balances > 0
+    active = owing.any(axis=1)
+    month = 0
+    while month < max_months and active.any():
+        month += 1
+        months += active
+
+        # 1. Accrue interest
+        accrued = _accrue_interest(balances, rates_bp, pf.monthly_rates, orders)
+        balances += accrued
+        interest += accrued
+        # Balances grow at most 100%/12 a month, so a yearly check keeps
+        # 2 · balance · rate_bp well inside int64.
+        if month % 12 == 1 and balances.max() > _MAX_SAFE_CENTS:
+            raise EngineFallback("balances exceed the int64-safe range")
+
+        # 2. Minimums on all active debts (pool is fixed before any payoffs)
+        pool = extra_cents + freed
+        balances -= np.minimum(minimums, balances)
+
+        # 3. Weighted shares, then the rest in priority order: each debt takes
+        #    what is left after the debts ahead of it, capped at its balance.
+        if shares is not None:
+            split = np.minimum(pool[:, None] * shares // 1000, balances)
+            balances -= split
+            pool = pool - split.sum(axis=1)
+        ahead = np.add.accumulate(balances, axis=1) - balances
+        balances -= np.minimum(np.maximum(pool[:, None] - ahead, 0), balances)
+
+        # Book this month's payoffs
+        still_owing = balances > 0
+        newly = owing & ~still_owing
+        paid += newly * np.int32(month)
+        freed += (newly * minimums).sum(axis=1)
+        owing = still_owing
+        active = owing.any(axis=1)
+
+        if prune_above is not None and month % 12 == 0:
+            over = active & (interest.sum(axis=1) > prune_above)
+            if over.any():
+                balances[over] = 0
+                owing[over] = False
+                active &= ~over
+
+        # 4. Record
+        if history is not None and (start.month + month) % period == 0:
+            history[len(recorded)] = balances[0]
+            recorded.append(month)
+
+    if history is not None and month and (not recorded or recorded[-1] != month):
+        history[len(recorded)] = balances[0]
+        recorded.append(month)
+
+    inverse = np.argsort(orders, axis=1)
+    return PayoffRun(
+        portfolio      = pf,
+        strategy       = strategy,
+        start          = start,
+        months         = months,
+        paid_off_month = np.take_along_axis(paid, inverse, axis=1),
+        interest       = np.take_along_axis(interest, inverse, axis=1),
+        history        = history[:len(recorded)][:, inverse[0]] if history is not None else None,
+        history_months = recorded,
+        resolution     = resolution,
+    )
+
+
+def simulate_payoff(
+    debts: list[Debt],
+    strategy: str,
+    extra_payment: Decimal,
+    start: date | None = None,
+    resolution: str = "month",
+    columnar: bool = False,
+) -> PayoffResponse | PayoffColumnarResponse:
+    """Drop-in replacement for service._simulate_payoff (raises EngineFallback)."""
+    pf = Portfolio.from_debts(debts)
+    extra = np.array([to_cents(extra_payment)], dtype=np.int64)
+    run = simulate(pf, strategy, extra, start=start, resolution=resolution)
+    if columnar:
+        return run.to_columnar(extra_payment)
+    return run.to_response(extra_payment)
+
+
+def summarize_payoff(
+    debts: list[Debt],
+    strategy: str,
+    extra_payment: Decimal,
+    start: date | None = None,
+) -> PayoffSummary:
+    """
+    Summary-only simulation: tracks balances, payoff months and interest but
+    records no monthly history and builds no per-month objects.
+    """
+    pf = Portfolio.from_debts(debts)
+    extra = np.array([to_cents(extra_payment)], dtype=np.int64)
+    return simulate(pf, strategy, extra, start=start, record_history=False).to_summary(extra_payment)
+
+
+def sweep_payoff(
+    debts: list[Debt],
+    strategy: str,
+    extra_payments: list[Decimal],
+    start: date | None = None,
+) -> tuple[list[int | None], list[Decimal], list[str | None]]:
+    """
+    Evaluate every extra-payment level in one batched, history-free run.
+    Returns (total_months, total_interest_paid, debt_free_date) columns.
+    """
+    pf = Portfolio.from_debts(debts)
+    extra = np.array([to_cents(e) for e in extra_payments], dtype=np.int64)
+    return simulate(pf, strategy, extra, start=start, record_history=False).level_totals()
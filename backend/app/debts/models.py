@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey
+from sqlalchemy import Boolean, Column, Date, Integer, String, Numeric, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 
 from app.database.base import Base
@@ -30,6 +30,21 @@ class Debt(Base):
     user = relationship("User", back_populates="debts")
 
 
+class DebtDueStatus(Base):
+    """
+    Precomputed due-date status for each debt that has a due_date, refreshed
+    on debt/payment writes and by the hourly scheduler job.  Rows are only
+    trusted for the day in `computed_on`.
+    """
+    __tablename__ = "debt_due_status"
+
+    debt_id         = Column(Integer, ForeignKey("debts.id", ondelete="CASCADE"), primary_key=True)
+    user_id         = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    due_on          = Column(Date, nullable=False)      # this month's due date, clamped to month end
+    paid_this_month = Column(Boolean, nullable=False, default=False)
+    computed_on     = Column(Date, nullable=False)
+
+
 DEBT_TYPES = {
     "credit_card",
     "loan",
@@ -0,0 +1,197 @@
+"""
+Search for the extra-payment allocation that minimises total interest or
+time to debt-free ("optimal" strategy).
+
+A policy is a priority order over the debts plus optional per-mille weights:
+each month the weighted shares of the pool (extra payment + freed minimums)
+go to their debts first and the remainder cascades down the priority order.
+Avalanche and snowball are the weight-free policies with their usual orders.
+
+Search, every step one batched engine run over all candidates:
+  1. Seed orders — avalanche, snowball and hybrid scores mixing rate,
+     balance, monthly interest cost and minimum-payment-freed per dollar.
+  2. Local search from the best policy, alternating
+       - order moves: all adjacent swaps and move-to-front moves, and
+       - splits: a share of the pool diverted from the top debt to one of
+         the next few,
+     until neither improves or the time budget runs out.
+
+Candidates are pruned inside the engine: for the interest objective a level
+stops once its accrued interest passes the best total found so far; for the
+months objective the run is capped at the best debt-free month.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.debts.engine import MAX_MONTHS, Portfolio, simulate
+
+OBJECTIVES = ("interest", "months")
+SEARCH_BUDGET_SECONDS = 3.0
+SPLIT_FRACTIONS = tuple(range(50, 1000, 50))   # per-mille diverted to the second debt
+SPLIT_CANDIDATES = 5                            # debts below the top that can receive a split
+
+
+@dataclass
+class Policy:
+    order:   np.ndarray          # (debts,) portfolio indices, highest priority first
+    weights: np.ndarray | None   # (debts,) per-mille pool shares, portfolio order
+
+    def key(self) -> tuple:
+        w = tuple(self.weights.tolist()) if self.weights is not None else ()
+        return tuple(self.order.tolist()), w
+
+
+@dataclass
+class OptimizationResult:
+    policy:    Policy
+    months:    int | None   # None if not debt-free within MAX_MONTHS
+    interest:  int          # cents
+    evaluated: int
+
+
+class _Evaluator:
+    """Batched policy evaluation that remembers the best policy seen so far."""
+
+    def __init__(self, pf: Portfolio, extra_cents: int, objective: str, deadline: float):
+        self.pf = pf
+        self.extra_cents = extra_cents
+        self.objective = objective
+        self.deadline = deadline
+        self.seen: set[tuple] = set()
+        self.evaluated = 0
+        self.best: Policy | None = None
+        self.best_rank: tuple | None = None
+        self.best_months: int | None = None
+        self.best_interest = 0
+
+    def out_of_time(self) -> bool:
+        return time.monotonic() > self.deadline
+
+    def _rank(self, paid: bool, months: int, interest: int) -> tuple:
+        if self.objective == "months":
+            return (not paid, months, interest)
+        return (not paid, interest, months)
+
+    def evaluate(self, policies: list[Policy]) -> bool:
+        """Evaluate unseen policies; returns True if the best one improved."""
+        fresh = []
+        for policy in policies:
+            key = policy.key()
+            if key not in self.seen:
+                self.seen.add(key)
+                fresh.append(policy)
+        if not fresh:
+            return False
+
+        n = len(self.pf)
+        orders = np.stack([p.order for p in fresh])
+        weights = None
+        if any(p.weights is not None for p in fresh):
+            weights = np.stack([
+                p.weights if p.weights is not None else np.zeros(n, dtype=np.int64) for p in fresh
+            ])
+
+        prune_above = None
+        max_months = MAX_MONTHS
+        if self.best_months is not None:
+            if self.objective == "interest":
+                prune_above = self.best_interest
+            else:
+                max_months = self.best_months
+
+        run = simulate(
+            self.pf,
+            "optimal",
+            np.full(len(fresh), self.extra_cents, dtype=np.int64),
+            record_history=False,
+            max_months=max_months,
+            orders=orders,
+            weights=weights,
+            prune_above=prune_above,
+        )
+        self.evaluated += len(fresh)
+
+        improved = False
+        paid = run.all_paid_off().tolist()
+        months = run.months.tolist()
+        interest = run.interest.sum(axis=1).tolist()
+        for k, policy in enumerate(fresh):
+            rank = self._rank(paid[k], months[k], interest[k])
+            if self.best_rank is None or rank < self.best_rank:
+                self.best, self.best_rank = policy, rank
+                self.best_months = months[k] if paid[k] else None
+                self.best_interest = interest[k]
+                improved = True
+        return improved
+
+
+def _seed_orders(pf: Portfolio) -> list[np.ndarray]:
+    rates = pf.rates_bp.astype(float)
+    balances = np.maximum(pf.balances, 1).astype(float)
+    minimums = pf.minimums.astype(float)
+
+    scores = [rates * balances, minimums / balances]          # interest cost, cash-flow freed
+    for alpha in (0.5, 1.0, 2.0):
+        for beta in (0.25, 0.5, 1.0):
+            scores.append(rates ** alpha / balances ** beta)
+
+    orders = [pf.priority("avalanche"), pf.priority("snowball")]
+    for score in scores:
+        orders.append(np.lexsort((pf.balances, -score)).astype(np.intp))
+    return orders
+
+
+def _neighbours(order: np.ndarray) -> list[np.ndarray]:
+    out = []
+    for i in range(len(order) - 1):
+        swapped = order.copy()
+        swapped[i], swapped[i + 1] = swapped[i + 1], swapped[i]
+        out.append(swapped)
+    for i in range(2, len(order)):
+        out.append(np.concatenate(([order[i]], np.delete(order, i))))
+    return out
+
+
+def _splits(order: np.ndarray, n: int) -> list[Policy]:
+    out = []
+    for k in range(1, min(n, SPLIT_CANDIDATES + 1)):
+        for share in SPLIT_FRACTIONS:
+            weights = np.zeros(n, dtype=np.int64)
+            weights[order[0]] = 1000 - share
+            weights[order[k]] = share
+            out.append(Policy(order=order, weights=weights))
+    return out
+
+
+def optimize(
+    pf: Portfolio,
+    extra_cents: int,
+    objective: str = "interest",
+    budget_seconds: float = SEARCH_BUDGET_SECONDS,
+) -> OptimizationResult:
+    """Find the best allocation policy for `pf` within `budget_seconds`."""
+    ev = _Evaluator(pf, extra_cents, objective, time.monotonic() + budget_seconds)
+    n = len(pf)
+
+    # Avalanche first, alone, so the other seeds are pruned against it
+    seeds = _seed_orders(pf)
+    ev.evaluate([Policy(order=seeds[0], weights=None)])
+    ev.evaluate([Policy(order=o, weights=None) for o in seeds[1:]])
+
+    improved = True
+    while improved and not ev.out_of_time():
+        best = ev.best
+        improved = ev.evaluate([Policy(order=o, weights=best.weights) for o in _neighbours(best.order)])
+        if n > 1 and not ev.out_of_time():
+            improved |= ev.evaluate(_splits(ev.best.order, n))
+
+    return OptimizationResult(
+        policy    = ev.best,
+        months    = ev.best_months,
+        interest  = ev.best_interest,
+        evaluated = ev.evaluated,
+    )
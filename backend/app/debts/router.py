@@ -5,6 +5,8 @@ from sqlalchemy.orm import Session
 
 from app.core.auth import get_current_user
 from app.core.dependencies import get_db
+from app.core.responses import ORJSONResponse
+from app.debts.engine import EngineFallback
 from app.debts.schemas import (
     AutoUpdateFromStatementRequest,
     AutoUpdateResult,
@@ -15,7 +17,11 @@ from app.debts.schemas import (
     DebtSimpleResponse,
     DueSoonDebtResponse,
     DebtSummary,
+    MonteCarloRequest,
+    MonteCarloResponse,
+    PayoffColumnarResponse,
     PayoffResponse,
+    PayoffSweepResponse,
 )
 from app.debts.service import (
     auto_update_from_statement,
@@ -27,7 +33,11 @@ from app.debts.service import (
     update_debt,
     delete_debt,
     get_payoff_plan,
+    get_payoff_sweep,
+    get_monte_carlo,
     get_debt_summary,
+    MAX_SWEEP_EXTRA,
+    MAX_SWEEP_LEVELS,
     record_payment,
 )
 
@@ -67,16 +77,93 @@ def auto_update(
     return auto_update_from_statement(db, user_id=current_user.id, statement_id=payload.statement_id)
 
 
-@router.get("/payoff", response_model=PayoffResponse)
+@router.get(
+    "/payoff",
+    response_model=PayoffResponse | PayoffColumnarResponse,
+    response_class=ORJSONResponse,
+)
 def read_payoff(
-    strategy:      str     = Query("avalanche", pattern="^(avalanche|snowball)$"),
+    strategy:      str     = Query("avalanche", pattern="^(avalanche|snowball|optimal)$"),
     extra_payment: Decimal = Query(Decimal("0"), ge=0),
+    fmt:           str     = Query("full", alias="format", pattern="^(full|columnar)$"),
+    resolution:    str     = Query("month", pattern="^(month|quarter|year)$"),
+    objective:     str     = Query("interest", pattern="^(interest|months)$"),
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    format=columnar returns parallel arrays (dates, totals, one balance list
+    per debt) instead of per-month objects; resolution=quarter|year keeps only
+    period-end months (plus the final month).
+
+    strategy=optimal searches priority orders and pool splits for the lowest
+    total interest (objective=interest) or earliest debt-free date
+    (objective=months) and reports the result against avalanche in `allocation`.
+    """
+    if not current_user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    try:
+        plan = get_payoff_plan(
+            db,
+            user_id=current_user.id,
+            strategy=strategy,
+            extra_payment=extra_payment,
+            resolution=resolution,
+            fmt=fmt,
+            objective=objective,
+        )
+    except EngineFallback as exc:   # only strategy=optimal lets it through
+        raise HTTPException(status_code=400, detail=f"extra_payment not supported for strategy=optimal: {exc}")
+    return ORJSONResponse(plan)
+
+
+@router.get("/payoff/sweep", response_model=PayoffSweepResponse, response_class=ORJSONResponse)
+def read_payoff_sweep(
+    strategy: str | None = Query(None, pattern="^(avalanche|snowball)$"),
+    min_extra: Decimal = Query(Decimal("0"), alias="min", ge=0, le=MAX_SWEEP_EXTRA, decimal_places=2),
+    max_extra: Decimal = Query(Decimal("1000"), alias="max", ge=0, le=MAX_SWEEP_EXTRA, decimal_places=2),
+    step:      Decimal = Query(Decimal("50"), gt=0, le=MAX_SWEEP_EXTRA, decimal_places=2),
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Months / interest / debt-free date for every extra payment from `min` to
+    `max` (inclusive) in `step` increments, as parallel arrays.  Both
+    strategies are returned unless `strategy` is given.
+    """
+    if not current_user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    if max_extra < min_extra:
+        raise HTTPException(status_code=400, detail="max must be greater than or equal to min")
+    count = int((max_extra - min_extra) // step) + 1
+    if count > MAX_SWEEP_LEVELS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Sweep would evaluate {count} levels; the limit is {MAX_SWEEP_LEVELS}",
+        )
+
+    levels = [min_extra + step * i for i in range(count)]
+    strategies = [strategy] if strategy else ["avalanche", "snowball"]
+    sweep = get_payoff_sweep(db, user_id=current_user.id, strategies=strategies, extra_payments=levels)
+    return ORJSONResponse(sweep)
+
+
+@router.post("/payoff/monte-carlo", response_model=MonteCarloResponse)
+def read_payoff_monte_carlo(
+    payload: MonteCarloRequest,
     current_user=Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
+    """
+    Debt-free date / interest percentile bands with variable-rate debts
+    following random-walk rate paths.
+    """
     if not current_user:
         raise HTTPException(status_code=401, detail="Not authenticated")
-    return get_payoff_plan(db, user_id=current_user.id, strategy=strategy, extra_payment=extra_payment)
+    try:
+        return get_monte_carlo(db, user_id=current_user.id, req=payload)
+    except EngineFallback as exc:
+        raise HTTPException(status_code=422, detail=f"Cannot simulate these debts: {exc}")
 
 
 @router.get("/summary", response_model=DebtSummary)
@@ -15,6 +15,8 @@ DebtType = Literal[
 
 PayoffStrategy = Literal["avalanche", "snowball"]
 
+PayoffResolution = Literal["month", "quarter", "year"]
+
 
 # ── CRUD schemas ──────────────────────────────────────────────────────────────
 
@@ -92,6 +94,23 @@ class MonthlyProjection(BaseModel):
     breakdown:     dict[str, Decimal]  # debt name → balance
 
 
+class AllocationSplit(BaseModel):
+    debt_id: int
+    share:   Decimal   # fraction of the extra-payment pool sent to this debt first
+
+
+class OptimalAllocation(BaseModel):
+    """How strategy=optimal allocates the pool, and what it gains over avalanche."""
+    objective:                    str
+    priority:                     list[int]               # debt ids; the remainder cascades in this order
+    split:                        list[AllocationSplit]   # empty = whole pool follows `priority`
+    policies_evaluated:           int
+    avalanche_total_months:       int | None
+    avalanche_total_interest:     Decimal
+    interest_saved_vs_avalanche:  Decimal
+    months_saved_vs_avalanche:    int | None
+
+
 class PayoffResponse(BaseModel):
     strategy:            str
     extra_payment:       Decimal
@@ -100,6 +119,79 @@ class PayoffResponse(BaseModel):
     total_interest_paid: Decimal
     payoff_order:        list[DebtPayoffDetail]
     monthly_projection:  list[MonthlyProjection]
+    allocation:          OptimalAllocation | None = None   # strategy=optimal only
+
+
+class PayoffColumnarDebt(BaseModel):
+    debt_id:          int
+    name:             str
+    original_balance: Decimal
+    interest_rate:    Decimal
+    months_to_payoff: int | None
+    payoff_date:      str | None
+    total_interest:   Decimal
+    order:            int
+    balances:         list[Decimal]  # parallel to PayoffColumnarResponse.dates
+
+
+class PayoffColumnarResponse(BaseModel):
+    """PayoffResponse as parallel arrays, sampled at `resolution`."""
+    strategy:            str
+    extra_payment:       Decimal
+    total_months:        int | None
+    debt_free_date:      str | None
+    total_interest_paid: Decimal
+    resolution:          PayoffResolution
+    months:              list[int]      # month numbers of the sampled points
+    dates:               list[str]      # "YYYY-MM"
+    total_balance:       list[Decimal]
+    debts:               list[PayoffColumnarDebt]  # in payoff order
+    allocation:          OptimalAllocation | None = None   # strategy=optimal only
+
+
+class PayoffSweepSeries(BaseModel):
+    # Parallel to PayoffSweepResponse.extra_payments
+    total_months:   list[int | None]
+    total_interest: list[Decimal]
+    debt_free_date: list[str | None]
+
+
+class PayoffSweepResponse(BaseModel):
+    extra_payments: list[Decimal]
+    strategies:     dict[str, PayoffSweepSeries]   # strategy → columns
+
+
+# ── Monte Carlo schemas ───────────────────────────────────────────────────────
+
+class MonteCarloRequest(BaseModel):
+    strategy:          PayoffStrategy = "avalanche"
+    extra_payment:     Decimal = Field(Decimal("0"), ge=0, decimal_places=2)
+    paths:             int = Field(2000, ge=100, le=20_000)
+    horizon_months:    int = Field(360, ge=12, le=600)
+    drift:             float = Field(0.0, ge=-10, le=10)   # rate change, % points / year
+    volatility:        float = Field(1.0, ge=0, le=20)     # std dev, % points / year
+    rate_floor:        float = Field(0.0, ge=0, le=100)
+    variable_debt_ids: list[int] | None = None  # None = mortgages and lines of credit
+    seed:              int | None = None
+
+
+class MonteCarloBand(BaseModel):
+    percentile:          int
+    months_to_debt_free: int | None   # None = not debt-free within the horizon
+    debt_free_date:      str | None
+    total_interest:      Decimal      # interest accrued within the horizon
+
+
+class MonteCarloResponse(BaseModel):
+    strategy:              str
+    extra_payment:         Decimal
+    paths:                 int
+    horizon_months:        int
+    variable_debt_ids:     list[int]
+    probability_debt_free: float        # share of paths debt-free within the horizon
+    fixed_rate_months:     int | None   # deterministic plan at today's rates
+    fixed_rate_interest:   Decimal
+    bands:                 list[MonteCarloBand]
 
 
 # ── Summary schema ────────────────────────────────────────────────────────────
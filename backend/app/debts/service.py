@@ -1,14 +1,21 @@
 from __future__ import annotations
 
 import calendar
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from decimal import Decimal, ROUND_HALF_UP
 
+import numpy as np
 from sqlalchemy.orm import Session
-from sqlalchemy import extract
-
-from app.debts.models import Debt
+from sqlalchemy import exists
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.core.cache import TTLCache
+from app.debts import engine, optimizer
+from app.debts.montecarlo import PERCENTILES, run_monte_carlo
+from app.debts.models import Debt, DebtDueStatus
+from app.users.service import bump_data_version
 from app.debts.schemas import (
+    AllocationSplit,
     AutoUpdateResult,
     DebtCreate,
     DebtUpdate,
@@ -16,9 +23,16 @@ from app.debts.schemas import (
     DebtSimpleResponse,
     DueSoonDebtResponse,
     DebtSummary,
+    MonteCarloBand,
+    MonteCarloRequest,
+    MonteCarloResponse,
     MonthlyBalance,
     MonthlyProjection,
+    OptimalAllocation,
+    PayoffColumnarResponse,
     PayoffResponse,
+    PayoffSweepResponse,
+    PayoffSweepSeries,
 )
 
 # ── CRUD helpers ───────────────────────────────────────────────────────────────
@@ -34,8 +48,11 @@ def create_debt(db: Session, user_id: int, data: DebtCreate) -> Debt:
         due_date        = data.due_date,
     )
     db.add(debt)
+    bump_data_version(db, user_id)
     db.commit()
     db.refresh(debt)
+    invalidate_payoff_cache(user_id)
+    refresh_due_status(db, user_id)
     return debt
 
 
@@ -51,20 +68,70 @@ def update_debt(db: Session, debt: Debt, data: DebtUpdate) -> Debt:
     for field, value in data.model_dump(exclude_unset=True).items():
         setattr(debt, field, value)
     debt.updated_at = datetime.utcnow()
+    bump_data_version(db, debt.user_id)
     db.commit()
     db.refresh(debt)
+    invalidate_payoff_cache(debt.user_id)
+    refresh_due_status(db, debt.user_id)
     return debt
 
 
 def delete_debt(db: Session, debt: Debt) -> None:
+    user_id = debt.user_id
+    bump_data_version(db, user_id)
     db.delete(debt)
     db.commit()
+    invalidate_payoff_cache(user_id)
+    refresh_due_status(db, user_id)
+
+
+# ── Payoff cache ───────────────────────────────────────────────────────────────
+#
+# Plans are keyed by a fingerprint of every input the simulation reads, plus
+# the current month (projection dates are relative to today), so an entry can
+# never describe different debts.  Debt writes still drop the user's entries
+# so memory is released as soon as they go stale.
+#
+# Full plans hold up to MAX_MONTHS × debts balances (~8 MB as pydantic models
+# for 20 debts over 600 months), so they get their own small cache; summaries
+# and sweeps are a few numbers per level and share the larger one.
+
+PAYOFF_CACHE_TTL = 15 * 60   # seconds
+PAYOFF_PLAN_CACHE_SIZE = 16
+_payoff_cache = TTLCache(maxsize=1024, ttl=PAYOFF_CACHE_TTL)
+_plan_cache = TTLCache(maxsize=PAYOFF_PLAN_CACHE_SIZE, ttl=PAYOFF_CACHE_TTL)
+
+
+def _portfolio_fingerprint(debts: list[Debt]) -> tuple:
+    return tuple(
+        (d.id, d.name, str(d.balance), str(d.interest_rate), str(d.minimum_payment))
+        for d in debts
+    )
+
+
+def _payoff_cache_key(
+    kind: str,
+    user_id: int,
+    debts: list[Debt],
+    strategy: str,
+    extra_payment: Decimal | tuple[Decimal, ...],
+) -> tuple:
+    today = date.today()
+    return (
+        user_id, kind, _portfolio_fingerprint(debts), strategy,
+        str(extra_payment), today.year, today.month,
+    )
+
+
+def invalidate_payoff_cache(user_id: int) -> None:
+    """Forget cached payoff plans and summaries for `user_id`."""
+    _payoff_cache.evict(lambda key: key[0] == user_id)
+    _plan_cache.evict(lambda key: key[0] == user_id)
 
 
 # ── Payoff simulation ──────────────────────────────────────────────────────────
 
 _TWO = Decimal("0.01")
-_MAX_MONTHS = 600   # 50 years cap
 
 
 def _round2(d: Decimal) -> Decimal:
@@ -87,6 +154,11 @@ def _simulate_payoff(
     """
     Run an avalanche or snowball payoff simulation.
 
+    Reference implementation in Decimal arithmetic.  Requests are served by
+    the vectorized engine in app.debts.engine, which must produce identical
+    results (see tests/test_payoff_engine.py); this one handles the inputs
+    that engine hands back via EngineFallback.
+
     - avalanche: pay highest-interest first
     - snowball:  pay lowest-balance first
 
@@ -127,7 +199,7 @@ def _simulate_payoff(
     freed_minimums = Decimal("0")  # minimums freed by paid-off debts
     month = 0
 
-    while any(s.balance > 0 for s in slots) and month < _MAX_MONTHS:
+    while any(s.balance > 0 for s in slots) and month < engine.MAX_MONTHS:
         month += 1
         label = _month_label(today, month)
 
@@ -243,10 +315,20 @@ def get_payoff_plan(
     user_id: int,
     strategy: str,
     extra_payment: Decimal,
-) -> PayoffResponse:
+    resolution: str = "month",
+    fmt: str = "full",
+    objective: str = "interest",
+) -> PayoffResponse | PayoffColumnarResponse:
+    """
+    Payoff plan for the user's debts.
+
+    resolution: "month" | "quarter" | "year" — sample points kept in the projection
+    fmt:        "full" (PayoffResponse) | "columnar" (PayoffColumnarResponse)
+    objective:  "interest" | "months" — what strategy=optimal minimises
+    """
     debts = get_debts(db, user_id)
     if not debts:
-        return PayoffResponse(
+        empty = PayoffResponse(
             strategy            = strategy,
             extra_payment       = extra_payment,
             total_months        = None,
@@ -255,14 +337,237 @@ def get_payoff_plan(
             payoff_order        = [],
             monthly_projection  = [],
         )
-    return _simulate_payoff(debts, strategy, extra_payment)
+        return engine.columnar_from_response(empty, date.today(), resolution) if fmt == "columnar" else empty
+
+    if strategy == "optimal":
+        key = _payoff_cache_key(f"plan:{fmt}:{resolution}:{objective}", user_id, debts, strategy, extra_payment)
+        return _plan_cache.get_or_set(
+            key, lambda: _run_optimal_payoff(debts, extra_payment, objective, resolution, fmt)
+        )
+    key = _payoff_cache_key(f"plan:{fmt}:{resolution}", user_id, debts, strategy, extra_payment)
+    return _plan_cache.get_or_set(key, lambda: _run_payoff(debts, strategy, extra_payment, resolution, fmt))
+
+
+def _run_payoff(
+    debts: list[Debt],
+    strategy: str,
+    extra_payment: Decimal,
+    resolution: str = "month",
+    fmt: str = "full",
+) -> PayoffResponse | PayoffColumnarResponse:
+    """
+    Simulate with the vectorized integer-cent engine; fall back to the Decimal
+    reference engine for inputs it cannot represent exactly.
+    """
+    columnar = fmt == "columnar"
+    try:
+        return engine.simulate_payoff(debts, strategy, extra_payment, resolution=resolution, columnar=columnar)
+    except engine.EngineFallback:
+        plan = _simulate_payoff(debts, strategy, extra_payment)
+        if columnar:
+            return engine.columnar_from_response(plan, date.today(), resolution)
+        return engine.downsample_response(plan, date.today(), resolution)
+
+
+def _run_optimal_payoff(
+    debts: list[Debt],
+    extra_payment: Decimal,
+    objective: str = "interest",
+    resolution: str = "month",
+    fmt: str = "full",
+) -> PayoffResponse | PayoffColumnarResponse:
+    """
+    Search allocation policies (app.debts.optimizer) and simulate the winner.
+    Portfolios the integer engine cannot represent get the avalanche plan
+    with no `allocation`; an extra_payment it cannot represent (sub-cent or
+    past int64 range) raises engine.EngineFallback.
+    """
+    extra_cents = engine.to_cents(extra_payment)
+    try:
+        pf = engine.Portfolio.from_debts(debts)
+        avalanche = engine.summarize_payoff(debts, "avalanche", extra_payment)
+        result = optimizer.optimize(pf, extra_cents, objective)
+    except engine.EngineFallback:
+        return _run_payoff(debts, "avalanche", extra_payment, resolution, fmt)
+
+    policy = result.policy
+    run = engine.simulate(
+        pf,
+        "optimal",
+        np.array([extra_cents], dtype=np.int64),
+        orders=policy.order[None, :],
+        weights=policy.weights[None, :] if policy.weights is not None else None,
+        resolution=resolution,
+    )
+    plan = run.to_columnar(extra_payment) if fmt == "columnar" else run.to_response(extra_payment)
+
+    split = []
+    if policy.weights is not None:
+        split = [
+            AllocationSplit(debt_id=pf.debt_ids[i], share=Decimal(int(w)).scaleb(-3))
+            for i in policy.order.tolist()
+            if (w := policy.weights[i]) > 0
+        ]
+    months_saved = None
+    if avalanche.total_months is not None and plan.total_months is not None:
+        months_saved = avalanche.total_months - plan.total_months
+    allocation = OptimalAllocation(
+        objective                   = objective,
+        priority                    = [pf.debt_ids[i] for i in policy.order.tolist()],
+        split                       = split,
+        policies_evaluated          = result.evaluated,
+        avalanche_total_months      = avalanche.total_months,
+        avalanche_total_interest    = avalanche.total_interest_paid,
+        interest_saved_vs_avalanche = avalanche.total_interest_paid - plan.total_interest_paid,
+        months_saved_vs_avalanche   = months_saved,
+    )
+    return plan.model_copy(update={"allocation": allocation})
+
+
+# ── Extra-payment sweep ────────────────────────────────────────────────────────
+
+MAX_SWEEP_LEVELS = 500
+MAX_SWEEP_EXTRA = Decimal("1000000")   # $/month; keeps level arithmetic well inside int64 cents
+
+
+def get_payoff_sweep(
+    db: Session,
+    user_id: int,
+    strategies: list[str],
+    extra_payments: list[Decimal],
+) -> PayoffSweepResponse:
+    """
+    total_months / total_interest / debt_free_date for every extra-payment
+    level, one batched simulation per strategy.
+    """
+    debts = get_debts(db, user_id)
+    levels = tuple(extra_payments)
+
+    def run(strategy: str) -> PayoffSweepSeries:
+        if not debts:
+            return PayoffSweepSeries(
+                total_months   = [None] * len(levels),
+                total_interest = [Decimal("0")] * len(levels),
+                debt_free_date = [None] * len(levels),
+            )
+        try:
+            months, interest, dates = engine.sweep_payoff(debts, strategy, list(levels))
+        except engine.EngineFallback:
+            summaries = [summarize_payoff(debts, strategy, extra) for extra in levels]
+            months   = [s.total_months for s in summaries]
+            interest = [s.total_interest_paid for s in summaries]
+            dates    = [s.debt_free_date for s in summaries]
+        return PayoffSweepSeries(total_months=months, total_interest=interest, debt_free_date=dates)
+
+    series = {}
+    for strategy in strategies:
+        key = _payoff_cache_key("sweep", user_id, debts, strategy, levels)
+        series[strategy] = _payoff_cache.get_or_set(key, lambda: run(strategy))
+    return PayoffSweepResponse(extra_payments=list(levels), strategies=series)
+
+
+# ── Monte Carlo (variable rates) ───────────────────────────────────────────────
+
+VARIABLE_RATE_TYPES = ("mortgage", "line_of_credit")
+
+
+def get_monte_carlo(db: Session, user_id: int, req: MonteCarloRequest) -> MonteCarloResponse:
+    """
+    Percentile bands of debt-free date and interest when variable-rate debts
+    follow random-walk rate paths (see app.debts.montecarlo).
+
+    The simulation only runs in integer cents; raises engine.EngineFallback
+    for debts it cannot represent, as there is no Decimal path to fall back to.
+    """
+    debts = get_debts(db, user_id)
+    if req.variable_debt_ids is None:
+        variable_ids = [d.id for d in debts if d.debt_type in VARIABLE_RATE_TYPES]
+    else:
+        wanted = set(req.variable_debt_ids)
+        variable_ids = [d.id for d in debts if d.id in wanted]
+
+    response = MonteCarloResponse(
+        strategy              = req.strategy,
+        extra_payment         = req.extra_payment,
+        paths                 = req.paths,
+        horizon_months        = req.horizon_months,
+        variable_debt_ids     = variable_ids,
+        probability_debt_free = 1.0,
+        fixed_rate_months     = None,
+        fixed_rate_interest   = Decimal("0"),
+        bands                 = [],
+    )
+    if not debts:
+        return response
+
+    fixed = summarize_payoff(debts, req.strategy, req.extra_payment)
+    pf = engine.Portfolio.from_debts(debts)
+    result = run_monte_carlo(
+        pf,
+        strategy    = req.strategy,
+        extra_cents = engine.to_cents(req.extra_payment),
+        variable    = np.array([d.id in variable_ids for d in debts]),
+        paths       = req.paths,
+        horizon     = req.horizon_months,
+        drift       = req.drift,
+        volatility  = req.volatility,
+        floor       = req.rate_floor,
+        seed        = req.seed,
+    )
+
+    today = date.today()
+    months, interest = result.percentiles()
+    response.probability_debt_free = result.probability_debt_free()
+    response.fixed_rate_months     = fixed.total_months
+    response.fixed_rate_interest   = fixed.total_interest_paid
+    response.bands = [
+        MonteCarloBand(
+            percentile          = q,
+            months_to_debt_free = m,
+            debt_free_date      = _month_label(today, m) if m else None,
+            total_interest      = engine.from_cents(c),
+        )
+        for q, m, c in zip(PERCENTILES, months, interest)
+    ]
+    return response
 
 
 # ── Summary ────────────────────────────────────────────────────────────────────
 
+def summarize_payoff(
+    debts: list[Debt],
+    strategy: str,
+    extra_payment: Decimal,
+) -> engine.PayoffSummary:
+    """
+    Summary-only payoff simulation (no monthly projection) for callers that
+    just need debt-free dates, interest totals and payoff order.  `debts` must
+    all belong to one user.
+    """
+    def run() -> engine.PayoffSummary:
+        try:
+            return engine.summarize_payoff(debts, strategy, extra_payment)
+        except engine.EngineFallback:
+            return engine.PayoffSummary.from_response(_simulate_payoff(debts, strategy, extra_payment))
+
+    if not debts:
+        return run()
+    key = _payoff_cache_key("summary", debts[0].user_id, debts, strategy, extra_payment)
+    return _payoff_cache.get_or_set(key, run)
+
+
 def get_debt_summary(db: Session, user_id: int) -> DebtSummary:
-    debts = get_debts(db, user_id)
+    return summarize_debts(get_debts(db, user_id))
+
 
+def summarize_debts(
+    debts: list[Debt],
+    avalanche: engine.PayoffSummary | None = None,
+) -> DebtSummary:
+    """
+    Build the DebtSummary for an already-loaded list of debts.  Pass the
+    zero-extra `avalanche` summary if the caller has already computed it.
+    """
     if not debts:
         return DebtSummary(
             total_debt                     = Decimal("0"),
@@ -288,8 +593,8 @@ def get_debt_summary(db: Session, user_id: int) -> DebtSummary:
         weighted_rate = None
 
     # Run both strategies with no extra payment for the summary dates
-    av = _simulate_payoff(debts, "avalanche", Decimal("0"))
-    sn = _simulate_payoff(debts, "snowball",  Decimal("0"))
+    av = avalanche or summarize_payoff(debts, "avalanche", Decimal("0"))
+    sn = summarize_payoff(debts, "snowball", Decimal("0"))
 
     return DebtSummary(
         total_debt                     = _round2(total_debt),
@@ -320,8 +625,10 @@ def record_payment(
     new_balance = max(Decimal(str(debt.balance)) - amount, Decimal("0"))
     debt.balance               = new_balance
     debt.last_manual_update_at = datetime.utcnow()
+    bump_data_version(db, debt.user_id)
     db.commit()
     db.refresh(debt)
+    invalidate_payoff_cache(debt.user_id)
 
     # Create a linked transaction (skipped silently on duplicate key)
     create_transaction(
@@ -336,6 +643,7 @@ def record_payment(
         transaction_type="debt_payment",
         debt_payment_link=debt.id,
     )
+    refresh_due_status(db, debt.user_id)
 
     return debt
 
@@ -382,8 +690,10 @@ def auto_update_from_statement(
     debt.last_statement_balance = new_balance
     debt.balance                = new_balance
     debt.last_verified_at       = datetime.utcnow()
+    bump_data_version(db, user_id)
     db.commit()
     db.refresh(debt)
+    invalidate_payoff_cache(user_id)
 
     return AutoUpdateResult(
         updated=True,
@@ -400,47 +710,115 @@ def get_simple_debts(db: Session, user_id: int) -> list[DebtSimpleResponse]:
 
 
 # ── Due-soon list ──────────────────────────────────────────────────────────────
+#
+# debt_due_status holds one row per debt with a due_date: this month's due
+# date and whether a linked payment transaction exists this month.  Rows are
+# rebuilt for a user on every debt or payment write and for everyone by the
+# hourly scheduler job, so reads are a single indexed query.  Reads never
+# write: when the rows are stale or missing they are recomputed in memory.
 
-def get_due_soon(db: Session, user_id: int) -> list[DueSoonDebtResponse]:
-    """
-    Return debts whose due_date falls within the next 3 calendar days and that
-    have not yet had a linked payment transaction this month.
-    """
+DUE_SOON_DAYS_AHEAD = 3
+DUE_SOON_DAYS_OVERDUE = 7
+DUE_STATUS_REFRESH_SECONDS = 60 * 60
+
+
+def _compute_due_status(db: Session, today: date, user_id: int | None = None) -> list[dict]:
+    """debt_due_status rows for `user_id` (or every user), in one joined query."""
     from app.transactions.models import Transaction  # local import avoids circular
 
-    today       = date.today()
+    month_start = today.replace(day=1)
     last_day    = calendar.monthrange(today.year, today.month)[1]
-    due_soon: list[DueSoonDebtResponse] = []
+    next_month  = month_start.replace(day=last_day) + timedelta(days=1)
+
+    # Correlated EXISTS on (debt_payment_link, date) — served by
+    # ix_transactions_debt_payment_link_date
+    paid = (
+        exists()
+        .where(
+            Transaction.debt_payment_link == Debt.id,
+            Transaction.date >= month_start,
+            Transaction.date < next_month,
+        )
+        .label("paid")
+    )
+    query = db.query(Debt.id, Debt.user_id, Debt.due_date, paid).filter(Debt.due_date.isnot(None))
+    if user_id is not None:
+        query = query.filter(Debt.user_id == user_id)
+
+    return [
+        {
+            "debt_id":         debt_id,
+            "user_id":         owner_id,
+            "due_on":          date(today.year, today.month, min(due_day, last_day)),
+            "paid_this_month": bool(is_paid),
+            "computed_on":     today,
+        }
+        for debt_id, owner_id, due_day, is_paid in query.all()
+    ]
+
+
+def refresh_due_status(db: Session, user_id: int | None = None) -> int:
+    """
+    Recompute debt_due_status for `user_id` (or every user) and commit;
+    returns the number of rows written.
 
-    debts = (
-        db.query(Debt)
-        .filter(Debt.user_id == user_id, Debt.due_date.isnot(None))
-        .all()
+    Rows are upserted on debt_id, so concurrent refreshes (a debt write racing
+    the scheduler) both succeed; only rows whose debt is gone or no longer
+    has a due_date are deleted.
+    """
+    rows = _compute_due_status(db, date.today(), user_id)
+    stale = db.query(DebtDueStatus).filter(
+        ~exists().where(Debt.id == DebtDueStatus.debt_id, Debt.due_date.isnot(None))
     )
+    if user_id is not None:
+        stale = stale.filter(DebtDueStatus.user_id == user_id)
+    stale.delete(synchronize_session=False)
+    if rows:
+        dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+        upsert = dialect.insert(DebtDueStatus)
+        db.execute(
+            upsert.on_conflict_do_update(
+                index_elements=[DebtDueStatus.debt_id],
+                set_={
+                    column: upsert.excluded[column]
+                    for column in ("user_id", "due_on", "paid_this_month", "computed_on")
+                },
+            ),
+            rows,
+        )
+    db.commit()
+    return len(rows)
 
-    for debt in debts:
-        # Clamp due_date to the last valid day of this month
-        effective_due = min(debt.due_date, last_day)
-        due_this_month = date(today.year, today.month, effective_due)
 
-        # Within next 3 days OR up to 7 days overdue?
-        days_until = (due_this_month - today).days
-        if not (-7 <= days_until <= 3):
-            continue
+def get_due_soon(db: Session, user_id: int) -> list[DueSoonDebtResponse]:
+    """
+    Return debts whose due_date falls within the next 3 calendar days (or up
+    to 7 days overdue) and that have not yet had a linked payment transaction
+    this month.  Reads debt_due_status; if it predates today, or has no rows
+    for a user whose debts have due dates (e.g. debts created before the table
+    existed), the status is recomputed in memory and left for the scheduler
+    job or the next debt write to store.
+    """
+    today = date.today()
+    rows = (
+        db.query(Debt, DebtDueStatus)
+        .join(DebtDueStatus, DebtDueStatus.debt_id == Debt.id)
+        .filter(DebtDueStatus.user_id == user_id)
+        .all()
+    )
+    if any(status.computed_on != today for _, status in rows) or (
+        not rows
+        and db.query(exists().where(Debt.user_id == user_id, Debt.due_date.isnot(None))).scalar()
+    ):
+        statuses = {row["debt_id"]: DebtDueStatus(**row) for row in _compute_due_status(db, today, user_id)}
+        debts = db.query(Debt).filter(Debt.id.in_(statuses)).all() if statuses else []
+        rows = [(debt, statuses[debt.id]) for debt in debts]
 
-        # Has a linked payment transaction been recorded this month?
-        paid_this_month = (
-            db.query(Transaction)
-            .filter(
-                Transaction.debt_payment_link == debt.id,
-                extract("year",  Transaction.date) == today.year,
-                extract("month", Transaction.date) == today.month,
-            )
-            .first()
-        )
-        if paid_this_month:
+    due_soon: list[DueSoonDebtResponse] = []
+    for debt, status in rows:
+        days_until = (status.due_on - today).days
+        if status.paid_this_month or not (-DUE_SOON_DAYS_OVERDUE <= days_until <= DUE_SOON_DAYS_AHEAD):
             continue
-
         due_soon.append(DueSoonDebtResponse(
             id=debt.id,
             name=debt.name,
@@ -452,4 +830,5 @@ def get_due_soon(db: Session, user_id: int) -> list[DueSoonDebtResponse]:
             last_manual_update_at=debt.last_manual_update_at,
         ))
 
+    due_soon.sort(key=lambda d: (d.days_until_due, d.id))
     return due_soon
@@ -1,4 +1,8 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
+from app.core import scheduler
 from app.api import users
 from app.api import auth
 from app.transactions import router as transactions_router
@@ -6,11 +10,28 @@ from app.insights import router as insights_router
 from app.budgets import router as budgets_router
 from app.users import router as users_settings_router
 from app.chatbot import router as chatbot_router
+from app.chatbot.intent_classifier import get_classifier
 from app.debts import router as debts_router
 from app.ml import router as ml_router
+from app.debts.service import DUE_STATUS_REFRESH_SECONDS, refresh_due_status
+from app.sessions.service import SESSION_PURGE_SECONDS, purge_expired_sessions
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI()
+# ── Background jobs ───────────────────────────────────────────────────────────
+scheduler.register("debt-due-status", DUE_STATUS_REFRESH_SECONDS, refresh_due_status)
+scheduler.register("session-purge", SESSION_PURGE_SECONDS, purge_expired_sessions)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Fit the intent classifier now, not inside the first /chatbot/ask
+    await run_in_threadpool(get_classifier)
+    scheduler.start()
+    yield
+    await scheduler.stop()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(users.router)
 app.include_router(auth.router)
@@ -185,6 +185,36 @@ def predict(db: Session, user_id: int, description: str) -> Optional[tuple[str,
         return None
 
 
+def predict_batch(
+    db: Session, user_id: int, descriptions: list[str]
+) -> Optional[list[tuple[str, float]]]:
+    """
+    Batch version of predict(): loads the model once and scores every
+    description in a single predict_proba call.
+
+    Returns a list of (category, confidence) aligned with `descriptions`, or
+    None if the user has no usable model.
+    """
+    record = load_model_record(db, user_id)
+    if record is None or not os.path.exists(record.path):
+        return None
+    if not descriptions:
+        return []
+
+    pipeline: Pipeline = joblib.load(record.path)
+
+    try:
+        proba = pipeline.predict_proba(descriptions)
+    except Exception:
+        return None
+    top_idx = proba.argmax(axis=1)
+    confidences = proba[range(len(descriptions)), top_idx]
+    return [
+        (pipeline.classes_[idx], float(conf))
+        for idx, conf in zip(top_idx, confidences)
+    ]
+
+
 def load_model_record(db: Session, user_id: int) -> Optional[MLModel]:
     """Return the latest MLModel record for user, or None."""
     return (
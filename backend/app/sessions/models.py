@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime, timedelta
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 
 from app.database.base import Base
 
@@ -10,7 +10,12 @@ class Session(Base):
     id = Column(Integer, primary_key=True)
     session_id = Column(String, index=True, unique=True, nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    expires_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)   # expired-session purge
+
+    __table_args__ = (
+        # Per-user live-session cap: a user's sessions, newest first
+        Index("ix_sessions_user_id_expires_at", "user_id", "expires_at"),
+    )
 
     @staticmethod
     def generate_session_id():
@@ -1,18 +1,64 @@
+"""
+Login sessions.
+
+Every Google login inserts a session row.  Two things keep the table small,
+so session lookups stay on a hot index:
+
+  - create_session() caps each user at MAX_SESSIONS_PER_USER live sessions,
+    deleting the oldest beyond it.
+  - purge_expired_sessions() deletes expired rows in SESSION_PURGE_BATCH
+    chunks (via ix_sessions_expires_at), at startup and every
+    SESSION_PURGE_SECONDS from the scheduler.
+
+get_session() still rejects expired rows, so correctness never depends on
+the purge having run.  Evicted sessions are also dropped from this worker's
+auth cache (app.core.auth), as logout does.
+"""
 from datetime import datetime
 from sqlalchemy.orm import Session
 from app.sessions.models import Session as SessionModel
 
+MAX_SESSIONS_PER_USER = 10
+SESSION_PURGE_BATCH = 5000
+SESSION_PURGE_SECONDS = 60 * 60
+
+
 def create_session(db: Session, user_id: int):
     session = SessionModel(
         session_id=SessionModel.generate_session_id(),
         user_id=user_id,
         expires_at=SessionModel.default_expiry(),
     )
+    from app.core.auth import forget_session  # local import avoids circular
+
     db.add(session)
+    db.flush()
+    evicted = _evict_oldest_sessions(db, user_id)
     db.commit()
+    for session_id in evicted:
+        forget_session(session_id)
     db.refresh(session)
     return session
 
+
+def _evict_oldest_sessions(db: Session, user_id: int) -> list[str]:
+    """
+    Delete the user's sessions beyond the newest MAX_SESSIONS_PER_USER;
+    returns their session ids.
+    """
+    surplus = (
+        db.query(SessionModel.id, SessionModel.session_id)
+        .filter(SessionModel.user_id == user_id)
+        .order_by(SessionModel.expires_at.desc(), SessionModel.id.desc())
+        .offset(MAX_SESSIONS_PER_USER)
+        .all()
+    )
+    if surplus:
+        ids = [row.id for row in surplus]
+        db.query(SessionModel).filter(SessionModel.id.in_(ids)).delete(synchronize_session=False)
+    return [row.session_id for row in surplus]
+
+
 def get_session(db: Session, session_id: str):
     session = (
         db.query(SessionModel)
@@ -27,3 +73,28 @@ def get_session(db: Session, session_id: str):
         return None
 
     return session
+
+
+def purge_expired_sessions(db: Session, batch_size: int = SESSION_PURGE_BATCH) -> int:
+    """
+    Delete expired sessions, committing every `batch_size` rows so the purge
+    never holds long locks on the table; returns the number deleted.
+    """
+    now = datetime.utcnow()
+    purged = 0
+    while True:
+        ids = [
+            row.id
+            for row in db.query(SessionModel.id)
+            .filter(SessionModel.expires_at < now)
+            .order_by(SessionModel.expires_at)
+            .limit(batch_size)
+        ]
+        if not ids:
+            break
+        db.query(SessionModel).filter(SessionModel.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+        purged += len(ids)
+        if len(ids) < batch_size:
+            break
+    return purged
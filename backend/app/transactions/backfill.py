@@ -0,0 +1,213 @@
+"""
+Set-based backfill of transactions.source / transactions.transaction_type.
+
+Rows are processed in primary-key order, one chunk at a time:
+
+  1. Fetch the next `batch_size` rows after the last processed id
+     (only the columns we need — no ORM objects).
+  2. Infer a missing source from the user's credit-card statement windows.
+     Every window is [uploaded_at - 90 days, uploaded_at], so with the window
+     ends sorted a single bisect finds the only candidate that can cover a
+     date — O(log m) per row instead of scanning every statement.
+  3. Derive transaction_type via detect_transaction_type(), then apply the
+     user's stored type overrides exactly like the upload flow does.
+  4. Write the changed rows back with one bulk UPDATE and commit.
+
+Each chunk commits on its own, so an interrupted run can be resumed with
+--after-id set to the last id it reported.
+
+Run for every user after a classifier change:
+    python -m app.transactions.backfill --reclassify
+"""
+import argparse
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Callable
+
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+
+from app.bank_statements.models import BankStatement
+from app.categorization.models import CategoryOverride
+from app.transactions.models import Transaction
+from app.transactions.type_detection import detect_transaction_type
+from app.users.service import bump_data_version
+
+DEFAULT_BATCH_SIZE = 2000
+DETECTION_CACHE_SIZE = 10_000   # distinct (description, sign, source) keys memoised
+CC_WINDOW = timedelta(days=90)
+
+
+def _load_cc_window_ends(db: Session, user_id: int | None) -> dict[int, list[date]]:
+    """Return user_id → sorted list of credit-card statement upload dates."""
+    query = db.query(BankStatement.user_id, BankStatement.uploaded_at).filter(
+        BankStatement.statement_type == "credit_card"
+    )
+    if user_id is not None:
+        query = query.filter(BankStatement.user_id == user_id)
+
+    ends: dict[int, list[date]] = defaultdict(list)
+    for row in query:
+        ends[row.user_id].append(row.uploaded_at.date())
+    for user_ends in ends.values():
+        user_ends.sort()
+    return ends
+
+
+def _load_type_overrides(db: Session, user_id: int | None) -> dict[int, list[tuple[str, str]]]:
+    """Return user_id → [(UPPERCASE pattern, transaction_type)] for stored type overrides."""
+    query = db.query(
+        CategoryOverride.user_id,
+        CategoryOverride.description_pattern,
+        CategoryOverride.transaction_type,
+    ).filter(CategoryOverride.transaction_type.isnot(None))
+    if user_id is not None:
+        query = query.filter(CategoryOverride.user_id == user_id)
+
+    overrides: dict[int, list[tuple[str, str]]] = defaultdict(list)
+    for row in query:
+        overrides[row.user_id].append((row.description_pattern.upper(), row.transaction_type))
+    return overrides
+
+
+@lru_cache(maxsize=DETECTION_CACHE_SIZE)
+def _detect_type(description: str, is_credit: bool, source: str) -> str:
+    """
+    detect_transaction_type() memoised per (description, sign, source) —
+    descriptions repeat heavily (same merchants every month) and detection
+    only looks at the amount's sign.  Bounded, so a large table cannot grow
+    it without limit.
+    """
+    return detect_transaction_type(description=description, amount=1.0 if is_credit else -1.0, source=source)
+
+
+def infer_source(window_ends: list[date], txn_date: date) -> str:
+    """
+    'credit_card' if txn_date falls inside any [end - 90 days, end] window,
+    otherwise 'chequing'.
+
+    Because all windows have the same length, the first window ending on or
+    after txn_date is the only one that can contain it.
+    """
+    idx = bisect_left(window_ends, txn_date)
+    if idx < len(window_ends) and window_ends[idx] - CC_WINDOW <= txn_date:
+        return "credit_card"
+    return "chequing"
+
+
+def backfill_types(
+    db: Session,
+    user_id: int | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    after_id: int = 0,
+    reclassify: bool = False,
+    on_batch: Callable[[int, int], None] | None = None,
+) -> dict:
+    """
+    Fill in null source / transaction_type values, chunk by chunk.
+
+    user_id:    restrict to one user (None = every user)
+    after_id:   resume point — only rows with id > after_id are visited
+    reclassify: recompute transaction_type for every row, not just nulls
+                (use after changing the detection rules)
+    on_batch:   optional progress callback(last_id, updated_so_far)
+
+    Returns {"updated": <rows written>, "last_id": <last id visited>}.
+    """
+    window_ends = _load_cc_window_ends(db, user_id)
+    type_overrides = _load_type_overrides(db, user_id)
+
+    updated = 0
+    last_id = after_id
+
+    while True:
+        query = db.query(
+            Transaction.id,
+            Transaction.user_id,
+            Transaction.date,
+            Transaction.description,
+            Transaction.amount,
+            Transaction.source,
+            Transaction.transaction_type,
+        ).filter(Transaction.id > last_id)
+        if user_id is not None:
+            query = query.filter(Transaction.user_id == user_id)
+        if not reclassify:
+            query = query.filter(
+                or_(Transaction.source == None, Transaction.transaction_type == None)  # noqa: E711
+            )
+        rows = query.order_by(Transaction.id).limit(batch_size).all()
+        if not rows:
+            break
+
+        changes: list[dict] = []
+        touched: set[int] = set()
+        for row in rows:
+            source = row.source
+            if source is None:
+                source = infer_source(window_ends.get(row.user_id, []), row.date)
+
+            txn_type = row.transaction_type
+            if txn_type is None or reclassify:
+                txn_type = _detect_type(row.description, row.amount > 0, source)
+
+                upper = row.description.upper()
+                for pattern, override_type in type_overrides.get(row.user_id, ()):
+                    if pattern in upper:
+                        txn_type = override_type
+                        break
+
+            if source != row.source or txn_type != row.transaction_type:
+                changes.append({"id": row.id, "source": source, "transaction_type": txn_type})
+                touched.add(row.user_id)
+
+        if changes:
+            db.execute(update(Transaction), changes)
+            bump_data_version(db, touched)
+        db.commit()
+
+        updated += len(changes)
+        last_id = rows[-1].id
+        if on_batch is not None:
+            on_batch(last_id, updated)
+
+    return {"updated": updated, "last_id": last_id}
+
+
+def main() -> None:
+    from app.database.session import SessionLocal
+    import app.main  # noqa: F401 — registers every mapped model
+
+    parser = argparse.ArgumentParser(description="Backfill transaction source / transaction_type.")
+    parser.add_argument("--user-id", type=int, default=None, help="only this user (default: all users)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--after-id", type=int, default=0, help="resume after this transaction id")
+    parser.add_argument(
+        "--reclassify",
+        action="store_true",
+        help="recompute transaction_type on every row, not just missing ones",
+    )
+    args = parser.parse_args()
+
+    def progress(last_id: int, updated: int) -> None:
+        print(f"  processed through id {last_id} — {updated} row(s) updated")
+
+    db = SessionLocal()
+    try:
+        result = backfill_types(
+            db,
+            user_id=args.user_id,
+            batch_size=args.batch_size,
+            after_id=args.after_id,
+            reclassify=args.reclassify,
+            on_batch=progress,
+        )
+    finally:
+        db.close()
+    print(f"Done: {result['updated']} row(s) updated, last id {result['last_id']}.")
+
+
+if __name__ == "__main__":
+    main()
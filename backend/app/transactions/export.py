@@ -0,0 +1,176 @@
+"""
+Streaming export of a user's transaction history.
+
+Rows are read through a server-side cursor (`yield_per`) and encoded batch by
+batch, so memory use depends on the batch size rather than on how many years
+of history the user has.  Each generator yields bytes chunks suitable for a
+StreamingResponse.
+
+Formats:
+  csv      — header row + one line per transaction
+  ndjson   — one JSON object per line
+  parquet  — one row group per batch (requires the optional pyarrow package)
+"""
+import csv
+import io
+from datetime import date
+from typing import Iterator
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.responses import dumps
+from app.transactions.models import Transaction
+
+EXPORT_FORMATS = {
+    "csv":     "text/csv",
+    "ndjson":  "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+EXPORT_BATCH_SIZE = 2000
+
+_EXPORT_COLUMNS = (
+    Transaction.id,
+    Transaction.date,
+    Transaction.description,
+    Transaction.amount,
+    Transaction.category,
+    Transaction.category_source,
+    Transaction.source,
+    Transaction.transaction_type,
+)
+_FIELD_NAMES = [c.key for c in _EXPORT_COLUMNS]
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _iter_batches(
+    db: Session,
+    user_id: int,
+    start_date: date | None,
+    end_date: date | None,
+    category: str | None,
+) -> Iterator[list]:
+    """Yield lists of Row tuples, `EXPORT_BATCH_SIZE` at a time, oldest first."""
+    stmt = select(*_EXPORT_COLUMNS).where(Transaction.user_id == user_id)
+    if start_date is not None:
+        stmt = stmt.where(Transaction.date >= start_date)
+    if end_date is not None:
+        stmt = stmt.where(Transaction.date <= end_date)
+    if category is not None:
+        stmt = stmt.where(Transaction.category == category)
+    stmt = stmt.order_by(Transaction.date, Transaction.id)
+
+    # yield_per turns on stream_results: a server-side cursor on PostgreSQL
+    result = db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    try:
+        yield from result.partitions()
+    finally:
+        result.close()
+
+
+def _iter_csv(batches: Iterator[list]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(_FIELD_NAMES)
+    for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    tail = buffer.getvalue()
+    if tail:
+        yield tail.encode("utf-8")
+
+
+def _iter_ndjson(batches: Iterator[list]) -> Iterator[bytes]:
+    for rows in batches:
+        yield b"".join(dumps(row._asdict()) + b"\n" for row in rows)
+
+
+class _ChunkSink:
+    """Minimal writable file object that hands written bytes back on drain()."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _iter_parquet(batches: Iterator[list]) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("id",               pa.int64()),
+        ("date",             pa.date32()),
+        ("description",      pa.string()),
+        ("amount",           pa.decimal128(10, 2)),
+        ("category",         pa.string()),
+        ("category_source",  pa.string()),
+        ("source",           pa.string()),
+        ("transaction_type", pa.string()),
+    ])
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for rows in batches:
+            columns = list(zip(*rows))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(col, type=field.type) for col, field in zip(columns, schema)],
+                schema=schema,
+            ))
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def iter_export(
+    db: Session,
+    user_id: int,
+    fmt: str,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    category: str | None = None,
+) -> Iterator[bytes]:
+    """Return a bytes iterator encoding the user's transactions in `fmt`."""
+    batches = _iter_batches(db, user_id, start_date, end_date, category)
+    if fmt == "csv":
+        return _iter_csv(batches)
+    if fmt == "ndjson":
+        return _iter_ndjson(batches)
+    if fmt == "parquet":
+        return _iter_parquet(batches)
+    raise ValueError(f"Unsupported export format: {fmt}")
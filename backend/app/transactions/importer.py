@@ -0,0 +1,196 @@
+"""
+Bulk import of CSV / OFX / QFX bank exports.
+
+Pipeline (per chunk of IMPORT_CHUNK_SIZE records):
+  1. Stream records out of the file parser.
+  2. Categorize the whole chunk at once (categorize_batch) and derive
+     transaction_type with detect_transaction_type() + stored type overrides.
+  3. Load the chunk:
+       PostgreSQL — COPY into a temporary staging table
+       other DBs  — executemany into the staging table
+
+After the last chunk a single INSERT … SELECT merges the staging table into
+transactions, skipping anything that collides with uq_user_transaction, so
+re-importing an overlapping export never creates duplicates.
+"""
+import csv
+import io
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Iterable, Iterator
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.categorization.service import categorize_batch, get_type_overrides_batch
+from app.transactions.parser.parse_csv import iter_csv_records
+from app.transactions.parser.parse_ofx import detect_ofx_source, iter_ofx_records
+from app.transactions.type_detection import detect_transaction_type
+
+IMPORT_FORMATS = {"csv", "ofx", "qfx"}
+IMPORT_CHUNK_SIZE = 5000
+
+_STAGING_TABLE = "transaction_import_staging"
+_STAGING_COLUMNS = (
+    "user_id", "date", "description", "amount",
+    "category", "category_source", "source", "transaction_type",
+)
+
+
+@dataclass
+class ImportResult:
+    rows_read: int = 0
+    rows_rejected: int = 0
+    transactions_created: int = 0
+
+    @property
+    def transactions_skipped(self) -> int:
+        return self.rows_read - self.rows_rejected - self.transactions_created
+
+
+def import_format_for(filename: str) -> str | None:
+    """Map a filename to 'csv' | 'ofx' | 'qfx' by extension, or None."""
+    ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    return ext if ext in IMPORT_FORMATS else None
+
+
+def iter_records(fmt: str, stream: io.BufferedIOBase, default_source: str) -> tuple[Iterator[dict | None], str]:
+    """
+    Return (record iterator, source) for an uploaded file.
+
+    CSV is decoded and parsed line by line straight off the upload stream.
+    OFX/QFX statements are SGML without reliable line structure, so they are
+    decoded in one go (statement downloads are small compared to CSV history
+    exports); the account type in the file overrides `default_source`.
+    """
+    if fmt == "csv":
+        lines = io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace", newline="")
+        return iter_csv_records(lines), default_source
+
+    raw = stream.read().decode("utf-8", errors="replace")
+    return iter_ofx_records(raw), detect_ofx_source(raw) or default_source
+
+
+def _chunks(records: Iterable[dict | None], size: int, result: ImportResult) -> Iterator[list[dict]]:
+    chunk: list[dict] = []
+    for record in records:
+        result.rows_read += 1
+        if record is None:
+            result.rows_rejected += 1
+            continue
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _enrich(db: Session, user_id: int, chunk: list[dict], source: str) -> list[tuple]:
+    """Attach category, category_source and transaction_type to a chunk of records."""
+    descriptions = [r["description"] for r in chunk]
+    categories = categorize_batch(db, user_id, descriptions)
+    type_overrides = get_type_overrides_batch(db, user_id, descriptions)
+
+    detected: dict[tuple[str, bool], str] = {}
+    rows = []
+    for record, (category, category_source, _), override in zip(chunk, categories, type_overrides):
+        amount: Decimal = record["amount"]
+        txn_type = override
+        if txn_type is None:
+            key = (record["description"], amount > 0)
+            txn_type = detected.get(key)
+            if txn_type is None:
+                txn_type = detect_transaction_type(record["description"], float(amount), source)
+                detected[key] = txn_type
+        rows.append((
+            user_id, record["date"], record["description"], amount,
+            category, category_source, source, txn_type,
+        ))
+    return rows
+
+
+def _create_staging(db: Session, is_postgres: bool) -> None:
+    if is_postgres:
+        db.execute(text(
+            f"CREATE TEMP TABLE {_STAGING_TABLE} ("
+            " user_id integer, date date, description text, amount numeric(10, 2),"
+            " category text, category_source text, source text, transaction_type text"
+            ") ON COMMIT DROP"
+        ))
+    else:
+        db.execute(text(f"DROP TABLE IF EXISTS temp.{_STAGING_TABLE}"))
+        db.execute(text(
+            f"CREATE TEMP TABLE {_STAGING_TABLE} ("
+            " user_id integer, date date, description text, amount numeric(10, 2),"
+            " category text, category_source text, source text, transaction_type text)"
+        ))
+
+
+def _copy_chunk(db: Session, rows: list[tuple]) -> None:
+    """Stream a chunk into the staging table with PostgreSQL COPY."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {_STAGING_TABLE} ({', '.join(_STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+def _insert_chunk(db: Session, rows: list[tuple]) -> None:
+    """Portable fallback for non-PostgreSQL databases (tests / local SQLite)."""
+    placeholders = ", ".join(f":{c}" for c in _STAGING_COLUMNS)
+    db.execute(
+        text(f"INSERT INTO {_STAGING_TABLE} ({', '.join(_STAGING_COLUMNS)}) VALUES ({placeholders})"),
+        [
+            {**dict(zip(_STAGING_COLUMNS, row)), "date": row[1].isoformat(), "amount": str(row[3])}
+            for row in rows
+        ],
+    )
+
+
+def _merge_staging(db: Session) -> int:
+    """
+    Insert staged rows into transactions, skipping uq_user_transaction
+    duplicates.  The conflict target is spelled out so both PostgreSQL and
+    SQLite (3.24+) skip only those — a row breaking any other constraint
+    still fails the import.  SQLite needs the WHERE to parse ON CONFLICT
+    after a SELECT.
+    """
+    columns = ", ".join(_STAGING_COLUMNS)
+    sql = (
+        f"INSERT INTO transactions ({columns}) "
+        f"SELECT {columns} FROM {_STAGING_TABLE} WHERE true "
+        "ON CONFLICT (user_id, date, description, amount) DO NOTHING"
+    )
+    return db.execute(text(sql)).rowcount or 0
+
+
+def import_records(
+    db: Session,
+    user_id: int,
+    records: Iterable[dict | None],
+    source: str,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> ImportResult:
+    """
+    Categorize, stage and merge `records` for `user_id` in one DB transaction.
+    The caller is responsible for committing.
+    """
+    result = ImportResult()
+    is_postgres = db.get_bind().dialect.name == "postgresql"
+
+    _create_staging(db, is_postgres)
+    load_chunk = _copy_chunk if is_postgres else _insert_chunk
+    for chunk in _chunks(records, chunk_size, result):
+        load_chunk(db, _enrich(db, user_id, chunk, source))
+
+    result.transactions_created = _merge_staging(db)
+    if not is_postgres:
+        db.execute(text(f"DROP TABLE temp.{_STAGING_TABLE}"))
+    return result
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Numeric, Date, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Numeric, Date, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from app.database.base import Base
 
@@ -25,4 +25,13 @@ class Transaction(Base):
 
     __table_args__ = (
         UniqueConstraint("user_id", "date", "description", "amount", name="uq_user_transaction"),
-    )
\ No newline at end of file
+        # Trigram index backing /transactions/search (requires the pg_trgm extension)
+        Index(
+            "ix_transactions_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ),
+        # Payment-this-month lookups for due-date status
+        Index("ix_transactions_debt_payment_link_date", "debt_payment_link", "date"),
+    )
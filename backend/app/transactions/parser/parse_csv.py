@@ -0,0 +1,131 @@
+"""
+Streaming parser for bank CSV exports.
+
+Two layouts are recognised:
+
+  - With a header row: columns are located by name (date / description /
+    amount, or separate debit / credit columns).
+  - Without a header (TD's CSV download): date, description, debit, credit
+    [, balance] by position.
+
+Records are yielded one at a time as dicts with the same keys the PDF parsers
+produce: date, description, amount (negative = money out).  Rows that cannot
+be parsed are yielded as None so the caller can count them.
+"""
+import csv
+import re
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Iterable, Iterator
+
+_DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%m/%d/%Y",
+    "%d/%m/%Y",
+    "%Y/%m/%d",
+    "%d-%b-%Y",
+    "%b %d, %Y",
+    "%Y%m%d",
+)
+
+_DATE_HEADERS        = {"date", "transaction date", "posted date", "posting date", "trans date"}
+_DESCRIPTION_HEADERS = {"description", "payee", "name", "merchant", "details", "memo", "transaction"}
+_AMOUNT_HEADERS      = {"amount", "transaction amount", "cad$", "amount (cad)"}
+_DEBIT_HEADERS       = {"debit", "withdrawal", "withdrawals", "money out"}
+_CREDIT_HEADERS      = {"credit", "deposit", "deposits", "money in"}
+
+_AMOUNT_STRIP_RE = re.compile(r"[\s$,]")
+
+
+def parse_csv_date(value: str) -> date:
+    value = value.strip()
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognised date: {value!r}")
+
+
+def parse_csv_amount(value: str) -> Decimal:
+    """Parse '1,234.56', '$-12.00', '(45.00)' → Decimal; blank → 0."""
+    value = _AMOUNT_STRIP_RE.sub("", value or "")
+    if not value:
+        return Decimal("0")
+    negative = value.startswith("(") and value.endswith(")")
+    if negative:
+        value = value[1:-1]
+    try:
+        amount = Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f"Unrecognised amount: {value!r}")
+    return -amount if negative else amount
+
+
+def _find(header: list[str], names: set[str]) -> int | None:
+    for idx, col in enumerate(header):
+        if col in names:
+            return idx
+    return None
+
+
+def _looks_like_date(value: str) -> bool:
+    try:
+        parse_csv_date(value)
+        return True
+    except ValueError:
+        return False
+
+
+def iter_csv_records(lines: Iterable[str]) -> Iterator[dict | None]:
+    """Yield one transaction dict per data row (None for unparseable rows)."""
+    reader = csv.reader(lines)
+    first = next(reader, None)
+    if first is None:
+        return
+
+    header = [col.strip().lower() for col in first]
+    if first and _looks_like_date(first[0]):
+        # Headerless export: date, description, debit, credit[, balance]
+        date_idx, desc_idx, amount_idx, debit_idx, credit_idx = 0, 1, None, 2, 3
+        pending = [first]
+    else:
+        date_idx   = _find(header, _DATE_HEADERS)
+        desc_idx   = _find(header, _DESCRIPTION_HEADERS)
+        amount_idx = _find(header, _AMOUNT_HEADERS)
+        debit_idx  = _find(header, _DEBIT_HEADERS)
+        credit_idx = _find(header, _CREDIT_HEADERS)
+        if date_idx is None or desc_idx is None or (amount_idx is None and debit_idx is None):
+            raise ValueError(
+                "CSV header must include date, description and amount (or debit/credit) columns"
+            )
+        pending = []
+
+    def _rows() -> Iterator[list[str]]:
+        yield from pending
+        yield from reader
+
+    for row in _rows():
+        if not any(cell.strip() for cell in row):
+            continue
+        try:
+            if amount_idx is not None:
+                amount = parse_csv_amount(row[amount_idx])
+            else:
+                debit = parse_csv_amount(row[debit_idx]) if debit_idx < len(row) else Decimal("0")
+                credit = (
+                    parse_csv_amount(row[credit_idx])
+                    if credit_idx is not None and credit_idx < len(row)
+                    else Decimal("0")
+                )
+                amount = credit - abs(debit)
+            description = row[desc_idx].strip()
+            if not description:
+                raise ValueError("empty description")
+            yield {
+                "date":        parse_csv_date(row[date_idx]),
+                "description": description,
+                "amount":      amount,
+            }
+        except (ValueError, IndexError):
+            yield None
@@ -0,0 +1,56 @@
+"""
+Streaming parser for OFX / QFX statement downloads.
+
+Handles both OFX 1.x (SGML — leaf elements are never closed) and OFX 2.x
+(XML).  Quicken's QFX is OFX with a few extra Intuit tags, so it goes
+through the same path.
+
+Each <STMTTRN> block becomes a dict with date, description, amount.
+Amounts keep OFX's sign convention, which matches ours: negative = money out.
+"""
+import re
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from typing import Iterator
+
+_STMTTRN_RE = re.compile(r"<STMTTRN>(.*?)</STMTTRN>", re.IGNORECASE | re.DOTALL)
+_FIELD_RE   = re.compile(r"<([A-Z0-9.]+)>([^<\r\n]*)", re.IGNORECASE)
+
+_ENTITIES = {"&amp;": "&", "&lt;": "<", "&gt;": ">", "&quot;": '"', "&apos;": "'"}
+_ENTITY_RE = re.compile("|".join(map(re.escape, _ENTITIES)))
+
+
+def detect_ofx_source(text: str) -> str | None:
+    """Return 'credit_card' for CCSTMTRS documents, 'chequing' for bank STMTRS, else None."""
+    upper = text.upper()
+    if "<CCSTMTRS>" in upper:
+        return "credit_card"
+    if "<STMTRS>" in upper:
+        return "chequing"
+    return None
+
+
+def _parse_ofx_date(value: str) -> date:
+    # YYYYMMDD[HHMMSS[.XXX]][[gmt offset:tz name]] — only the date part matters
+    digits = value.strip()[:8]
+    return date(int(digits[:4]), int(digits[4:6]), int(digits[6:8]))
+
+
+def iter_ofx_records(text: str) -> Iterator[dict | None]:
+    """Yield one transaction dict per <STMTTRN> (None for unparseable blocks)."""
+    for match in _STMTTRN_RE.finditer(text):
+        fields = {
+            tag.upper(): _ENTITY_RE.sub(lambda m: _ENTITIES[m.group(0)], value.strip())
+            for tag, value in _FIELD_RE.findall(match.group(1))
+        }
+        description = fields.get("NAME") or fields.get("MEMO") or ""
+        try:
+            if not description:
+                raise ValueError("empty description")
+            yield {
+                "date":        _parse_ofx_date(fields["DTPOSTED"]),
+                "description": description,
+                "amount":      Decimal(fields["TRNAMT"].replace(",", "")),
+            }
+        except (KeyError, ValueError, InvalidOperation):
+            yield None
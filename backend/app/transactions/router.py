@@ -1,12 +1,13 @@
 import os
-import re
 import uuid
 import hashlib
-from datetime import datetime, timedelta
-from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException
-from sqlalchemy import or_
+from datetime import date, datetime
+from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from app.core.auth import get_current_user
 from app.core.dependencies import get_db
+from app.core.responses import ORJSONResponse
 
 from app.transactions.parser.extract import extract_text_from_pdf
 from app.transactions.parser.detector import detect_bank_from_text, detect_year_from_text
@@ -25,96 +26,34 @@ from app.categorization.service import (
 )
 from app.transactions.service import (
     create_transaction,
-    get_transactions,
+    get_transaction_rows,
+    get_transaction_row,
     get_transaction_by_id,
     update_transaction,
     delete_transaction,
 )
-from app.transactions.models import Transaction
+from app.transactions.type_detection import detect_transaction_type
+from app.transactions.backfill import backfill_types as run_backfill
+from app.transactions.export import EXPORT_FORMATS, iter_export, parquet_available
+from app.transactions.importer import import_format_for, import_records, iter_records
+from app.transactions.search import search_transactions
 from app.transactions.schemas import (
+    TransactionResponse,
+    TransactionSearchResponse,
     TransactionUpdate,
     TransactionPreview,
     TransactionConfirmRequest,
 )
 from app.bank_statements.models import BankStatement
+from app.chatbot.retrieval import add_transactions
 from app.bank_statements.service import get_statement_by_hash, create_statement_record
+from app.users.service import bump_data_version, get_data_version
 
 router = APIRouter(prefix="/transactions", tags=["transactions"])
 
 UPLOAD_DIR = "uploaded_statements"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
-# ── Transaction-type detection regexes ───────────────────────────────────────
-
-# Chequing: debt/loan payments — checked before _CC_PAYMENT_RE
-_DEBT_PAYMENT_RE = re.compile(
-    r"VISA[\s\-]*PAYMENT"
-    r"|MASTERCARD[\s\-]*PAYMENT"
-    r"|LOAN[\s\-]*PAYMENT"
-    r"|MORTGAGE[\s\-]*PAYMENT"
-    r"|LINE[\s\-]*OF[\s\-]*CREDIT[\s\-]*PAYMENT"
-    r"|STUDENT[\s\-]*LOAN[\s\-]*PAYMENT",
-    re.IGNORECASE,
-)
-
-# Chequing: remaining credit-card bill payments not caught by _DEBT_PAYMENT_RE
-_CC_PAYMENT_RE = re.compile(
-    r"CC[\s\-]*PAYMENT"
-    r"|CREDIT[\s\-]*CARD[\s\-]*PAYMENT"
-    r"|PAYMENT[\s\-]*VISA"
-    r"|PAYMENT[\s\-]*-[\s\-]*VISA",
-    re.IGNORECASE,
-)
-
-# Credit card: interest / fee charges
-_FEE_RE = re.compile(
-    r"INTEREST|ANNUAL[\s]*FEE|LATE[\s]*FEE|OVERLIMIT[\s]*FEE"
-    r"|CASH[\s]*ADVANCE[\s]*FEE|BALANCE[\s]*TRANSFER[\s]*FEE"
-    r"|NSF[\s]*FEE|SERVICE[\s]*FEE",
-    re.IGNORECASE,
-)
-
-# Credit card: refunds / credits
-_REFUND_RE = re.compile(r"REFUND|CREDIT|RETURN", re.IGNORECASE)
-
-
-def detect_transaction_type(description: str, amount: float, source: str | None) -> str:
-    """
-    Infer a transaction_type string from description, amount, and account source.
-
-    Chequing:
-      positive amount                          → 'income'
-      negative + debt/loan payment description → 'debt_payment'
-      negative + CC-payment description        → 'cc_payment'
-      negative + other                         → 'purchase'
-
-    Credit card:
-      positive amount (money back to card)     → 'cc_payment'
-      negative + fee/interest description      → 'fee'
-      negative + refund/credit description     → 'refund'
-      negative + other                         → 'purchase'
-    """
-    amt = float(amount)
-
-    if source == "credit_card":
-        if amt > 0:
-            return "cc_payment"
-        if _FEE_RE.search(description):
-            return "fee"
-        if _REFUND_RE.search(description):
-            return "refund"
-        return "purchase"
-
-    # chequing (or unknown source — treat as chequing)
-    if amt > 0:
-        return "income"
-    if _DEBT_PAYMENT_RE.search(description):
-        return "debt_payment"
-    if _CC_PAYMENT_RE.search(description):
-        return "cc_payment"
-    return "purchase"
-
-
 @router.post("/upload", response_model=list[TransactionPreview])
 async def upload_statement(
     file: UploadFile = File(...),
@@ -287,6 +226,76 @@ async def upload_statement(
     return preview
 
 
+@router.post("/import")
+async def import_statement_export(
+    file: UploadFile = File(...),
+    statement_type: str = Form("chequing"),
+    current_user=Depends(get_current_user),
+    db=Depends(get_db),
+):
+    """
+    Bulk-import a CSV, OFX or QFX bank export straight into transactions.
+
+    Unlike /upload there is no preview step: every record is categorized,
+    typed and merged in one pass, and rows that already exist
+    (uq_user_transaction) are skipped.  `statement_type` is used for CSV
+    files; OFX/QFX files declare their own account type.
+    """
+    if not current_user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+
+    if statement_type not in ("chequing", "credit_card"):
+        raise HTTPException(
+            status_code=400,
+            detail="statement_type must be 'chequing' or 'credit_card'",
+        )
+
+    fmt = import_format_for(file.filename or "")
+    if fmt is None:
+        raise HTTPException(status_code=400, detail="Only CSV, OFX and QFX files are supported")
+
+    # Hash the upload in chunks so large exports are never held in memory twice
+    digest = hashlib.sha256()
+    while chunk := await file.read(1 << 20):
+        digest.update(chunk)
+    file_hash = digest.hexdigest()
+    await file.seek(0)
+
+    if get_statement_by_hash(db, user_id=current_user.id, file_hash=file_hash):
+        raise HTTPException(
+            status_code=409,
+            detail="This file has already been imported.",
+        )
+
+    try:
+        records, source = iter_records(fmt, file.file, default_source=statement_type)
+        # Parsing + loading is CPU/DB bound — keep it off the event loop
+        result = await run_in_threadpool(import_records, db, current_user.id, records, source)
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Record the file (commits the merged transactions in the same transaction)
+    if result.transactions_created:
+        bump_data_version(db, current_user.id)
+    create_statement_record(
+        db=db,
+        user_id=current_user.id,
+        file_hash=file_hash,
+        filename=file.filename,
+        statement_type=source,
+    )
+
+    return {
+        "message": "Import complete",
+        "format": fmt,
+        "rows_read": result.rows_read,
+        "rows_rejected": result.rows_rejected,
+        "transactions_created": result.transactions_created,
+        "transactions_skipped": result.transactions_skipped,
+    }
+
+
 @router.post("/confirm")
 def confirm_transactions(
     payload: TransactionConfirmRequest,
@@ -298,6 +307,9 @@ def confirm_transactions(
 
     inserted = 0
     skipped = 0
+    saved_rows = []   # (id, date, description, amount, category) for the chatbot index
+    base_version = get_data_version(db, current_user.id)
+    own_bumps = 0     # commits below that bump data_version
 
     for item in payload.transactions:
         # Persist manual category changes as overrides so future transactions
@@ -339,11 +351,14 @@ def confirm_transactions(
             skipped += 1
         else:
             inserted += 1
+            own_bumps += 1
+            saved_rows.append((saved.id, saved.date, saved.description, saved.amount, saved.category))
 
             # Subtract from the linked debt's balance (chequing outflow is negative,
             # so we use abs() as the payment amount applied to the debt).
             if is_debt_payment:
                 from app.debts.models import Debt  # local import avoids circular
+                from app.debts.service import invalidate_payoff_cache, refresh_due_status
                 debt = (
                     db.query(Debt)
                     .filter_by(id=item.debt_id, user_id=current_user.id)
@@ -354,7 +369,17 @@ def confirm_transactions(
                     pay_amount = abs(_D(str(item.amount)))
                     debt.balance = max(_D(str(debt.balance)) - pay_amount, _D("0"))
                     debt.last_manual_update_at = datetime.utcnow()
+                    bump_data_version(db, current_user.id)
                     db.commit()
+                    own_bumps += 1
+                    invalidate_payoff_cache(current_user.id)
+                    refresh_due_status(db, current_user.id)
+
+    # Keep the chatbot's transaction index warm instead of rebuilding it
+    if saved_rows:
+        add_transactions(
+            current_user.id, saved_rows, base_version, get_data_version(db, current_user.id), own_bumps,
+        )
 
     # ── Auto-update CC debt balance from statement (silent) ───────────────────
     # Check if any of the confirmed transactions were credit_card source.
@@ -387,66 +412,29 @@ def backfill_types(
     db=Depends(get_db),
 ):
     """
-    One-time endpoint: fills in null source / transaction_type on existing transactions.
+    Fills in null source / transaction_type on the current user's transactions.
 
     Source inference:
       - If a transaction's date falls within 90 days before a CC bank_statement's
         uploaded_at, it is tagged 'credit_card'; otherwise 'chequing'.
       - If multiple statement types cover the same date, CC takes precedence.
 
-    transaction_type is then derived via detect_transaction_type().
+    transaction_type is then derived via detect_transaction_type(), and the
+    user's stored type overrides win over it, as they do on upload.
+    See app/transactions/backfill.py for the batched implementation and the
+    all-users CLI.
+
+    Returns {"updated": n}, the number of rows whose source or
+    transaction_type changed.  Every row visited here has a null to fill, so
+    this is still the number of rows that had one; only --reclassify runs
+    of the CLI visit rows that may come out unchanged, and those are not
+    counted.
     """
     if not current_user:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
-    # Fetch CC statement upload windows for this user
-    cc_statements = (
-        db.query(BankStatement)
-        .filter_by(user_id=current_user.id, statement_type="credit_card")
-        .all()
-    )
-    cc_windows: list[tuple] = [
-        (stmt.uploaded_at - timedelta(days=90), stmt.uploaded_at)
-        for stmt in cc_statements
-    ]
-
-    # Fetch all transactions that need fixing
-    txns = (
-        db.query(Transaction)
-        .filter(
-            Transaction.user_id == current_user.id,
-            or_(Transaction.source == None, Transaction.transaction_type == None),  # noqa: E711
-        )
-        .all()
-    )
-
-    updated = 0
-    for txn in txns:
-        txn_date = txn.date  # datetime.date
-
-        # Infer source if missing
-        if txn.source is None:
-            inferred_source = "chequing"
-            for window_start, window_end in cc_windows:
-                ws_date = window_start.date() if hasattr(window_start, "date") else window_start
-                we_date = window_end.date() if hasattr(window_end, "date") else window_end
-                if ws_date <= txn_date <= we_date:
-                    inferred_source = "credit_card"
-                    break
-            txn.source = inferred_source
-
-        # Infer transaction_type if missing
-        if txn.transaction_type is None:
-            txn.transaction_type = detect_transaction_type(
-                description=txn.description,
-                amount=float(txn.amount),
-                source=txn.source,
-            )
-
-        updated += 1
-
-    db.commit()
-    return {"updated": updated}
+    result = run_backfill(db, user_id=current_user.id)
+    return {"updated": result["updated"]}
 
 
 @router.get("/cc-banks")
@@ -470,7 +458,66 @@ def list_cc_banks(
     return [row[0] for row in rows]
 
 
-@router.get("")
+@router.get("/export")
+def export_transactions(
+    fmt: str = Query("csv", alias="format", pattern="^(csv|parquet|ndjson)$"),
+    start_date: date | None = None,
+    end_date: date | None = None,
+    category: str | None = None,
+    current_user=Depends(get_current_user),
+    db=Depends(get_db),
+):
+    """
+    Stream the user's transaction history as CSV, NDJSON or Parquet.
+
+    Rows are read from a server-side cursor and written out batch by batch,
+    so memory stays flat no matter how many years of history are exported.
+    """
+    if not current_user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    if fmt == "parquet" and not parquet_available():
+        raise HTTPException(status_code=503, detail="pyarrow package not installed.")
+
+    return StreamingResponse(
+        iter_export(
+            db,
+            user_id=current_user.id,
+            fmt=fmt,
+            start_date=start_date,
+            end_date=end_date,
+            category=category,
+        ),
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="transactions.{fmt}"'},
+    )
+
+
+@router.get("/search", response_model=TransactionSearchResponse, response_class=ORJSONResponse)
+def search(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = None,
+    current_user=Depends(get_current_user),
+    db=Depends(get_db),
+):
+    """
+    Case-insensitive substring + fuzzy (trigram) search on description,
+    ranked best-first with keyset pagination via `next_cursor`.
+    """
+    if not current_user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    q = q.strip()
+    if not q:
+        # A blank pattern would match every row
+        raise HTTPException(status_code=422, detail="q must not be blank")
+    try:
+        page = search_transactions(db, user_id=current_user.id, q=q, limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return ORJSONResponse(page)
+
+
+@router.get("", response_model=list[TransactionResponse], response_class=ORJSONResponse)
 def list_transactions(
     month: int | None = None,
     year: int | None = None,
@@ -479,10 +526,11 @@ def list_transactions(
 ):
     if not current_user:
         raise HTTPException(status_code=401, detail="Not authenticated")
-    return get_transactions(db, user_id=current_user.id, month=month, year=year)
+    rows = get_transaction_rows(db, user_id=current_user.id, month=month, year=year)
+    return ORJSONResponse(rows)
 
 
-@router.get("/{txn_id}")
+@router.get("/{txn_id}", response_model=TransactionResponse, response_class=ORJSONResponse)
 def get_transaction(
     txn_id: int,
     current_user=Depends(get_current_user),
@@ -490,12 +538,12 @@ def get_transaction(
 ):
     if not current_user:
         raise HTTPException(status_code=401, detail="Not authenticated")
-    txn = get_transaction_by_id(db, txn_id)
+    txn = get_transaction_row(db, txn_id)
     if txn is None:
         raise HTTPException(status_code=404, detail="Transaction not found")
-    if txn.user_id != current_user.id:
+    if txn["user_id"] != current_user.id:
         raise HTTPException(status_code=403, detail="Access denied")
-    return txn
+    return ORJSONResponse(txn)
 
 
 @router.put("/{txn_id}")
@@ -512,9 +560,13 @@ def edit_transaction(
         raise HTTPException(status_code=404, detail="Transaction not found")
     if txn.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Access denied")
-    return update_transaction(
+    updated = update_transaction(
         db, txn, date=payload.date, amount=payload.amount, description=payload.description, category=payload.category
     )
+    if updated.debt_payment_link is not None and payload.date is not None:
+        from app.debts.service import refresh_due_status  # local import avoids circular
+        refresh_due_status(db, current_user.id)
+    return updated
 
 
 @router.delete("/{txn_id}", status_code=204)
@@ -530,4 +582,8 @@ def remove_transaction(
         raise HTTPException(status_code=404, detail="Transaction not found")
     if txn.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Access denied")
+    paid_debt = txn.debt_payment_link
     delete_transaction(db, txn)
+    if paid_debt is not None:
+        from app.debts.service import refresh_due_status  # local import avoids circular
+        refresh_due_status(db, current_user.id)
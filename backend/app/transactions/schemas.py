@@ -11,6 +11,29 @@ class TransactionUpdate(BaseModel):
     category: str | None = None
 
 
+class TransactionResponse(BaseModel):
+    """Shape of a stored transaction as returned by the list / detail endpoints."""
+    id: int
+    user_id: int
+    date: DateType
+    description: str
+    amount: Decimal
+    category: str
+    category_source: str
+    source: Optional[str] = None
+    transaction_type: Optional[str] = None
+    debt_payment_link: Optional[int] = None
+
+
+class TransactionSearchHit(TransactionResponse):
+    rank: int  # higher = better match; substring matches rank above fuzzy-only ones
+
+
+class TransactionSearchResponse(BaseModel):
+    results: list[TransactionSearchHit]
+    next_cursor: Optional[str] = None  # pass back as ?cursor= for the next page
+
+
 class TransactionPreview(BaseModel):
     id: Optional[int] = None
     date: DateType
@@ -0,0 +1,96 @@
+"""
+Server-side description search for transactions.
+
+PostgreSQL (pg_trgm):
+  A row matches if its description contains the query (ILIKE '%q%') or some
+  run of words in it is trigram-similar to the query (`description %> q`,
+  i.e. `q <% description`, at FUZZY_THRESHOLD).  Both predicates are served
+  by the ix_transactions_description_trgm GIN index.  Rows are ranked by
+
+      rank = round(word_similarity(q, description) * 1000) + (1000 if substring match)
+
+  so literal matches always come before fuzzy-only ones.  Word similarity,
+  not similarity(): bank descriptions carry store numbers and cities, so a
+  misspelt "cotsco" scores ~0.1 against all of "COSTCO WHOLESALE #512
+  TORONTO" but ~0.43 against its best-matching word.
+
+Other databases (SQLite in tests / local dev):
+  Case-insensitive substring match only, every hit ranked 1000.
+
+Results are ordered by (rank DESC, id DESC) and paginated with a keyset
+cursor "<rank>:<id>" — no OFFSET scans on deep pages.
+"""
+from sqlalchemy import Integer, and_, case, cast, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.transactions.models import Transaction
+from app.transactions.service import RESPONSE_COLUMNS
+
+_SUBSTRING_BONUS = 1000
+FUZZY_THRESHOLD = 0.4   # pg_trgm.word_similarity_threshold; the default 0.6 misses transposed letters
+
+
+def _escape_like(q: str) -> str:
+    return q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def encode_cursor(rank: int, txn_id: int) -> str:
+    return f"{rank}:{txn_id}"
+
+
+def decode_cursor(cursor: str) -> tuple[int, int]:
+    """Parse a '<rank>:<id>' cursor; raises ValueError if malformed."""
+    rank, _, txn_id = cursor.partition(":")
+    return int(rank), int(txn_id)
+
+
+def _rank_and_match(q: str, is_postgres: bool):
+    """(rank expression, WHERE predicate) for query `q`."""
+    substring = Transaction.description.ilike(f"%{_escape_like(q)}%", escape="\\")
+    if not is_postgres:
+        return case((substring, _SUBSTRING_BONUS), else_=0), substring
+
+    rank = (
+        cast(func.round(func.word_similarity(q, Transaction.description) * 1000), Integer)
+        + case((substring, _SUBSTRING_BONUS), else_=0)
+    )
+    # Indexed column on the left so the GIN opclass applies; same as q <% description
+    return rank, or_(substring, Transaction.description.op("%>")(q))
+
+
+def search_transactions(
+    db: Session,
+    user_id: int,
+    q: str,
+    limit: int = 50,
+    cursor: str | None = None,
+) -> dict:
+    """
+    Return {"results": [...], "next_cursor": str | None} for the user's
+    transactions whose description matches `q`.
+    """
+    q = q.strip()
+    is_postgres = db.get_bind().dialect.name == "postgresql"
+    if is_postgres:
+        # `%>` reads its cut-off from this setting; is_local scopes it to the transaction
+        db.execute(select(func.set_config("pg_trgm.word_similarity_threshold", str(FUZZY_THRESHOLD), True)))
+    rank, match = _rank_and_match(q, is_postgres)
+
+    query = (
+        db.query(*RESPONSE_COLUMNS, rank.label("rank"))
+        .filter(Transaction.user_id == user_id, match)
+    )
+    if cursor:
+        after_rank, after_id = decode_cursor(cursor)
+        query = query.filter(
+            or_(rank < after_rank, and_(rank == after_rank, Transaction.id < after_id))
+        )
+
+    rows = query.order_by(rank.desc(), Transaction.id.desc()).limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        "results": [row._asdict() for row in rows],
+        "next_cursor": encode_cursor(rows[-1].rank, rows[-1].id) if has_more else None,
+    }
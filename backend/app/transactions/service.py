@@ -1,4 +1,5 @@
 from app.transactions.models import Transaction
+from app.users.service import bump_data_version
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy import extract
@@ -15,6 +16,40 @@ def get_transactions(db: Session, user_id: int, month: int | None = None, year:
     return query.order_by(Transaction.date.desc()).all()
 
 
+# Columns returned by the list / detail endpoints.  Querying these directly
+# yields lightweight Row tuples instead of hydrating full Transaction objects
+# (identity map, relationship loaders) that are only going to be serialised.
+RESPONSE_COLUMNS = (
+    Transaction.id,
+    Transaction.user_id,
+    Transaction.date,
+    Transaction.description,
+    Transaction.amount,
+    Transaction.category,
+    Transaction.category_source,
+    Transaction.source,
+    Transaction.transaction_type,
+    Transaction.debt_payment_link,
+)
+
+
+def get_transaction_rows(db: Session, user_id: int, month: int | None = None, year: int | None = None) -> list[dict]:
+    """Column-projected variant of get_transactions() returning plain dicts."""
+    query = db.query(*RESPONSE_COLUMNS).filter(Transaction.user_id == user_id)
+    if month is not None:
+        query = query.filter(extract("month", Transaction.date) == month)
+    if year is not None:
+        query = query.filter(extract("year", Transaction.date) == year)
+    rows = query.order_by(Transaction.date.desc()).all()
+    return [row._asdict() for row in rows]
+
+
+def get_transaction_row(db: Session, txn_id: int) -> dict | None:
+    """Column-projected variant of get_transaction_by_id() returning a plain dict."""
+    row = db.query(*RESPONSE_COLUMNS).filter(Transaction.id == txn_id).first()
+    return row._asdict() if row else None
+
+
 def get_transaction_by_id(db: Session, txn_id: int) -> Transaction | None:
     return db.query(Transaction).filter(Transaction.id == txn_id).first()
 
@@ -35,12 +70,14 @@ def update_transaction(
         txn.description = description
     if category is not None:
         txn.category = category
+    bump_data_version(db, txn.user_id)
     db.commit()
     db.refresh(txn)
     return txn
 
 
 def delete_transaction(db: Session, txn: Transaction) -> None:
+    bump_data_version(db, txn.user_id)
     db.delete(txn)
     db.commit()
 
@@ -60,6 +97,7 @@ def create_transaction(db: Session, user_id: int, date: date, description: str,
 
     try:
         db.add(txn)
+        bump_data_version(db, user_id)
         db.commit()
         db.refresh(txn)
         return txn
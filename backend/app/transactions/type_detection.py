@@ -0,0 +1,75 @@
+"""
+Rule-based transaction_type detection shared by the upload flow and the
+backfill job.
+"""
+import re
+
+# ── Transaction-type detection regexes ───────────────────────────────────────
+
+# Chequing: debt/loan payments — checked before _CC_PAYMENT_RE
+_DEBT_PAYMENT_RE = re.compile(
+    r"VISA[\s\-]*PAYMENT"
+    r"|MASTERCARD[\s\-]*PAYMENT"
+    r"|LOAN[\s\-]*PAYMENT"
+    r"|MORTGAGE[\s\-]*PAYMENT"
+    r"|LINE[\s\-]*OF[\s\-]*CREDIT[\s\-]*PAYMENT"
+    r"|STUDENT[\s\-]*LOAN[\s\-]*PAYMENT",
+    re.IGNORECASE,
+)
+
+# Chequing: remaining credit-card bill payments not caught by _DEBT_PAYMENT_RE
+_CC_PAYMENT_RE = re.compile(
+    r"CC[\s\-]*PAYMENT"
+    r"|CREDIT[\s\-]*CARD[\s\-]*PAYMENT"
+    r"|PAYMENT[\s\-]*VISA"
+    r"|PAYMENT[\s\-]*-[\s\-]*VISA",
+    re.IGNORECASE,
+)
+
+# Credit card: interest / fee charges
+_FEE_RE = re.compile(
+    r"INTEREST|ANNUAL[\s]*FEE|LATE[\s]*FEE|OVERLIMIT[\s]*FEE"
+    r"|CASH[\s]*ADVANCE[\s]*FEE|BALANCE[\s]*TRANSFER[\s]*FEE"
+    r"|NSF[\s]*FEE|SERVICE[\s]*FEE",
+    re.IGNORECASE,
+)
+
+# Credit card: refunds / credits
+_REFUND_RE = re.compile(r"REFUND|CREDIT|RETURN", re.IGNORECASE)
+
+
+def detect_transaction_type(description: str, amount: float, source: str | None) -> str:
+    """
+    Infer a transaction_type string from description, amount, and account source.
+
+    Chequing:
+      positive amount                          → 'income'
+      negative + debt/loan payment description → 'debt_payment'
+      negative + CC-payment description        → 'cc_payment'
+      negative + other                         → 'purchase'
+
+    Credit card:
+      positive amount (money back to card)     → 'cc_payment'
+      negative + fee/interest description      → 'fee'
+      negative + refund/credit description     → 'refund'
+      negative + other                         → 'purchase'
+    """
+    amt = float(amount)
+
+    if source == "credit_card":
+        if amt > 0:
+            return "cc_payment"
+        if _FEE_RE.search(description):
+            return "fee"
+        if _REFUND_RE.search(description):
+            return "refund"
+        return "purchase"
+
+    # chequing (or unknown source — treat as chequing)
+    if amt > 0:
+        return "income"
+    if _DEBT_PAYMENT_RE.search(description):
+        return "debt_payment"
+    if _CC_PAYMENT_RE.search(description):
+        return "cc_payment"
+    return "purchase"
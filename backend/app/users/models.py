@@ -15,6 +15,9 @@ class User(Base):
     side_income       = Column(Numeric(10, 2), nullable=True)
     income_updated_at = Column(DateTime, nullable=True)
 
+    # Bumped on every write to the user's financial data (see bump_data_version)
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
+
     transactions       = relationship("Transaction", back_populates="user")
     bank_statements    = relationship("BankStatement", back_populates="user")
     category_overrides = relationship("CategoryOverride", back_populates="user")
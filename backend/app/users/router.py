@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from app.core.auth import get_current_user
 from app.core.dependencies import get_db
 from app.users.schemas import IncomeResponse, IncomeUpdate
+from app.users.service import bump_data_version, get_user_by_id
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -30,13 +31,15 @@ def update_income(
 ):
     if not current_user:
         raise HTTPException(status_code=401, detail="Not authenticated")
-    current_user.base_income = payload.base_income
-    current_user.side_income = payload.side_income
-    current_user.income_updated_at = datetime.utcnow()
+    user = get_user_by_id(db, current_user.id)   # current_user is a cached snapshot
+    user.base_income = payload.base_income
+    user.side_income = payload.side_income
+    user.income_updated_at = datetime.utcnow()
+    bump_data_version(db, user.id)
     db.commit()
-    db.refresh(current_user)
+    db.refresh(user)
     return IncomeResponse(
-        base_income=current_user.base_income,
-        side_income=current_user.side_income,
-        income_updated_at=current_user.income_updated_at,
+        base_income=user.base_income,
+        side_income=user.side_income,
+        income_updated_at=user.income_updated_at,
     )
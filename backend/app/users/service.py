@@ -1,6 +1,17 @@
+from collections.abc import Iterable
+
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 from app.users.models import User
 
+# Session.info key collecting users whose data_version the open transaction
+# bumps; one UPDATE covers them all just before it commits.
+PENDING_BUMPS = "pending_data_version_bumps"
+
+# Session.info key collecting users whose row changed in the open transaction;
+# app.core.auth drops their cached snapshots once it commits.
+CHANGED_USERS = "changed_user_ids"
+
 def get_user_by_email(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
 
@@ -17,3 +28,39 @@ def create_user(db: Session, email: str, full_name: str | None, picture_url: str
     db.commit()
     db.refresh(new_user)
     return new_user
+
+def bump_data_version(db: Session, user_ids: int | Iterable[int]) -> None:
+    """
+    Mark the users' financial data (transactions, budgets, debts, income) as
+    changed, invalidating anything cached under the old users.data_version.
+    Does not write or commit: the users are recorded on the session and
+    bumped by a single UPDATE when the caller's transaction commits, however
+    many writes it made, so the bump lands together with the writes it
+    describes.  The users' cached authentication snapshots are dropped then.
+    """
+    ids = [user_ids] if isinstance(user_ids, int) else list(user_ids)
+    if ids:
+        db.info.setdefault(PENDING_BUMPS, set()).update(ids)
+
+
+@event.listens_for(Session, "before_commit")
+def _apply_data_version_bumps(session) -> None:
+    ids = session.info.pop(PENDING_BUMPS, None)
+    if not ids:
+        return
+    (
+        session.query(User)
+        .filter(User.id.in_(ids))
+        .update({User.data_version: User.data_version + 1}, synchronize_session=False)
+    )
+    session.info.setdefault(CHANGED_USERS, set()).update(ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_data_version_bumps(session) -> None:
+    session.info.pop(PENDING_BUMPS, None)
+
+
+def get_data_version(db: Session, user_id: int) -> int:
+    """users.data_version read from the database, for callers holding a cached user snapshot."""
+    return db.query(User.data_version).filter(User.id == user_id).scalar()
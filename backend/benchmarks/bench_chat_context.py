@@ -0,0 +1,90 @@
+"""
+Chatbot context assembly benchmark: sequential sections on one session vs.
+concurrent sections on independent sessions.
+
+Usage (from backend/):
+    python benchmarks/bench_chat_context.py [--rows 20000] [--debts 8] [--latency-ms 2]
+                                            [--database-url URL]
+
+Parallel assembly needs a pooled engine, so by default the benchmark seeds a
+temporary SQLite file rather than the in-memory database the other scripts
+use.  SQLite answers from the local page cache in microseconds, which hides
+the round trips parallelism saves against a networked PostgreSQL server;
+--latency-ms adds that much sleep before every statement to stand in for
+one (0 disables it).  Pass --database-url to measure a real server instead.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from common import make_session, seed_debts, seed_transactions, seed_user, timeit
+
+from sqlalchemy import event
+
+from app.budgets.models import Budget
+from app.chatbot.service import CONTEXT_WORKERS, get_financial_context
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--debts", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    tmpdir = None
+    url = args.database_url
+    if url is None:
+        tmpdir = tempfile.TemporaryDirectory()
+        url = f"sqlite:///{os.path.join(tmpdir.name, 'bench.db')}"
+
+    db = make_session(url)
+    user = seed_user(db)
+    seed_transactions(db, user.id, args.rows)
+    seed_debts(db, user.id, args.debts)
+    month = get_financial_context(db, user.id, parallel=False)["current_month"]
+    for category in ("Groceries", "Food & Dining", "Shopping", "Entertainment"):
+        db.add(Budget(user_id=user.id, category=category, monthly_limit=400, month=month))
+    db.commit()
+
+    engine = db.get_bind()
+    statements = 0
+
+    def round_trip(*_):
+        nonlocal statements
+        statements += 1
+        if args.latency_ms:
+            time.sleep(args.latency_ms / 1000)
+
+    event.listen(engine, "before_cursor_execute", round_trip)
+
+    def sequential():
+        db.expire_all()
+        return get_financial_context(db, user.id, parallel=False)
+
+    def parallel():
+        db.expire_all()
+        return get_financial_context(db, user.id, parallel=True)
+
+    assert sequential() == parallel()
+    statements = 0
+    sequential()
+    per_request = statements
+
+    before = timeit(sequential)
+    after = timeit(parallel)
+    print(f"get_financial_context ({args.rows} transactions, {args.debts} debts, "
+          f"{per_request} statements, {args.latency_ms:g} ms simulated latency)")
+    print(f"  sequential, one session:    {before:8.1f} ms")
+    print(f"  parallel, {CONTEXT_WORKERS} workers:        {after:8.1f} ms   ({before / after:.1f}x)")
+
+    db.close()
+    engine.dispose()
+    if tmpdir is not None:
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Monte Carlo payoff benchmark.
+
+Usage (from backend/):
+    python benchmarks/bench_monte_carlo.py [--paths 10000] [--debts 5] [--months 360]
+
+Times run_monte_carlo with every debt on a variable rate.
+"""
+import argparse
+
+import numpy as np
+
+from common import make_session, seed_debts, seed_user, timeit
+
+from app.debts import engine, montecarlo
+from app.debts.service import get_debts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--paths", type=int, default=10_000)
+    parser.add_argument("--debts", type=int, default=5)
+    parser.add_argument("--months", type=int, default=360)
+    args = parser.parse_args()
+
+    db = make_session()
+    user_id = seed_user(db).id
+    seed_debts(db, user_id, args.debts)
+    pf = engine.Portfolio.from_debts(get_debts(db, user_id))
+    variable = np.ones(len(pf), dtype=bool)
+
+    def run():
+        return montecarlo.run_monte_carlo(
+            pf, "avalanche", 20_000, variable,
+            paths=args.paths, horizon=args.months, drift=0.1, volatility=1.0, seed=1,
+        )
+
+    print(f"{args.paths} paths × {args.debts} debts × {args.months} months")
+    print(f"  run_monte_carlo:         {timeit(run, repeat=3):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Payoff engine benchmark: Decimal reference loop vs. vectorized integer cents.
+
+Usage (from backend/):
+    python benchmarks/bench_payoff.py [--debts 10]
+
+Both engines build the full PayoffResponse (monthly balances included), so
+this is the cost of GET /debts/payoff before serialization.  For a single
+plan the two are close: a month of a handful of debts is a few dozen tiny
+NumPy calls, so per-call overhead rather than arithmetic sets the pace, and
+the response build (timed separately) costs about as much again.  The second
+section times what the array engine is for: many extra-payment levels
+evaluated in one batched run.  The last section
+compares response size and build + serialize time of the full and columnar
+(format=columnar, resolution=…) payoff shapes, and the last the
+strategy=optimal policy search.
+"""
+import argparse
+from decimal import Decimal
+
+from common import make_session, seed_debts, seed_user, timeit
+
+import numpy as np
+
+from app.core.responses import ORJSONResponse
+from app.debts import engine, optimizer
+from app.debts.service import _simulate_payoff, get_debts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--debts", type=int, default=10)
+    args = parser.parse_args()
+
+    db = make_session()
+    user_id = seed_user(db).id
+    seed_debts(db, user_id, args.debts)
+    debts = get_debts(db, user_id)
+
+    for strategy in ("avalanche", "snowball"):
+        plan = engine.simulate_payoff(debts, strategy, Decimal("0"))
+        before = timeit(lambda: _simulate_payoff(debts, strategy, Decimal("0")))
+        after = timeit(lambda: engine.simulate_payoff(debts, strategy, Decimal("0")))
+        print(f"{strategy} ({args.debts} debts, {len(plan.monthly_projection)} months)")
+        print(f"  Decimal engine:          {before:8.1f} ms")
+        run = engine.simulate(engine.Portfolio.from_debts(debts), strategy, np.array([0]))
+        build = timeit(lambda: run.to_response(Decimal("0")))
+        print(f"  vectorized cents:        {after:8.1f} ms   ({before / after:.1f}x)")
+        print(f"    of which response:     {build:8.1f} ms")
+
+    pf = engine.Portfolio.from_debts(debts)
+    levels = list(range(0, 100_001, 2_000))   # $0 … $1000 extra in $20 steps
+    before = timeit(lambda: [_simulate_payoff(debts, "avalanche", Decimal(c) / 100) for c in levels], repeat=1)
+    after = timeit(lambda: engine.simulate(pf, "avalanche", np.array(levels), record_history=False))
+    print(f"\navalanche, {len(levels)} extra-payment levels")
+    print(f"  Decimal engine × {len(levels)}:     {before:8.1f} ms")
+    print(f"  one batched run:         {after:8.1f} ms   ({before / after:.1f}x)")
+
+    print(f"\nGET /debts/payoff response shapes (avalanche, {args.debts} debts)")
+    for fmt, resolution in (("full", "month"), ("columnar", "month"), ("columnar", "quarter"), ("columnar", "year")):
+        columnar = fmt == "columnar"
+        build = lambda: engine.simulate_payoff(debts, "avalanche", Decimal("0"), resolution=resolution, columnar=columnar)
+        body = ORJSONResponse(build()).body
+        ms = timeit(lambda: ORJSONResponse(build()).body)
+        print(f"  {fmt:>8} / {resolution:<7}  {len(body) / 1024:8.1f} KiB  {ms:8.1f} ms")
+
+    avalanche = engine.simulate(pf, "avalanche", np.array([50_000]), record_history=False)
+    print(f"\nstrategy=optimal search ({args.debts} debts, $500 extra)")
+    for objective in optimizer.OBJECTIVES:
+        result = optimizer.optimize(pf, 50_000, objective)
+        ms = timeit(lambda: optimizer.optimize(pf, 50_000, objective), repeat=3)
+        saved = int(avalanche.interest.sum()) - result.interest
+        print(f"  {objective:>8}: {ms:8.1f} ms  {result.evaluated:5d} policies  "
+              f"${saved / 100:,.2f} interest saved vs avalanche")
+
+
+if __name__ == "__main__":
+    main()
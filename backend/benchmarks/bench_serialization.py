@@ -0,0 +1,80 @@
+"""
+Serialization benchmark: ORM + jsonable_encoder vs. column projection + orjson.
+
+Usage (from backend/):
+    python benchmarks/bench_serialization.py [--rows 20000] [--debts 10]
+
+"before" reproduces what FastAPI did for these endpoints: hydrate ORM
+objects (or validate the response_model) and walk the result through
+jsonable_encoder / json.dumps.  "after" is the current path: projected Row
+tuples or the pydantic model handed straight to ORJSONResponse.
+"""
+import argparse
+import json
+from decimal import Decimal
+
+from common import make_session, seed_debts, seed_transactions, seed_user, timeit
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.core.responses import ORJSONResponse
+from app.debts.schemas import PayoffResponse
+from app.debts.service import get_debts, get_payoff_plan
+from app.transactions.service import get_transactions, get_transaction_rows
+
+
+def _starlette_dumps(content) -> bytes:
+    # Same settings as starlette.responses.JSONResponse.render
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--debts", type=int, default=10)
+    args = parser.parse_args()
+
+    db = make_session()
+    user_id = seed_user(db).id
+    seed_transactions(db, user_id, args.rows)
+    seed_debts(db, user_id, args.debts)
+
+    # ── Transaction history ──────────────────────────────────────────────────
+    def txn_before():
+        db.expunge_all()  # a fresh request starts with an empty identity map
+        return _starlette_dumps(jsonable_encoder(get_transactions(db, user_id)))
+
+    def txn_after():
+        return ORJSONResponse(get_transaction_rows(db, user_id)).body
+
+    before = timeit(txn_before)
+    after = timeit(txn_after)
+    print(f"GET /transactions ({args.rows} rows)")
+    print(f"  ORM + jsonable_encoder:  {before:8.1f} ms")
+    print(f"  projection + orjson:     {after:8.1f} ms   ({before / after:.1f}x)")
+
+    # ── Payoff projection ────────────────────────────────────────────────────
+    plan = get_payoff_plan(db, user_id, "avalanche", Decimal("0"))
+    adapter = TypeAdapter(PayoffResponse)
+    n_points = len(plan.monthly_projection)
+
+    def payoff_before():
+        # FastAPI's serialize_response: re-validate, dump to JSON-able python, json.dumps
+        validated = adapter.validate_python(plan, from_attributes=True)
+        return _starlette_dumps(adapter.dump_python(validated, mode="json"))
+
+    def payoff_after():
+        return ORJSONResponse(plan).body
+
+    before = timeit(payoff_before)
+    after = timeit(payoff_after)
+    print(f"\nGET /debts/payoff ({len(get_debts(db, user_id))} debts, {n_points} months)")
+    print(f"  response_model + json:   {before:8.1f} ms")
+    print(f"  ORJSONResponse:          {after:8.1f} ms   ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Shared helpers for the benchmark scripts: an isolated database engine and
+deterministic seed data.  Benchmarks default to an in-memory SQLite database
+so they can run without a PostgreSQL server; pass a DATABASE_URL to measure
+against a real deployment.
+"""
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+# Add the project root to the path so we can import from app
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("GOOGLE_CLIENT_ID", "benchmark")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database.base import Base
+# Import every model so relationship() targets resolve
+from app.users.models import User
+from app.sessions import models as session_models  # noqa: F401
+from app.transactions.models import Transaction
+from app.bank_statements import models as bank_statement_models  # noqa: F401
+from app.categorization import models as categorization_models  # noqa: F401
+from app.budgets import models as budget_models  # noqa: F401
+from app.chatbot import models as chatbot_models  # noqa: F401
+from app.debts.models import Debt
+from app.ml import models as ml_models  # noqa: F401
+
+_MERCHANTS = [
+    ("COSTCO WHOLESALE #512", "Groceries"),
+    ("TIM HORTONS #2231", "Food & Dining"),
+    ("UBER CANADA/UBERTRIP", "Transportation"),
+    ("NETFLIX.COM", "Subscriptions"),
+    ("AMAZON.CA MARKETPLACE", "Shopping"),
+    ("SHOPPERS DRUG MART", "Health & Fitness"),
+    ("ROGERS WIRELESS", "Utilities & Bills"),
+    ("CINEPLEX ENTERTAINMENT", "Entertainment"),
+    ("LOBLAWS #1040", "Groceries"),
+    ("STARBUCKS COFFEE", "Food & Dining"),
+]
+
+
+def make_session(url: str | None = None):
+    """Create a fresh schema and return a Session bound to it."""
+    url = url or "sqlite://"
+    if url.startswith("sqlite"):
+        engine = create_engine(
+            url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool if url == "sqlite://" else None,
+        )
+    else:
+        engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine, autoflush=False)()
+
+
+def seed_user(db, email: str = "bench@example.com") -> User:
+    user = User(email=email, full_name="Bench User", base_income=Decimal("5200.00"))
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def seed_transactions(db, user_id: int, n: int, seed: int = 42) -> None:
+    """Insert `n` purchase / income transactions spread over the last few years."""
+    rng = random.Random(seed)
+    start = date.today() - timedelta(days=3 * 365)
+    rows = []
+    for i in range(n):
+        merchant, category = rng.choice(_MERCHANTS)
+        is_income = i % 25 == 0
+        rows.append({
+            "user_id": user_id,
+            "date": start + timedelta(days=rng.randrange(3 * 365)),
+            "description": f"PAYROLL DEPOSIT {i}" if is_income else f"{merchant} {i}",
+            "amount": (
+                Decimal("2600.00") if is_income
+                else -Decimal(rng.randrange(100, 25_000)) / 100
+            ),
+            "category": "Income" if is_income else category,
+            "category_source": "rule",
+            "source": "chequing" if is_income or i % 3 else "credit_card",
+            "transaction_type": "income" if is_income else "purchase",
+        })
+    db.bulk_insert_mappings(Transaction, rows)
+    db.commit()
+
+
+def seed_debts(db, user_id: int, n: int, seed: int = 7) -> list[Debt]:
+    """Insert `n` debts with varied balances, rates and minimum payments."""
+    rng = random.Random(seed)
+    kinds = ["credit_card", "loan", "line_of_credit", "student_loan", "mortgage"]
+    debts = []
+    for i in range(n):
+        balance = Decimal(rng.randrange(50_000, 6_000_000)) / 100
+        debts.append(Debt(
+            user_id=user_id,
+            name=f"Debt {i + 1}",
+            debt_type=kinds[i % len(kinds)],
+            balance=balance,
+            interest_rate=Decimal(rng.randrange(200, 2_400)) / 100,
+            minimum_payment=max(Decimal("25.00"), (balance * Decimal("0.006")).quantize(Decimal("0.01"))),
+        ))
+    db.add_all(debts)
+    db.commit()
+    return debts
+
+
+def timeit(fn, repeat: int = 5) -> float:
+    """Return the best wall time of `repeat` runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
@@ -0,0 +1,54 @@
+import os
+import sys
+
+# Add the project root to the path so we can import from app
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+# app.core.config / app.database.session read these at import time
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("GOOGLE_CLIENT_ID", "test-client-id")
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database.base import Base
+# Import every model so relationship() targets resolve
+from app.users.models import User
+from app.sessions import models as session_models  # noqa: F401
+from app.transactions import models as transaction_models  # noqa: F401
+from app.bank_statements import models as bank_statement_models  # noqa: F401
+from app.categorization import models as categorization_models  # noqa: F401
+from app.budgets import models as budget_models  # noqa: F401
+from app.chatbot import models as chatbot_models  # noqa: F401
+from app.debts import models as debt_models  # noqa: F401
+from app.ml import models as ml_models  # noqa: F401
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine, autoflush=False)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def user(db):
+    user = User(email="test@example.com", full_name="Test User")
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
@@ -0,0 +1,129 @@
+"""
+Local stand-in for the OpenAI chat completions API, for tests.
+
+Speaks just enough of the protocol for the openai SDK: POST
+/v1/chat/completions returns a chat.completion, or with "stream": true a
+text/event-stream of chat.completion.chunk events ending in `data: [DONE]`
+(preceded by a usage chunk when stream_options.include_usage is set).
+Runs on a random localhost port in a background thread.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class OpenAIStub:
+    def __init__(self, reply: str = "You are on track this month.", chunk_delay: float = 0.0):
+        self.reply = reply
+        self.chunk_delay = chunk_delay
+        self.requests: list[dict] = []
+        self.statuses: list[int] = []     # queued error statuses, consumed first
+        self.completed_streams = 0
+        self.aborted_streams = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/v1"
+
+    def __enter__(self) -> "OpenAIStub":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def wait_for(self, predicate, timeout: float = 5.0) -> bool:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if predicate():
+                return True
+            time.sleep(0.01)
+        return False
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with stub._lock:
+                    stub.requests.append(body)
+                    status = stub.statuses.pop(0) if stub.statuses else 200
+                if status != 200:
+                    self._json(status, {"error": {"message": "stub error", "type": "server_error"}})
+                elif body.get("stream"):
+                    self._stream(body)
+                else:
+                    self._json(200, {
+                        "id": "chatcmpl-stub",
+                        "object": "chat.completion",
+                        "created": 0,
+                        "model": body["model"],
+                        "choices": [{
+                            "index": 0,
+                            "message": {"role": "assistant", "content": stub.reply},
+                            "finish_reason": "stop",
+                        }],
+                        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+                    })
+
+            def _json(self, status: int, payload: dict) -> None:
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _stream(self, body: dict) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+
+                def chunk(delta: dict | None, finish: str | None = None, usage: dict | None = None) -> bytes:
+                    event = {
+                        "id": "chatcmpl-stub",
+                        "object": "chat.completion.chunk",
+                        "created": 0,
+                        "model": body["model"],
+                        "choices": [] if delta is None else [{"index": 0, "delta": delta, "finish_reason": finish}],
+                    }
+                    if usage is not None:
+                        event["usage"] = usage
+                    return f"data: {json.dumps(event)}\n\n".encode()
+
+                tokens = [w + " " for w in stub.reply.split(" ")]
+                tokens[-1] = tokens[-1].rstrip()
+                try:
+                    self.wfile.write(chunk({"role": "assistant", "content": ""}))
+                    for token in tokens:
+                        self.wfile.write(chunk({"content": token}))
+                        self.wfile.flush()
+                        time.sleep(stub.chunk_delay)
+                    self.wfile.write(chunk({}, "stop"))
+                    if (body.get("stream_options") or {}).get("include_usage"):
+                        self.wfile.write(chunk(None, usage={
+                            "prompt_tokens": 10,
+                            "completion_tokens": len(tokens),
+                            "total_tokens": 10 + len(tokens),
+                        }))
+                    self.wfile.write(b"data: [DONE]\n\n")
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    with stub._lock:
+                        stub.aborted_streams += 1
+                    return
+                with stub._lock:
+                    stub.completed_streams += 1
+
+        return Handler
@@ -0,0 +1,106 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.api import auth as auth_api
+from app.api import users as users_api
+from app.core import auth
+from app.core.dependencies import get_db
+from app.sessions.models import Session as SessionModel
+from app.sessions.service import create_session
+from app.transactions.service import create_transaction
+from app.users import router as users_router
+
+
+@pytest.fixture(autouse=True)
+def _clear_auth_cache():
+    auth._sessions.clear()
+    auth._users.clear()
+    yield
+    auth._sessions.clear()
+    auth._users.clear()
+
+
+@pytest.fixture
+def client(db, user):
+    app = FastAPI()
+    app.include_router(auth_api.router)
+    app.include_router(users_api.router)
+    app.include_router(users_router.router)
+    app.dependency_overrides[get_db] = lambda: db
+    with TestClient(app) as c:
+        c.cookies.set("session_id", create_session(db, user.id).session_id)
+        yield c
+
+
+def _queries(db):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_hot_session_skips_the_database(client, db, user):
+    assert client.get("/auth/me").json()["user"]["email"] == user.email
+
+    statements = _queries(db)
+    for _ in range(3):
+        assert client.get("/auth/me").json()["authenticated"] is True
+
+    assert statements == []
+
+
+def test_logout_forgets_the_session(client):
+    assert client.get("/auth/me").json()["authenticated"] is True
+
+    client.post("/auth/logout")
+
+    assert client.get("/auth/me").json() == {"authenticated": False}
+
+
+def test_cached_session_still_expires(client, db):
+    assert client.get("/auth/me").json()["authenticated"] is True
+    session_id = client.cookies.get("session_id")
+    user_id, _ = auth._sessions.get(session_id)
+    auth._sessions.set(session_id, (user_id, datetime.utcnow() - timedelta(seconds=1)))
+    db.query(SessionModel).update({SessionModel.expires_at: datetime.utcnow() - timedelta(seconds=1)})
+    db.commit()
+
+    assert client.get("/auth/me").json() == {"authenticated": False}
+
+
+def test_income_update_refreshes_the_snapshot(client):
+    client.get("/users/income")
+
+    updated = client.put("/users/income", json={"base_income": "5200.00", "side_income": "300.00"})
+    income = client.get("/users/income").json()
+
+    assert updated.status_code == 200
+    assert Decimal(income["base_income"]) == Decimal("5200.00")
+    assert Decimal(income["side_income"]) == Decimal("300.00")
+
+
+def test_data_writes_drop_the_snapshot_on_commit(client, db, user):
+    client.get("/auth/me")
+    cached = auth._users.get(user.id)
+
+    create_transaction(db, user.id, date.today(), "COFFEE", Decimal("-4.50"), "Dining")
+
+    assert auth._users.get(user.id) is None
+    client.get("/auth/me")
+    assert auth._users.get(user.id).data_version == cached.data_version + 1
+
+
+def test_with_current_data_version_rereads_the_version(client, db, user):
+    client.get("/auth/me")
+    snapshot = auth._users.get(user.id)
+    db.query(type(user)).update({"data_version": snapshot.data_version + 5})   # another worker's write
+    db.commit()
+
+    fresh = auth.with_current_data_version(db, snapshot)
+
+    assert fresh.data_version == snapshot.data_version + 5
+    assert fresh.id == snapshot.id
@@ -0,0 +1,141 @@
+import sys
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.bank_statements.models import BankStatement
+from app.categorization.models import CategoryOverride
+from app.core.auth import get_current_user
+from app.core.dependencies import get_db
+from app.transactions import backfill
+from app.transactions import router as transactions_router
+from app.transactions.backfill import backfill_types, infer_source
+from app.transactions.models import Transaction
+from app.transactions.service import create_transaction
+
+
+def _seed(db, user, count, start=date(2026, 1, 1)):
+    for i in range(count):
+        create_transaction(db, user.id, start + timedelta(days=i), f"SHOP {i}", Decimal("-10.00"), "Shopping")
+
+
+def _types(db):
+    return {t.description: (t.source, t.transaction_type) for t in db.query(Transaction)}
+
+
+def test_infer_source_uses_the_only_window_that_can_cover_a_date():
+    ends = [date(2026, 1, 31), date(2026, 6, 30)]
+
+    assert infer_source(ends, date(2026, 1, 31)) == "credit_card"
+    assert infer_source(ends, date(2025, 11, 2)) == "credit_card"     # 90 days before Jan 31
+    assert infer_source(ends, date(2025, 11, 1)) == "chequing"
+    assert infer_source(ends, date(2026, 4, 15)) == "credit_card"     # inside the June window
+    assert infer_source(ends, date(2026, 3, 15)) == "chequing"        # between the two windows
+    assert infer_source(ends, date(2026, 7, 1)) == "chequing"
+    assert infer_source([], date(2026, 1, 1)) == "chequing"
+
+
+def test_chunks_walk_every_row_across_batch_boundaries(db, user):
+    _seed(db, user, 7)
+    create_transaction(db, user.id, date(2026, 2, 1), "DONE", Decimal("-1.00"), "Other",
+                       source="chequing", transaction_type="purchase")
+    batches = []
+
+    result = backfill_types(db, batch_size=3, on_batch=lambda last_id, updated: batches.append((last_id, updated)))
+
+    ids = sorted(t.id for t in db.query(Transaction).filter(Transaction.description != "DONE"))
+    assert [b[1] for b in batches] == [3, 6, 7]
+    assert [b[0] for b in batches] == [ids[2], ids[5], ids[6]]
+    assert result == {"updated": 7, "last_id": ids[6]}
+    assert all(types == ("chequing", "purchase") for types in _types(db).values())
+
+
+def test_resumes_after_the_given_id(db, user):
+    _seed(db, user, 5)
+    ids = sorted(t.id for t in db.query(Transaction))
+
+    result = backfill_types(db, batch_size=2, after_id=ids[2])
+
+    assert result == {"updated": 2, "last_id": ids[4]}
+    assert [t.transaction_type for t in db.query(Transaction).order_by(Transaction.id)] == \
+        [None, None, None, "purchase", "purchase"]
+
+
+def test_credit_card_windows_and_type_overrides_are_applied(db, user):
+    db.add(BankStatement(user_id=user.id, file_hash="a" * 64, filename="visa.pdf",
+                         statement_type="credit_card", uploaded_at=datetime(2026, 3, 31, 12)))
+    db.add(CategoryOverride(user_id=user.id, description_pattern="netflix", category="Subscriptions",
+                            transaction_type="purchase"))
+    db.add(CategoryOverride(user_id=user.id, description_pattern="PAYROLL", category="Income"))  # category only
+    db.commit()
+    create_transaction(db, user.id, date(2026, 3, 2), "NETFLIX.COM REFUND", Decimal("-16.99"), "Subscriptions")
+    create_transaction(db, user.id, date(2026, 3, 3), "INTEREST CHARGE", Decimal("-4.10"), "Fees")
+    create_transaction(db, user.id, date(2025, 12, 1), "PAYROLL ACME", Decimal("2500.00"), "Income")
+
+    backfill_types(db, user_id=user.id)
+
+    assert _types(db) == {
+        "NETFLIX.COM REFUND": ("credit_card", "purchase"),   # override beats detected 'refund'
+        "INTEREST CHARGE":    ("credit_card", "fee"),
+        "PAYROLL ACME":       ("chequing", "income"),
+    }
+
+
+def test_reclassify_revisits_typed_rows_but_counts_only_changes(db, user):
+    create_transaction(db, user.id, date(2026, 1, 5), "COFFEE", Decimal("-4.50"), "Dining",
+                       source="chequing", transaction_type="purchase")
+    create_transaction(db, user.id, date(2026, 1, 6), "LOAN PAYMENT", Decimal("-300.00"), "Debt",
+                       source="chequing", transaction_type="purchase")
+
+    assert backfill_types(db)["updated"] == 0
+    assert backfill_types(db, reclassify=True)["updated"] == 1
+    assert _types(db)["LOAN PAYMENT"] == ("chequing", "debt_payment")
+
+
+def test_endpoint_reports_changed_rows_for_the_current_user(db, user):
+    other = type(user)(email="other@example.com")
+    db.add(other)
+    db.commit()
+    _seed(db, user, 3)
+    create_transaction(db, other.id, date(2026, 1, 1), "ELSEWHERE", Decimal("-1.00"), "Other")
+
+    app = FastAPI()
+    app.include_router(transactions_router.router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: user
+    with TestClient(app) as client:
+        first = client.post("/transactions/backfill-types").json()
+        second = client.post("/transactions/backfill-types").json()
+
+    assert (first, second) == ({"updated": 3}, {"updated": 0})
+    assert _types(db)["ELSEWHERE"] == (None, None)
+
+
+def test_cli_runs_in_chunks(db, user, engine, monkeypatch, capsys):
+    _seed(db, user, 3)
+    monkeypatch.setattr("app.database.session.SessionLocal", sessionmaker(bind=engine))
+    monkeypatch.setattr(sys, "argv", ["backfill", "--batch-size", "2"])
+
+    backfill.main()
+
+    out = capsys.readouterr().out
+    assert "Done: 3 row(s) updated" in out
+    assert out.count("processed through id") == 2
+    db.expire_all()
+    assert all(t.transaction_type == "purchase" for t in db.query(Transaction))
+
+
+def test_detection_memo_is_bounded(db, user):
+    backfill._detect_type.cache_clear()
+    _seed(db, user, 3)
+    create_transaction(db, user.id, date(2026, 2, 1), "SHOP 0", Decimal("25.00"), "Income")
+
+    backfill_types(db, batch_size=2)
+
+    info = backfill._detect_type.cache_info()
+    assert info.maxsize == backfill.DETECTION_CACHE_SIZE
+    assert info.currsize == 4   # one entry per (description, sign, source)
+    assert _types(db)["SHOP 1"] == ("chequing", "purchase")
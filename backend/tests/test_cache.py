@@ -0,0 +1,134 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.bank_statements.models import BankStatement
+from app.core import cache as cache_module
+from app.core.auth import get_current_user
+from app.core.dependencies import get_db
+from app.core.cache import TTLCache
+from app.debts import service as debt_service
+from app.debts.schemas import DebtCreate, DebtUpdate
+from app.transactions import router as transactions_router
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = TTLCache(maxsize=10, ttl=30)
+    cache.set("k", "v")
+
+    now[0] += 29
+    assert cache.get("k") == "v"
+    now[0] += 2
+    assert cache.get("k") is None
+    assert len(cache) == 0
+
+
+def test_payoff_plan_is_cached_until_debts_change(db, user, monkeypatch):
+    debt = debt_service.create_debt(db, user.id, DebtCreate(
+        name="Visa", debt_type="credit_card",
+        balance=Decimal("3000.00"), interest_rate=Decimal("19.99"), minimum_payment=Decimal("90.00"),
+    ))
+    calls = []
+    real_run = debt_service._run_payoff
+    monkeypatch.setattr(debt_service, "_run_payoff", lambda *args: calls.append(args) or real_run(*args))
+
+    first = debt_service.get_payoff_plan(db, user.id, "avalanche", Decimal("100"))
+    again = debt_service.get_payoff_plan(db, user.id, "avalanche", Decimal("100"))
+    assert again is first
+    assert len(calls) == 1
+
+    debt_service.update_debt(db, debt, DebtUpdate(balance=Decimal("2000.00")))
+    updated = debt_service.get_payoff_plan(db, user.id, "avalanche", Decimal("100"))
+    assert len(calls) == 2
+    assert updated.total_months < first.total_months
+
+
+def _cached_keys(user_id):
+    return [
+        key
+        for cache in (debt_service._payoff_cache, debt_service._plan_cache)
+        for key in cache._data
+        if key[0] == user_id
+    ]
+
+
+def _create(db, user, debt):
+    debt_service.create_debt(db, user.id, DebtCreate(
+        name="LOC", debt_type="line_of_credit",
+        balance=Decimal("500.00"), interest_rate=Decimal("8.45"), minimum_payment=Decimal("25.00"),
+    ))
+
+
+def _delete(db, user, debt):
+    debt_service.delete_debt(db, debt)
+
+
+def _record_payment(db, user, debt):
+    debt_service.record_payment(db, debt, Decimal("100.00"), user.id)
+
+
+def _statement_update(db, user, debt):
+    debt.linked_statement_bank = "TD"
+    db.add(BankStatement(user_id=user.id, file_hash="f" * 64, filename="visa.pdf", statement_type="credit_card",
+                         closing_balance=Decimal("2500.00"), detected_bank="TD"))
+    db.commit()
+    statement = db.query(BankStatement).one()
+    assert debt_service.auto_update_from_statement(db, user.id, statement.id).updated
+
+
+def _confirm_debt_payment(db, user, debt):
+    app = FastAPI()
+    app.include_router(transactions_router.router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: user
+    item = {"date": date.today().isoformat(), "description": "VISA PAYMENT", "amount": "-100.00",
+            "category": "Debt Payment", "category_source": "rule", "source": "chequing",
+            "transaction_type": "debt_payment", "debt_id": debt.id}
+    with TestClient(app) as client:
+        assert client.post("/transactions/confirm", json={"transactions": [item]}).status_code == 200
+
+
+@pytest.mark.parametrize("write", [_create, _delete, _record_payment, _statement_update, _confirm_debt_payment])
+def test_debt_writes_evict_the_users_payoff_entries(db, user, write):
+    debt = debt_service.create_debt(db, user.id, DebtCreate(
+        name="Visa", debt_type="credit_card",
+        balance=Decimal("3000.00"), interest_rate=Decimal("19.99"), minimum_payment=Decimal("90.00"),
+    ))
+    debt_service.get_payoff_plan(db, user.id, "avalanche", Decimal("100"))
+    debt_service.get_payoff_plan(db, user.id, "avalanche", Decimal("100"), fmt="columnar")
+    debt_service.summarize_payoff(debt_service.get_debts(db, user.id), "avalanche", Decimal("0"))
+    assert len(_cached_keys(user.id)) == 3
+
+    write(db, user, debt)
+
+    assert _cached_keys(user.id) == []
+
+
+def test_full_plans_live_in_the_small_plan_cache(db, user):
+    debt_service.create_debt(db, user.id, DebtCreate(
+        name="Visa", debt_type="credit_card",
+        balance=Decimal("3000.00"), interest_rate=Decimal("19.99"), minimum_payment=Decimal("90.00"),
+    ))
+    for cents in range(debt_service.PAYOFF_PLAN_CACHE_SIZE + 5):
+        debt_service.get_payoff_plan(db, user.id, "avalanche", Decimal(cents))
+
+    assert len(debt_service._plan_cache) == debt_service.PAYOFF_PLAN_CACHE_SIZE
+    assert debt_service._payoff_cache.maxsize > debt_service.PAYOFF_PLAN_CACHE_SIZE
+    debt_service.invalidate_payoff_cache(user.id)
@@ -0,0 +1,87 @@
+import json
+
+from app.chatbot import answers
+from app.chatbot.answers import TEMPLATED_INTENTS, render_answer
+from app.chatbot.engine import INTENTS, run_calculation
+
+
+def _ctx(**overrides) -> dict:
+    ctx = {
+        "current_month": "2026-09",
+        "income": {"total_income": 5000.0, "is_estimated": False},
+        "spending": {
+            "total": 3200.0,
+            "cc_spending": 2000.0,
+            "chequing_spending": 1200.0,
+            "by_category": {"Restaurants": 450.0, "Groceries": 900.0, "Rent": 1600.0, "Transit": 250.0},
+        },
+        "pct_change": 12.34,
+        "budgets": [
+            {"category": "Restaurants", "limit": 400.0, "spent": 450.0, "pct_used": 112.5, "over": True},
+            {"category": "Groceries", "limit": 1000.0, "spent": 900.0, "pct_used": 90.0, "over": False},
+        ],
+        "trend": [{"month": "2026-08", "spending": 2848.5}, {"month": "2026-09", "spending": 3200.0}],
+        "debts": {},
+        "net_cash_flow": 1800.0,
+    }
+    ctx.update(overrides)
+    return ctx
+
+
+def _answer(intent: str, message: str = "", **overrides) -> str:
+    return render_answer(intent, run_calculation(intent, _ctx(**overrides), message), message)
+
+
+def test_open_ended_intents_are_left_to_the_llm():
+    assert TEMPLATED_INTENTS < INTENTS
+    for intent in ("what_if", "general_tips", "debt_question"):
+        assert render_answer(intent, run_calculation(intent, _ctx(), "hi")) is None
+
+
+def test_budget_check_answers_the_category_asked_about():
+    assert _answer("budget_check", "Am I over budget on restaurants?") == (
+        "Yes, you're over your Restaurants budget for 2026-09: "
+        "$450.00 spent against a $400.00 limit (112%), $50.00 over."
+    )
+    assert _answer("budget_check", "how are my groceries doing").startswith(
+        "No, you're within your Groceries budget"
+    )
+
+
+def test_budget_check_summary():
+    assert _answer("budget_check", "How are my budgets?") == (
+        "1 of your 2 budgets are over the limit for 2026-09: "
+        "Restaurants ($450.00 of $400.00, 112%). The other 1 are on track."
+    )
+    assert _answer("budget_check", "budgets?", budgets=[]).startswith("You don't have any budgets")
+
+
+def test_comparison_and_spending_analysis():
+    assert _answer("comparison") == (
+        "You've spent $3,200.00 in 2026-09, 12.3% more than last month. "
+        "Recent months: 2026-08 $2,848.50, 2026-09 $3,200.00."
+    )
+    assert "enough history" in _answer("comparison", pct_change=None, trend=[])
+
+    text = _answer("spending_analysis", "Where is my money going?")
+    assert text.startswith("You've spent $3,200.00 in 2026-09 ($2,000.00 on credit cards")
+    assert "Your biggest category is Rent at $1,600.00 (50% of the total)." in text
+    assert "Next: Groceries $900.00, Restaurants $450.00 and Transit $250.00." in text
+
+
+def test_savings_projection_handles_deficit_and_missing_income():
+    assert "saving $1,800.00 a month (36.0% of income)" in _answer("savings_projection")
+    deficit = _answer("savings_projection", income={"total_income": 3000.0, "is_estimated": True})
+    assert "shortfall of $200.00 a month" in deficit and deficit.endswith("manual income from Settings.")
+    assert _answer("savings_projection", income={"total_income": None, "is_estimated": False}).startswith(
+        "I can't project your savings"
+    )
+
+
+def test_wording_can_be_overridden(tmp_path, monkeypatch):
+    override = tmp_path / "answers.json"
+    override.write_text(json.dumps({"comparison": {"up": "Up {pct} to {current_spending}."}}))
+    monkeypatch.setattr(answers, "CHATBOT_ANSWER_TEMPLATES", str(override))
+
+    assert _answer("comparison", trend=[]) == "Up 12.3% to $3,200.00."
+    assert "less than last month" in _answer("comparison", pct_change=-5.0, trend=[])
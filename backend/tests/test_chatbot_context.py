@@ -0,0 +1,131 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event
+
+from app.budgets.schemas import BudgetCreate
+from app.budgets.service import create_budget
+from app.chatbot import service as chatbot_service
+from app.debts.schemas import DebtCreate
+from app.debts.service import create_debt
+from app.transactions.service import create_transaction, delete_transaction
+from app.users.service import bump_data_version
+
+
+@pytest.fixture(autouse=True)
+def _clear_context_cache():
+    chatbot_service._context_cache.clear()
+    yield
+    chatbot_service._context_cache.clear()
+
+
+def _queries(db):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_snapshot_is_reused_until_data_changes(db, user):
+    create_transaction(db, user.id, date.today(), "GROCERY STORE", Decimal("-82.15"), "Groceries")
+    first = chatbot_service.get_context_snapshot(db, user)
+    db.refresh(user)
+
+    statements = _queries(db)
+    second = chatbot_service.get_context_snapshot(db, user)
+
+    assert second is first
+    assert statements == []
+    assert "GROCERY STORE" in chatbot_service.build_context_text(*first)
+
+
+def test_writes_bump_data_version(db, user):
+    versions = [user.data_version]
+
+    txn = create_transaction(db, user.id, date.today(), "COFFEE", Decimal("-4.50"), "Dining")
+    versions.append(user.data_version)
+    create_budget(db, user.id, BudgetCreate(category="Dining", monthly_limit=Decimal("200"),
+                                            month=date.today().strftime("%Y-%m")))
+    versions.append(user.data_version)
+    create_debt(db, user.id, DebtCreate(name="Visa", debt_type="credit_card", balance=Decimal("900"),
+                                        interest_rate=Decimal("19.99"), minimum_payment=Decimal("30")))
+    versions.append(user.data_version)
+    delete_transaction(db, txn)
+    versions.append(user.data_version)
+
+    assert versions == sorted(set(versions))
+
+
+def test_one_data_version_update_per_commit(db, user):
+    before = user.data_version
+    statements = _queries(db)
+
+    bump_data_version(db, user.id)
+    bump_data_version(db, [user.id])
+    db.commit()
+    bump_data_version(db, user.id)
+    db.rollback()
+    db.commit()
+
+    updates = [s for s in statements if s.lstrip().upper().startswith("UPDATE USERS")]
+    assert len(updates) == 1
+    db.refresh(user)
+    assert user.data_version == before + 1
+
+
+def test_snapshot_rebuilds_after_write(db, user):
+    before = chatbot_service.get_context_snapshot(db, user)
+    assert "DEBTS: None tracked" in chatbot_service.build_context_text(*before)
+
+    create_debt(db, user.id, DebtCreate(name="Car Loan", debt_type="loan", balance=Decimal("12000"),
+                                        interest_rate=Decimal("6.5"), minimum_payment=Decimal("250")))
+    after = chatbot_service.get_context_snapshot(db, user)
+
+    assert after is not before
+    assert "Car Loan" in chatbot_service.build_context_text(*after)
+    assert len(chatbot_service._context_cache) == 1
+
+
+def test_normalize_question():
+    normalize_question = chatbot_service.normalize_question
+
+    assert normalize_question("How much did I spend this month?") == "how much did i spend this month"
+    assert normalize_question("  how much did I spend,   THIS month ") == "how much did i spend this month"
+    assert normalize_question("Can I afford $1,200.50 rent?") == normalize_question("can i afford $1200.50 rent")
+    assert normalize_question("Am I over budget...") == "am i over budget"
+
+
+def test_parallel_assembly_matches_sequential(tmp_path):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.database.base import Base
+    from app.users.models import User
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'context.db'}")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        owner = User(email="parallel@example.com", full_name="Parallel", base_income=Decimal("4000"))
+        db.add(owner)
+        db.commit()
+        create_transaction(db, owner.id, date.today(), "GROCERY STORE", Decimal("-82.15"), "Groceries")
+        create_budget(db, owner.id, BudgetCreate(category="Groceries", monthly_limit=Decimal("300"),
+                                                 month=date.today().strftime("%Y-%m")))
+        create_debt(db, owner.id, DebtCreate(name="Visa", debt_type="credit_card", balance=Decimal("900"),
+                                             interest_rate=Decimal("19.99"), minimum_payment=Decimal("30")))
+
+        assert chatbot_service._can_parallelize(db)
+        parallel = chatbot_service.get_financial_context(db, owner.id)
+        sequential = chatbot_service.get_financial_context(db, owner.id, parallel=False)
+
+        assert parallel == sequential
+        assert list(parallel) == list(sequential)
+        assert parallel["debts"]["count"] == 1 and parallel["budgets"][0]["category"] == "Groceries"
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def test_single_connection_engines_assemble_sequentially(db):
+    assert not chatbot_service._can_parallelize(db)
@@ -0,0 +1,79 @@
+import json
+
+from app.chatbot import prompt as chatbot_prompt
+from app.chatbot.engine import run_calculation
+from app.chatbot.prompt import build_prompt_context, count_tokens
+from app.chatbot.service import build_context_sections, build_context_text
+
+
+def _ctx() -> dict:
+    return {
+        "current_month": "2026-09",
+        "income": {"base_income": 4000.0, "side_income": 0.0, "transaction_income": 1000.0,
+                   "total_income": 5000.0, "is_estimated": False},
+        "spending": {"total": 3200.0, "cc_spending": 2000.0, "chequing_spending": 1200.0,
+                     "by_category": {"Rent": 1600.0, "Groceries": 900.0, "Restaurants": 450.0}},
+        "net_cash_flow": 1800.0,
+        "pct_change": 4.2,
+        "budgets": [{"category": "Restaurants", "limit": 400.0, "spent": 450.0, "pct_used": 112.5, "over": True}],
+        "recent_transactions": [
+            {"date": f"2026-09-{d:02d}", "description": f"STORE {d}", "amount": -10.0 * d,
+             "category": "Groceries", "source": "credit_card", "type": "debit"}
+            for d in range(1, 6)
+        ],
+        "trend": [{"month": f"2026-0{m}", "spending": 3000.0 + m} for m in range(4, 10)],
+        "debts": {
+            "count": 1, "total_debt": 9000.0, "total_minimum_payments": 250.0, "weighted_average_rate": 6.5,
+            "debt_free_date": "2029-10", "avalanche_months": 37, "total_interest_paid": 950.0,
+            "list": [{"name": "Car Loan", "debt_type": "loan", "balance": 9000.0,
+                      "interest_rate": 6.5, "minimum_payment": 250.0}],
+            "payoff_order": [{"order": 1, "name": "Car Loan", "payoff_date": "2029-10",
+                              "months_to_payoff": 37, "total_interest": 950.0}],
+        },
+    }
+
+
+def test_only_sections_relevant_to_the_intent_are_sent():
+    ctx = _ctx()
+    sections = build_context_sections(ctx)
+
+    budget = build_prompt_context(sections, "budget_check", run_calculation("budget_check", ctx, ""))
+    debt = build_prompt_context(sections, "debt_question", run_calculation("debt_question", ctx, ""))
+
+    assert budget.sections == ["budgets", "spending", "categories"]
+    assert "BUDGET STATUS" in budget.context_text and "Car Loan" not in budget.context_text
+    assert "Avalanche payoff order" in debt.context_text and "STORE 3" not in debt.context_text
+    assert budget.tokens < count_tokens(build_context_text(ctx, sections))
+
+
+def test_calculation_is_sent_as_compact_json():
+    ctx = _ctx()
+    calc = run_calculation("comparison", ctx, "")
+
+    prompt = build_prompt_context(build_context_sections(ctx), "comparison", calc)
+
+    assert json.loads(prompt.calc_json) == json.loads(json.dumps(calc, default=str))
+    assert "\n" not in prompt.calc_json and ", " not in prompt.calc_json
+
+
+def test_budget_cuts_lowest_priority_sections_first():
+    ctx = _ctx()
+    sections = build_context_sections(ctx)
+    calc = run_calculation("spending_analysis", ctx, "")
+    full = build_prompt_context(sections, "spending_analysis", calc, budget=10_000)
+
+    tight = build_prompt_context(sections, "spending_analysis", calc, budget=full.tokens - 20)
+
+    assert full.dropped == [] and tight.tokens <= full.tokens - 20
+    assert tight.sections[:2] == ["spending", "categories"]
+    assert tight.dropped and tight.dropped[-1] == "trend"
+    assert set(tight.sections).isdisjoint(tight.dropped[1:])
+
+
+def test_classifier_context_is_small_and_logged(caplog):
+    caplog.set_level("INFO", logger=chatbot_prompt.__name__)
+
+    prompt = build_prompt_context(build_context_sections(_ctx()), None)
+
+    assert prompt.calc_json == "" and prompt.tokens <= chatbot_prompt.CLASSIFY_TOKEN_BUDGET
+    assert "intent=<classify>" in caplog.text and f"tokens={prompt.tokens}" in caplog.text
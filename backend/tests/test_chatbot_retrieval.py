@@ -0,0 +1,137 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.chatbot import retrieval
+from app.chatbot.answers import render_answer
+from app.chatbot.engine import run_calculation
+from app.core.auth import CurrentUser, get_current_user
+from app.core.dependencies import get_db
+from app.transactions import router as transactions_router
+from app.transactions.models import Transaction
+
+TODAY = date(2026, 10, 18)
+
+
+@pytest.fixture(autouse=True)
+def _clear_indexes():
+    retrieval._indexes.clear()
+    yield
+    retrieval._indexes.clear()
+
+
+def _txn(user_id, day, description, amount, category="Shopping"):
+    return Transaction(
+        user_id=user_id, date=day, description=description, amount=Decimal(amount),
+        category=category, category_source="rule", source="credit_card", transaction_type="purchase",
+    )
+
+
+@pytest.fixture
+def history(db, user):
+    db.add_all([
+        _txn(user.id, date(2025, 3, 2), "COSTCO WHOLESALE #512", "-182.40", "Groceries"),
+        _txn(user.id, date(2025, 11, 20), "COSTCO WHOLESALE #512", "-95.10", "Groceries"),
+        _txn(user.id, date(2025, 12, 1), "COSTCO GAS #512", "-61.00", "Transportation"),
+        _txn(user.id, date(2025, 12, 5), "COSTCO WHOLESALE #512", "25.00", "Groceries"),
+        _txn(user.id, date(2026, 2, 14), "COSTCO WHOLESALE #512", "-40.00", "Groceries"),
+        _txn(user.id, date(2025, 6, 9), "STARBUCKS 0423", "-6.25", "Restaurants"),
+        _txn(user.id, date(2025, 6, 10), "LOBLAWS 1120", "-88.00", "Groceries"),
+    ])
+    db.commit()
+    return user
+
+
+def test_merchant_spending_within_period(db, history):
+    matches = retrieval.retrieve_transactions(db, history, "How much did I spend at Costco last year?", TODAY)
+
+    assert matches["query_terms"] == ["costco"]
+    assert matches["period"] == "in 2025"
+    assert (matches["count"], matches["total_spent"], matches["total_received"]) == (4, 338.5, 25.0)
+    assert (matches["first_date"], matches["last_date"]) == ("2025-03-02", "2025-12-05")
+    assert matches["by_description"][0] == {"description": "COSTCO WHOLESALE #512", "count": 3, "spent": 277.5}
+    assert matches["by_month"] == {"2025-03": 182.4, "2025-11": 95.1, "2025-12": 61.0}
+
+
+def test_questions_without_merchants_retrieve_nothing(db, history):
+    assert retrieval.retrieve_transactions(db, history, "How much did I spend this month?", TODAY) is None
+    assert retrieval.retrieve_transactions(db, history, "How much do I spend on groceries?", TODAY) is None
+    assert retrieval.retrieve_transactions(db, history, "Tips to spend less at Walmart", TODAY) is None
+
+
+def test_templated_answer_uses_matches(db, history):
+    message = "how much did i spend at starbucks in june 2025"
+    matches = retrieval.retrieve_transactions(db, history, message, TODAY)
+    calc = run_calculation("spending_analysis", {
+        "current_month": "2026-10", "trend": [], "pct_change": None,
+        "spending": {"total": 0.0, "cc_spending": 0.0, "chequing_spending": 0.0, "by_category": {}},
+    }, message, matches)
+
+    assert render_answer("spending_analysis", calc, message) == (
+        "You spent $6.25 at Starbucks in 2025-06, across 1 transaction (most recently on 2025-06-09)."
+    )
+
+
+def test_index_is_rebuilt_after_writes_and_extended_on_confirm(db, history):
+    first = retrieval.get_index(db, history)
+    assert retrieval.get_index(db, history) is first
+
+    history.data_version += 1
+    db.commit()
+    rebuilt = retrieval.get_index(db, history)
+    assert rebuilt is not first
+
+    new = _txn(history.id, date(2026, 10, 1), "IKEA NORTH YORK", "-300.00")
+    db.add(new)
+    history.data_version += 1
+    db.commit()
+    retrieval.add_transactions(history.id, [(new.id, new.date, new.description, new.amount, new.category)],
+                               rebuilt.data_version, history.data_version, 1)
+
+    assert retrieval.get_index(db, history) is rebuilt
+    assert retrieval.retrieve_transactions(db, history, "ikea this month", TODAY)["total_spent"] == 300.0
+
+
+def test_confirm_drops_the_index_when_another_write_landed(db, history):
+    index = retrieval.get_index(db, history)
+    new = _txn(history.id, date(2026, 10, 1), "IKEA NORTH YORK", "-300.00")
+    db.add(new)
+    history.data_version += 2   # our insert plus someone else's write
+    db.commit()
+
+    retrieval.add_transactions(history.id, [(new.id, new.date, new.description, new.amount, new.category)],
+                               index.data_version, history.data_version, 1)
+
+    assert retrieval._indexes.get(history.id) is None
+    assert retrieval.get_index(db, history) is not index
+
+
+def test_confirm_endpoint_extends_the_index_with_its_own_rows(db, history):
+    index = retrieval.get_index(db, history)
+    app = FastAPI()
+    app.include_router(transactions_router.router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: CurrentUser.from_user(history)
+    items = [
+        {"date": "2026-10-01", "description": "IKEA NORTH YORK", "amount": "-300.00",
+         "category": "Shopping", "category_source": "rule", "source": "chequing"},
+        {"date": "2026-10-02", "description": "IKEA NORTH YORK", "amount": "-20.00",
+         "category": "Shopping", "category_source": "rule", "source": "chequing"},
+    ]
+    with TestClient(app) as client:
+        assert client.post("/transactions/confirm", json={"transactions": items}).status_code == 200
+
+    db.refresh(history)
+    assert retrieval.get_index(db, history) is index
+    assert retrieval.retrieve_transactions(db, history, "ikea this month", TODAY)["total_spent"] == 320.0
+
+
+def test_parse_period():
+    assert retrieval.parse_period("costco in the last 3 months", TODAY).start == date(2026, 7, 20)
+    assert retrieval.parse_period("costco last month", TODAY).label == "in 2026-09"
+    assert retrieval.parse_period("costco in december", TODAY).start == date(2025, 12, 1)
+    assert retrieval.parse_period("costco ytd", TODAY).label == "so far in 2026"
+    assert retrieval.parse_period("costco", TODAY).start is None
@@ -0,0 +1,189 @@
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.chatbot import llm as chatbot_llm
+from app.chatbot import retrieval as chatbot_retrieval
+from app.chatbot import router as chatbot_router
+from app.chatbot import service as chatbot_service
+from app.chatbot.metrics import RequestTrace
+from app.chatbot.models import ChatHistory
+from app.core.auth import get_current_user
+from app.core.dependencies import get_db
+from app.users.models import User
+from llm_stub import OpenAIStub
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    with OpenAIStub(reply="You are under budget on restaurants with $120.50 left.") as server:
+        monkeypatch.setattr(chatbot_router, "OPENAI_API_KEY", "sk-test")
+        monkeypatch.setattr(chatbot_llm, "_llm", chatbot_llm.LLMClient(api_key="sk-test", base_url=server.base_url))
+        yield server
+    chatbot_service._context_cache.clear()
+    chatbot_service._answer_cache.clear()
+    chatbot_retrieval._indexes.clear()
+
+
+@pytest.fixture
+def client(db, user):
+    app = FastAPI()
+    app.include_router(chatbot_router.router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: user
+    with TestClient(app) as c:
+        yield c
+
+
+def _events(lines):
+    events, event = [], None
+    for line in lines:
+        if line.startswith("event: "):
+            event = line[len("event: "):]
+        elif line.startswith("data: "):
+            events.append((event, json.loads(line[len("data: "):])))
+    return events
+
+
+def test_stream_sends_tokens_then_persists(stub, client, db):
+    with client.stream("POST", "/chatbot/ask/stream", json={"message": "Am I over budget on restaurants?", "use_llm": True}) as r:
+        assert r.status_code == 200
+        assert r.headers["content-type"].startswith("text/event-stream")
+        events = _events(r.iter_lines())
+
+    kinds = [kind for kind, _ in events]
+    assert kinds[0] == "intent" and kinds[-1] == "done"
+    assert set(kinds[1:-1]) == {"token"}
+    assert events[0][1] == {"intent": "budget_check"}
+    assert "".join(data["text"] for kind, data in events if kind == "token") == stub.reply
+    assert events[-1][1]["response"] == stub.reply
+
+    assert len(stub.requests) == 1 and stub.requests[0]["stream"] is True   # intent was classified locally
+    saved = db.query(ChatHistory).one()
+    assert (saved.intent, saved.response) == ("budget_check", stub.reply)
+
+
+def test_upstream_error_is_reported_and_not_saved(stub, client, db):
+    stub.statuses = [400]
+
+    with client.stream("POST", "/chatbot/ask/stream", json={"message": "Am I over budget on restaurants?", "use_llm": True}) as r:
+        events = _events(r.iter_lines())
+
+    assert [kind for kind, _ in events] == ["intent", "error"]
+    assert db.query(ChatHistory).count() == 0
+
+
+def test_disconnect_aborts_upstream_request(stub, db, user):
+    stub.reply = " ".join(["word"] * 400)
+    stub.chunk_delay = 0.01
+
+    async def consume_then_disconnect():
+        llm = chatbot_llm.get_llm()
+        gen = chatbot_router._stream_answer(llm, db, user, "hi", "general_tips", {}, {}, RequestTrace())
+        received = [await gen.__anext__() for _ in range(4)]   # intent + 3 tokens
+        await gen.aclose()                                      # what Starlette does on disconnect
+        return received
+
+    received = asyncio.run(consume_then_disconnect())
+
+    assert received[0].startswith("event: intent")
+    assert stub.wait_for(lambda: stub.aborted_streams == 1)
+    assert stub.completed_streams == 0
+    assert db.query(ChatHistory).count() == 0
+
+
+def test_ask_uses_pooled_client(stub, client, db):
+    r = client.post("/chatbot/ask", json={"message": "Am I over budget on restaurants?", "use_llm": True})
+
+    assert r.status_code == 200
+    assert r.json()["response"] == stub.reply
+    assert db.query(ChatHistory).one().intent == "budget_check"
+
+
+def test_ask_returns_503_when_pool_is_saturated(stub, client, monkeypatch):
+    async def overloaded(**kwargs):
+        raise chatbot_llm.LLMOverloaded("full")
+
+    monkeypatch.setattr(chatbot_llm.get_llm(), "complete", overloaded)
+
+    r = client.post("/chatbot/ask", json={"message": "Am I over budget on restaurants?", "use_llm": True})
+
+    assert r.status_code == 503
+    assert r.headers["retry-after"] == "5"
+
+
+def test_templated_intent_answers_without_llm(stub, client, db, monkeypatch):
+    monkeypatch.setattr(chatbot_router, "OPENAI_API_KEY", None)
+
+    with client.stream("POST", "/chatbot/ask/stream", json={"message": "Am I over budget on restaurants?"}) as r:
+        events = _events(r.iter_lines())
+
+    assert [kind for kind, _ in events] == ["intent", "token", "done"]
+    assert events[-1][1]["response"].startswith("You don't have any budgets set up yet.")
+    assert stub.requests == []
+    assert db.query(ChatHistory).one().intent == "budget_check"
+
+
+def test_repeated_question_is_served_from_cache(stub, client, db, user):
+    question = {"message": "What if I cut restaurants by half?"}
+    first = client.post("/chatbot/ask", json=question).json()
+    with client.stream("POST", "/chatbot/ask/stream", json={"message": "what if i cut RESTAURANTS by half"}) as r:
+        events = _events(r.iter_lines())
+    second = client.post("/chatbot/ask", json=question).json()
+
+    assert (first["cached"], second["cached"]) == (False, True)
+    assert [kind for kind, _ in events] == ["intent", "token", "done"] and events[-1][1]["cached"] is True
+    assert second["response"] == first["response"] == stub.reply
+    upstream = len(stub.requests)
+    assert [row.cached for row in db.query(ChatHistory).order_by(ChatHistory.id)] == [False, True, True]
+
+    user.data_version += 1   # any write to the user's data
+    db.commit()
+    third = client.post("/chatbot/ask", json=question).json()
+
+    assert third["cached"] is False
+    assert len(stub.requests) > upstream
+
+
+def test_stages_and_token_usage_are_recorded(stub, client, db):
+    with client.stream("POST", "/chatbot/ask/stream", json={"message": "What if I cut restaurants by half?"}) as r:
+        _events(r.iter_lines())
+    client.post("/chatbot/ask", json={"message": "Am I over budget on restaurants?"})
+
+    streamed, templated = db.query(ChatHistory).order_by(ChatHistory.id).all()
+    assert set(streamed.timings) == {"context", "intent", "calculation", "formatting", "persist", "total"}
+    assert streamed.llm_calls == [{
+        "call": "format", "model": "gpt-4o-mini",
+        "prompt_tokens": 10, "completion_tokens": len(stub.reply.split(" ")),
+    }]
+    assert templated.llm_calls is None and templated.timings["formatting"] < 1000
+
+    stats = client.get("/chatbot/stats", params={"days": 1}).json()["intents"]
+    assert stats["what_if"]["requests"] == 1
+    assert stats["what_if"]["tokens"]["gpt-4o-mini"]["calls"] == 1
+    total = stats["budget_check"]["stages"]["total"]
+    assert total["count"] == 1 and sum(b["count"] for b in total["buckets"]) == 1
+    assert stats["budget_check"]["stages"]["persist"]["count"] == 1
+    assert "persist" in client.get("/chatbot/metrics").json()["stages"]["budget_check"]
+
+
+def test_stats_only_cover_the_current_user(stub, client, db):
+    client.post("/chatbot/ask", json={"message": "Am I over budget on restaurants?"})
+    other = User(email="other@example.com", full_name="Other User")
+    db.add(other)
+    db.commit()
+    db.add(ChatHistory(
+        user_id=other.id, message="What if I cut restaurants by half?", intent="what_if",
+        response="...", timings={"total": 5.0},
+        llm_calls=[{"call": "format", "model": "gpt-4o", "prompt_tokens": 10, "completion_tokens": 5}],
+        created_at=datetime.utcnow(),
+    ))
+    db.commit()
+
+    stats = client.get("/chatbot/stats", params={"days": 1}).json()["intents"]
+    assert set(stats) == {"budget_check"}
+    assert stats["budget_check"]["requests"] == 1
@@ -0,0 +1,110 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import event
+
+from app.debts.models import Debt, DebtDueStatus
+from app.debts.schemas import DebtCreate
+from app.debts.service import create_debt, get_due_soon, record_payment, refresh_due_status
+
+
+def _create(db, user, name, due_day):
+    return create_debt(db, user.id, DebtCreate(
+        name=name, debt_type="credit_card", balance=Decimal("1500.00"),
+        interest_rate=Decimal("19.99"), minimum_payment=Decimal("45.00"), due_date=due_day,
+    ))
+
+
+def _count_queries(db):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_due_soon_reads_precomputed_rows_in_one_query(db, user):
+    today = date.today()
+    due = _create(db, user, "Visa", today.day)
+    _create(db, user, "No due date", None)
+
+    user_id = user.id
+    statements = _count_queries(db)
+    result = get_due_soon(db, user_id)
+
+    assert [d.id for d in result] == [due.id]
+    assert result[0].days_until_due == 0
+    assert len(statements) == 1
+
+
+def test_payment_clears_due_soon(db, user):
+    debt = _create(db, user, "Visa", date.today().day)
+    assert get_due_soon(db, user.id)
+
+    record_payment(db, debt, Decimal("45.00"), user.id)
+
+    assert get_due_soon(db, user.id) == []
+    assert db.get(DebtDueStatus, debt.id).paid_this_month
+
+
+def test_stale_rows_are_recomputed_on_read_without_writing(db, user):
+    debt = _create(db, user, "Visa", date.today().day)
+    status = db.get(DebtDueStatus, debt.id)
+    stale_day = date.today() - timedelta(days=40)
+    status.computed_on = stale_day
+    status.paid_this_month = True
+    db.commit()
+
+    statements = _count_queries(db)
+    assert [d.id for d in get_due_soon(db, debt.user_id)] == [debt.id]
+
+    assert not [s for s in statements if not s.lstrip().upper().startswith("SELECT")]
+    db.expire_all()
+    assert db.get(DebtDueStatus, debt.id).computed_on == stale_day
+
+
+def test_batch_refresh_covers_every_user(db, user):
+    from app.users.models import User
+
+    other = User(email="other@example.com", full_name="Other")
+    db.add(other)
+    db.commit()
+    # Rows written behind the service's back, e.g. before the migration ran
+    for owner in (user, other):
+        db.add(Debt(user_id=owner.id, name="Loan", debt_type="loan", balance=Decimal("900.00"),
+                    interest_rate=Decimal("6.00"), minimum_payment=Decimal("50.00"), due_date=31))
+    db.commit()
+
+    assert refresh_due_status(db) == 2
+    assert {s.user_id for s in db.query(DebtDueStatus)} == {user.id, other.id}
+    last_day = (date.today().replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+    assert {s.due_on for s in db.query(DebtDueStatus)} == {last_day}
+
+
+def test_missing_rows_are_computed_on_read(db, user):
+    # Debts that predate debt_due_status have no rows until the first refresh
+    debt = Debt(user_id=user.id, name="Visa", debt_type="credit_card", balance=Decimal("1500.00"),
+                interest_rate=Decimal("19.99"), minimum_payment=Decimal("45.00"), due_date=date.today().day)
+    db.add(debt)
+    db.commit()
+
+    assert [d.id for d in get_due_soon(db, user.id)] == [debt.id]
+    assert db.get(DebtDueStatus, debt.id) is None   # stored by the scheduler, not by reads
+
+    refresh_due_status(db)
+    assert db.get(DebtDueStatus, debt.id) is not None
+
+
+def test_refresh_upserts_existing_rows_and_drops_only_stale_ones(db, user):
+    kept = _create(db, user, "Visa", date.today().day)
+    dropped = _create(db, user, "Loan", date.today().day)
+    status = db.get(DebtDueStatus, kept.id)
+    status.computed_on = date.today() - timedelta(days=40)
+    status.paid_this_month = True
+    dropped.due_date = None
+    db.commit()
+
+    assert refresh_due_status(db, user.id) == 1
+    assert refresh_due_status(db, user.id) == 1   # re-running over live rows is an upsert
+
+    db.expire_all()
+    rows = db.query(DebtDueStatus).all()
+    assert [(s.debt_id, s.computed_on, s.paid_this_month) for s in rows] == [(kept.id, date.today(), False)]
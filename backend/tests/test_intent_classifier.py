@@ -0,0 +1,55 @@
+import numpy as np
+
+from app.chatbot.engine import INTENTS
+from app.chatbot.intent_classifier import (
+    IntentClassifier,
+    build_pipeline,
+    classify_intent,
+    get_classifier,
+    load_dataset,
+)
+
+
+def test_bundled_dataset_covers_every_intent():
+    questions, intents = load_dataset()
+
+    assert set(intents) == INTENTS
+    assert len(set(questions)) == len(questions)
+
+
+def test_fast_path_matches_sklearn_pipeline():
+    questions, intents = load_dataset()
+    pipeline = build_pipeline().fit(questions, intents)
+    model = IntentClassifier(pipeline)
+
+    samples = questions[::7] + ["", "???", "how much did I blow on takeout lol", "zzzz qqqq"]
+    expected = pipeline.predict_proba(samples)
+    actual = np.array([model.predict_proba(s) for s in samples])
+
+    assert model.classes == pipeline.classes_.tolist()
+    np.testing.assert_allclose(actual, expected, atol=1e-9)
+
+
+def test_confident_questions_are_classified_locally():
+    assert classify_intent("Am I over budget on restaurants this month?").intent == "budget_check"
+    assert classify_intent("When will I be debt free?").intent == "debt_question"
+    assert classify_intent("What if I cut dining out by 25%?").intent == "what_if"
+
+
+def test_low_confidence_defers_to_llm():
+    assert classify_intent("When will I be debt free?", threshold=1.01) is None
+    assert get_classifier().predict("").confidence < 0.5
+
+
+def test_classifier_is_trained_at_startup(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app import main
+    from app.chatbot import intent_classifier
+    from app.core import scheduler
+
+    monkeypatch.setattr(scheduler, "SCHEDULER_ENABLED", False)
+    monkeypatch.setattr(intent_classifier, "_classifier", None)
+
+    with TestClient(main.app):
+        assert intent_classifier._classifier is not None
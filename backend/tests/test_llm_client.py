@@ -0,0 +1,104 @@
+import asyncio
+
+import openai
+import pytest
+
+from app.chatbot import llm as chatbot_llm
+from app.chatbot.llm import LLMClient, LLMOverloaded
+from app.chatbot.metrics import LLMMetrics
+from llm_stub import OpenAIStub
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    monkeypatch.setattr(chatbot_llm, "BACKOFF_BASE", 0.001)
+    with OpenAIStub(reply="one two three") as server:
+        yield server
+
+
+def _client(stub, **kwargs) -> LLMClient:
+    return LLMClient(api_key="sk-test", base_url=stub.base_url, metrics=LLMMetrics(), **kwargs)
+
+
+def test_transient_errors_are_retried(stub):
+    stub.statuses = [500, 429]
+    llm = _client(stub)
+
+    resp = asyncio.run(llm.complete(model="gpt-4o-mini", messages=MESSAGES))
+
+    assert resp.choices[0].message.content == "one two three"
+    snap = llm.metrics.snapshot()
+    assert (snap["requests"], snap["attempts"], snap["retries"], snap["failures"]) == (1, 3, 2, 0)
+    assert snap["in_flight"] == 0 and snap["upstream_latency"]["count"] == 3
+
+
+def test_client_errors_are_not_retried(stub):
+    stub.statuses = [400]
+    llm = _client(stub)
+
+    with pytest.raises(openai.BadRequestError):
+        asyncio.run(llm.complete(model="gpt-4o-mini", messages=MESSAGES))
+
+    assert len(stub.requests) == 1
+    assert llm.metrics.snapshot()["failures"] == 1
+
+
+def test_gives_up_after_max_retries(stub):
+    stub.statuses = [503] * 5
+    llm = _client(stub, max_retries=2)
+
+    with pytest.raises(openai.InternalServerError):
+        asyncio.run(llm.complete(model="gpt-4o-mini", messages=MESSAGES))
+
+    assert len(stub.requests) == 3
+
+
+def test_waiters_beyond_queue_timeout_are_rejected(stub):
+    stub.reply = " ".join(["word"] * 50)
+    stub.chunk_delay = 0.01
+    llm = _client(stub, max_concurrency=1, queue_timeout=0.05)
+
+    async def hold_slot():
+        async with llm.stream(model="gpt-4o-mini", messages=MESSAGES) as stream:
+            async for _ in stream:
+                pass
+
+    async def main():
+        holder = asyncio.create_task(hold_slot())
+        while not llm.metrics.in_flight:
+            await asyncio.sleep(0.005)
+        with pytest.raises(LLMOverloaded):
+            await llm.complete(model="gpt-4o-mini", messages=MESSAGES)
+        await holder
+
+    asyncio.run(main())
+
+    snap = llm.metrics.snapshot()
+    assert (snap["requests"], snap["rejected"], snap["max_queue_depth"]) == (2, 1, 1)
+    assert snap["in_flight"] == 0 and snap["queue_depth"] == 0
+    assert len(stub.requests) == 1
+
+
+def test_concurrency_is_capped(stub):
+    stub.reply = " ".join(["word"] * 10)
+    stub.chunk_delay = 0.01
+    llm = _client(stub, max_concurrency=2)
+    peak = 0
+
+    async def one():
+        nonlocal peak
+        async with llm.stream(model="gpt-4o-mini", messages=MESSAGES) as stream:
+            peak = max(peak, llm.metrics.in_flight)
+            async for _ in stream:
+                pass
+
+    async def main():
+        await asyncio.gather(*(one() for _ in range(5)))
+
+    asyncio.run(main())
+
+    assert peak == 2
+    assert stub.completed_streams == 5
+    assert llm.metrics.snapshot()["queue_wait"]["count"] == 5
@@ -0,0 +1,90 @@
+from decimal import Decimal
+
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.auth import get_current_user
+from app.core.dependencies import get_db
+from app.debts import engine, montecarlo
+from app.debts import router as debts_router
+from app.debts.models import Debt
+from app.debts.schemas import MonteCarloRequest
+from app.debts.service import get_monte_carlo
+
+
+def _debts():
+    return [
+        Debt(id=1, name="Mortgage", debt_type="mortgage",
+             balance=Decimal("250000.00"), interest_rate=Decimal("5.19"), minimum_payment=Decimal("1600.00")),
+        Debt(id=2, name="Visa", debt_type="credit_card",
+             balance=Decimal("6000.00"), interest_rate=Decimal("19.99"), minimum_payment=Decimal("180.00")),
+        Debt(id=3, name="LOC", debt_type="line_of_credit",
+             balance=Decimal("15000.00"), interest_rate=Decimal("8.45"), minimum_payment=Decimal("300.00")),
+    ]
+
+
+def test_zero_volatility_reproduces_fixed_rate_plan():
+    pf = engine.Portfolio.from_debts(_debts())
+    fixed = engine.simulate(pf, "avalanche", np.array([25_000]), record_history=False)
+
+    result = montecarlo.run_monte_carlo(
+        pf, "avalanche", 25_000, np.ones(3, dtype=bool),
+        paths=200, horizon=600, drift=0.0, volatility=0.0, seed=1,
+    )
+
+    assert set(result.months.tolist()) == {int(fixed.months[0])}
+    assert set(result.interest.tolist()) == {int(fixed.interest.sum())}
+
+
+def test_runs_are_reproducible_across_chunks():
+    pf = engine.Portfolio.from_debts(_debts())
+    args = dict(paths=6000, horizon=360, drift=0.25, volatility=1.5)
+
+    first = montecarlo.run_monte_carlo(pf, "snowball", 0, np.ones(3, dtype=bool), seed=42, **args)
+    second = montecarlo.run_monte_carlo(pf, "snowball", 0, np.ones(3, dtype=bool), seed=42, **args)
+    other = montecarlo.run_monte_carlo(pf, "snowball", 0, np.ones(3, dtype=bool), seed=43, **args)
+
+    assert len(first.months) == 6000
+    assert (first.months == second.months).all()
+    assert (first.interest == second.interest).all()
+    assert (first.interest != other.interest).any()
+
+
+def test_monte_carlo_bands(db, user):
+    for debt in _debts():
+        debt.id = None
+        debt.user_id = user.id
+        db.add(debt)
+    db.commit()
+
+    result = get_monte_carlo(db, user.id, MonteCarloRequest(
+        extra_payment=Decimal("200"), paths=500, drift=0.5, volatility=2.0, seed=7,
+    ))
+
+    assert [b.percentile for b in result.bands] == list(montecarlo.PERCENTILES)
+    assert sorted(result.variable_debt_ids) == sorted(
+        d.id for d in db.query(Debt).filter(Debt.debt_type != "credit_card")
+    )
+    months = [b.months_to_debt_free or 10 ** 6 for b in result.bands]
+    assert months == sorted(months)
+    interest = [b.total_interest for b in result.bands]
+    assert interest == sorted(interest)
+    assert 0.0 <= result.probability_debt_free <= 1.0
+    assert result.fixed_rate_months is not None
+
+
+def test_unrepresentable_debts_are_rejected(db, user, monkeypatch):
+    def fail(*args, **kwargs):
+        raise engine.EngineFallback("100.005 has sub-cent precision")
+
+    monkeypatch.setattr(debts_router, "get_monte_carlo", fail)
+    app = FastAPI()
+    app.include_router(debts_router.router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: user
+    with TestClient(app) as client:
+        response = client.post("/debts/payoff/monte-carlo", json={"paths": 100})
+
+    assert response.status_code == 422
+    assert "sub-cent" in response.json()["detail"]
@@ -0,0 +1,219 @@
+import random
+from decimal import Decimal
+
+import pytest
+
+from app.debts import engine
+from app.debts.models import Debt
+from app.debts.service import _run_payoff, _simulate_payoff, summarize_debts, summarize_payoff
+
+
+def _debt(debt_id, balance, rate, minimum, name=None):
+    return Debt(
+        id=debt_id,
+        name=name or f"Debt {debt_id}",
+        debt_type="credit_card",
+        balance=Decimal(balance),
+        interest_rate=Decimal(rate),
+        minimum_payment=Decimal(minimum),
+    )
+
+
+def _random_portfolio(rng, n):
+    return [
+        _debt(
+            i + 1,
+            f"{rng.randint(0, 5_000_000) / 100:.2f}",
+            f"{rng.choice([0, 3.99, 6.5, 12, 19.99, 22.99, 29.99, rng.randint(0, 3500) / 100]):.2f}",
+            f"{rng.randint(0, 50_000) / 100:.2f}",
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("seed", range(40))
+@pytest.mark.parametrize("strategy", ["avalanche", "snowball"])
+def test_vectorized_engine_matches_decimal_engine(seed, strategy):
+    rng = random.Random(seed)
+    debts = _random_portfolio(rng, rng.randint(1, 8))
+    extra = Decimal(rng.choice(["0", "50", "125.50", "1000"]))
+
+    expected = _simulate_payoff(debts, strategy, extra)
+    actual = engine.simulate_payoff(debts, strategy, extra)
+
+    assert actual.model_dump() == expected.model_dump()
+
+
+def test_half_cent_ties_follow_decimal_engine():
+    # $600.00 at 19.99% accrues exactly 9.995 — the Decimal engine's truncated
+    # monthly rate rounds that down, while 12% on $1000.50 rounds up.
+    debts = [_debt(1, "600.00", "19.99", "25.00"), _debt(2, "1000.50", "12.00", "40.00")]
+
+    expected = _simulate_payoff(debts, "avalanche", Decimal("0"))
+    actual = engine.simulate_payoff(debts, "avalanche", Decimal("0"))
+
+    assert actual.model_dump() == expected.model_dump()
+    first_month = {d.debt_id: d.monthly_balances[0].balance for d in actual.payoff_order}
+    assert first_month == {1: Decimal("584.99"), 2: Decimal("970.51")}
+
+
+def test_unpaid_and_zero_balance_debts():
+    debts = [
+        _debt(1, "0.00", "5.00", "10.00"),
+        _debt(2, "5000.00", "29.99", "20.00"),   # minimum never covers interest
+        _debt(3, "300.00", "0.00", "50.00"),
+    ]
+    expected = _simulate_payoff(debts, "snowball", Decimal("0"))
+    actual = engine.simulate_payoff(debts, "snowball", Decimal("0"))
+
+    assert actual.model_dump() == expected.model_dump()
+    assert actual.total_months is None
+
+
+def test_sub_cent_extra_payment_falls_back_to_decimal_engine():
+    debts = [_debt(1, "1000.00", "19.99", "30.00")]
+
+    with pytest.raises(engine.EngineFallback):
+        engine.simulate_payoff(debts, "avalanche", Decimal("10.005"))
+
+    plan = _run_payoff(debts, "avalanche", Decimal("10.005"))
+    assert plan.model_dump() == _simulate_payoff(debts, "avalanche", Decimal("10.005")).model_dump()
+
+
+@pytest.mark.parametrize("extra", ["1e17", "1e40"])
+def test_huge_extra_payment_falls_back_to_decimal_engine(extra):
+    debts = [_debt(1, "1000.00", "19.99", "30.00")]
+
+    with pytest.raises(engine.EngineFallback):
+        engine.simulate_payoff(debts, "avalanche", Decimal(extra))
+
+    plan = _run_payoff(debts, "avalanche", Decimal(extra))
+    assert plan.total_months == 1
+    assert summarize_payoff(debts, "snowball", Decimal(extra)).total_months == 1
+
+
+def test_batched_levels_match_single_runs():
+    rng = random.Random(7)
+    debts = _random_portfolio(rng, 6)
+    pf = engine.Portfolio.from_debts(debts)
+    levels = [0, 5_000, 25_000, 100_000]
+
+    batch = engine.simulate(pf, "avalanche", engine.np.array(levels), record_history=False)
+
+    for k, cents in enumerate(levels):
+        single = engine.simulate(pf, "avalanche", engine.np.array([cents]))
+        assert batch.months[k] == single.months[0]
+        assert (batch.paid_off_month[k] == single.paid_off_month[0]).all()
+        assert (batch.interest[k] == single.interest[0]).all()
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_summary_mode_matches_full_plan(seed):
+    rng = random.Random(seed)
+    debts = _random_portfolio(rng, rng.randint(1, 8))
+
+    for strategy in ("avalanche", "snowball"):
+        plan = _simulate_payoff(debts, strategy, Decimal("100"))
+        summary = summarize_payoff(debts, strategy, Decimal("100"))
+        assert summary == engine.PayoffSummary.from_response(plan)
+
+
+def test_debt_summary_reuses_avalanche_summary():
+    debts = [_debt(1, "2500.00", "19.99", "75.00"), _debt(2, "8000.00", "6.50", "150.00")]
+    avalanche = summarize_payoff(debts, "avalanche", Decimal("0"))
+
+    summary = summarize_debts(debts, avalanche=avalanche)
+
+    assert summary.avalanche_months == avalanche.total_months
+    assert summary.debt_free_date_avalanche == avalanche.debt_free_date
+    assert summary.snowball_months == _simulate_payoff(debts, "snowball", Decimal("0")).total_months
+
+
+def test_sweep_matches_individual_summaries(db, user):
+    from app.debts.service import get_payoff_sweep
+
+    for i, (balance, rate, minimum) in enumerate([("4200.00", "22.99", "120.00"), ("9000.00", "7.25", "180.00")]):
+        db.add(Debt(user_id=user.id, name=f"Debt {i}", debt_type="loan",
+                    balance=Decimal(balance), interest_rate=Decimal(rate), minimum_payment=Decimal(minimum)))
+    db.commit()
+    debts = db.query(Debt).order_by(Debt.id).all()
+    levels = [Decimal("0"), Decimal("25.50"), Decimal("250"), Decimal("1000")]
+
+    sweep = get_payoff_sweep(db, user.id, ["avalanche", "snowball"], levels)
+
+    for strategy, series in sweep.strategies.items():
+        for k, extra in enumerate(levels):
+            expected = _simulate_payoff(debts, strategy, extra)
+            assert series.total_months[k] == expected.total_months
+            assert series.total_interest[k] == expected.total_interest_paid
+            assert series.debt_free_date[k] == expected.debt_free_date
+
+
+def test_sweep_endpoint_rejects_out_of_range_levels(db, user):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.core.auth import get_current_user
+    from app.core.dependencies import get_db
+    from app.debts import router as debts_router
+
+    db.add(Debt(user_id=user.id, name="Visa", debt_type="credit_card", balance=Decimal("1500.00"),
+                interest_rate=Decimal("19.99"), minimum_payment=Decimal("45.00")))
+    db.commit()
+    app = FastAPI()
+    app.include_router(debts_router.router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: user
+
+    with TestClient(app) as client:
+        huge = client.get("/debts/payoff/sweep", params={"min": "0", "max": "1e17", "step": "1e16"})
+        dense = client.get("/debts/payoff/sweep", params={"min": "0", "max": "1e40", "step": "0.01"})
+        top = client.get("/debts/payoff/sweep", params={"min": "999000", "max": "1000000", "step": "500"})
+
+    assert huge.status_code == 422
+    assert dense.status_code == 422
+    assert top.status_code == 200
+    assert top.json()["strategies"]["avalanche"]["total_months"] == [1, 1, 1]
+
+
+def test_sample_months_keeps_period_ends_and_final_month():
+    from datetime import date
+
+    # Starting in November: month 1 = Dec, month 4 = Mar, month 13 = Dec
+    assert engine.sample_months(date(2025, 11, 5), 14, "quarter") == [1, 4, 7, 10, 13, 14]
+    assert engine.sample_months(date(2025, 11, 5), 14, "year") == [1, 13, 14]
+    assert engine.sample_months(date(2025, 11, 5), 13, "year") == [1, 13]
+    assert engine.sample_months(date(2025, 11, 5), 0, "year") == []
+
+
+@pytest.mark.parametrize("resolution", ["quarter", "year"])
+def test_downsampled_runs_record_only_sample_points(resolution):
+    from datetime import date
+
+    pf = engine.Portfolio.from_debts(_random_portfolio(random.Random(5), 4))
+    start = date(2025, 11, 5)
+    full = engine.simulate(pf, "avalanche", engine.np.array([15_000]), start=start)
+    sampled = engine.simulate(pf, "avalanche", engine.np.array([15_000]), start=start, resolution=resolution)
+
+    points = engine.sample_months(start, int(full.months[0]), resolution)
+    assert sampled.history_months == points
+    assert sampled.history.shape == (len(points), len(pf))
+    assert (sampled.history == full.history[[mo - 1 for mo in points]]).all()
+    assert (sampled.interest == full.interest).all()
+
+
+@pytest.mark.parametrize("resolution", ["month", "quarter", "year"])
+def test_columnar_and_downsampled_plans_match_reference(resolution):
+    from datetime import date
+
+    rng = random.Random(11)
+    debts = _random_portfolio(rng, 5)
+    reference = _simulate_payoff(debts, "snowball", Decimal("200"))
+    today = date.today()
+
+    full = engine.simulate_payoff(debts, "snowball", Decimal("200"), resolution=resolution)
+    columnar = engine.simulate_payoff(debts, "snowball", Decimal("200"), resolution=resolution, columnar=True)
+
+    assert full.model_dump() == engine.downsample_response(reference, today, resolution).model_dump()
+    assert columnar.model_dump() == engine.columnar_from_response(reference, today, resolution).model_dump()
+    assert columnar.months[-1] == len(reference.monthly_projection)
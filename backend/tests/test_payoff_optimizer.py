@@ -0,0 +1,129 @@
+import random
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.auth import get_current_user
+from app.core.dependencies import get_db
+from app.debts import engine, optimizer
+from app.debts import router as debts_router
+from app.debts import service as debt_service
+from app.debts.models import Debt
+from app.debts.service import get_payoff_plan
+
+
+def _random_portfolio(rng, n):
+    return [
+        Debt(
+            id=i + 1,
+            name=f"Debt {i + 1}",
+            debt_type="loan",
+            balance=Decimal(rng.randint(50_000, 3_000_000)) / 100,
+            interest_rate=Decimal(rng.randint(0, 3000)) / 100,
+            minimum_payment=Decimal(rng.randint(2_500, 60_000)) / 100,
+        )
+        for i in range(n)
+    ]
+
+
+def test_explicit_orders_match_strategy_runs():
+    pf = engine.Portfolio.from_debts(_random_portfolio(random.Random(3), 6))
+
+    for strategy, cents in (("avalanche", 0), ("snowball", 40_000)):
+        extra = np.array([cents])
+        expected = engine.simulate(pf, strategy, extra)
+        orders = pf.priority(strategy)[None, :]
+        zero_weights = np.zeros((1, len(pf)), dtype=np.int64)
+        for actual in (
+            engine.simulate(pf, "optimal", extra, orders=orders),
+            engine.simulate(pf, "optimal", extra, orders=orders, weights=zero_weights),
+        ):
+            assert (actual.months == expected.months).all()
+            assert (actual.paid_off_month == expected.paid_off_month).all()
+            assert (actual.interest == expected.interest).all()
+            assert (actual.history == expected.history).all()
+
+
+@pytest.mark.parametrize("seed", range(6))
+@pytest.mark.parametrize("objective", optimizer.OBJECTIVES)
+def test_optimal_never_loses_to_avalanche(seed, objective):
+    rng = random.Random(seed)
+    pf = engine.Portfolio.from_debts(_random_portfolio(rng, rng.randint(2, 8)))
+    avalanche = engine.simulate(pf, "avalanche", np.array([50_000]), record_history=False)
+
+    result = optimizer.optimize(pf, 50_000, objective)
+    replay = engine.simulate(
+        pf, "optimal", np.array([50_000]), record_history=False,
+        orders=result.policy.order[None, :],
+        weights=result.policy.weights[None, :] if result.policy.weights is not None else None,
+    )
+
+    assert result.interest == int(replay.interest.sum())
+    assert result.months == (int(replay.months[0]) if replay.all_paid_off()[0] else None)
+    if not avalanche.all_paid_off()[0]:
+        return
+    if objective == "interest":
+        assert result.interest <= int(avalanche.interest.sum())
+    else:
+        assert result.months <= int(avalanche.months[0])
+
+
+def test_twenty_debts_search_fits_budget():
+    pf = engine.Portfolio.from_debts(_random_portfolio(random.Random(0), 20))
+    avalanche = engine.simulate(pf, "avalanche", np.array([50_000]), record_history=False)
+
+    result = optimizer.optimize(pf, 50_000, "interest", budget_seconds=optimizer.SEARCH_BUDGET_SECONDS)
+
+    assert result.evaluated > 20
+    assert result.interest < int(avalanche.interest.sum())
+    assert result.policy.weights is not None   # a split beats every pure ordering here
+
+
+def test_optimal_plan_reports_savings(db, user):
+    for debt in _random_portfolio(random.Random(4), 6):
+        debt.id = None
+        debt.user_id = user.id
+        db.add(debt)
+    db.commit()
+
+    avalanche = get_payoff_plan(db, user.id, "avalanche", Decimal("500"))
+    plan = get_payoff_plan(db, user.id, "optimal", Decimal("500"))
+    columnar = get_payoff_plan(db, user.id, "optimal", Decimal("500"), resolution="year", fmt="columnar")
+
+    allocation = plan.allocation
+    assert plan.strategy == "optimal"
+    assert avalanche.allocation is None
+    assert allocation.avalanche_total_interest == avalanche.total_interest_paid
+    assert allocation.interest_saved_vs_avalanche == avalanche.total_interest_paid - plan.total_interest_paid
+    assert allocation.interest_saved_vs_avalanche >= 0
+    assert sorted(allocation.priority) == sorted(d.debt_id for d in plan.payoff_order)
+    assert sum(s.share for s in allocation.split) in (0, 1)
+    assert columnar.allocation == allocation
+    assert columnar.total_interest_paid == plan.total_interest_paid
+
+
+def test_optimal_endpoint_rejects_unrepresentable_extra_payment(db, user):
+    for debt in _random_portfolio(random.Random(9), 3):
+        debt.id = None
+        debt.user_id = user.id
+        db.add(debt)
+    db.commit()
+    app = FastAPI()
+    app.include_router(debts_router.router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: user
+
+    with TestClient(app) as client:
+        responses = {
+            extra: client.get("/debts/payoff", params={"strategy": "optimal", "extra_payment": extra})
+            for extra in ("10.005", "1e40", "100")
+        }
+    debt_service.invalidate_payoff_cache(user.id)
+
+    assert responses["10.005"].status_code == 400
+    assert "sub-cent" in responses["10.005"].json()["detail"]
+    assert responses["1e40"].status_code == 400
+    assert responses["100"].json()["allocation"] is not None
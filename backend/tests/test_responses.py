@@ -0,0 +1,107 @@
+"""
+ORJSONResponse endpoints must return the same JSON FastAPI's default path
+produced: jsonable_encoder for ORM objects, response_model serialisation for
+pydantic results.
+"""
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from app.chatbot import router as chatbot_router
+from app.chatbot.models import ChatHistory
+from app.chatbot.schemas import ChatHistoryItem
+from app.core.auth import get_current_user
+from app.core.dependencies import get_db
+from app.core.responses import dumps
+from app.debts import router as debts_router
+from app.debts import service as debt_service
+from app.debts.schemas import DebtCreate, PayoffColumnarResponse, PayoffResponse
+from app.debts.service import create_debt, get_payoff_plan
+from app.transactions import router as transactions_router
+from app.transactions.service import create_transaction, get_transactions
+
+
+@pytest.fixture
+def client(db, user):
+    app = FastAPI()
+    app.include_router(transactions_router.router)
+    app.include_router(debts_router.router)
+    app.include_router(chatbot_router.router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: user
+    with TestClient(app) as c:
+        yield c
+    debt_service.invalidate_payoff_cache(user.id)
+
+
+def _serialized(model, content):
+    """What a response_model endpoint returned: dump, re-validate, dump as JSON."""
+    adapter = TypeAdapter(model)
+    if hasattr(content, "model_dump"):
+        content = content.model_dump()
+    return adapter.dump_python(adapter.validate_python(content, from_attributes=True), mode="json")
+
+
+def _seed_transactions(db, user):
+    create_transaction(db, user.id, date(2026, 3, 14), "GROCERY STORE", Decimal("-82.15"), "Groceries")
+    create_transaction(db, user.id, date(2026, 3, 1), "PAYROLL", Decimal("2500.00"), "Income",
+                       source="chequing", transaction_type="income")
+    create_transaction(db, user.id, date(2026, 2, 27), "REFUND", Decimal("5"), "Shopping")
+
+
+def test_transaction_list_matches_jsonable_encoder(client, db, user):
+    _seed_transactions(db, user)
+
+    body = client.get("/transactions").json()
+
+    assert body == jsonable_encoder(get_transactions(db, user.id))
+    assert body[0]["amount"] == -82.15 and body[0]["date"] == "2026-03-14"
+    assert body[0]["source"] is None and body[0]["debt_payment_link"] is None
+
+
+def test_transaction_detail_matches_jsonable_encoder(client, db, user):
+    _seed_transactions(db, user)
+    txn = get_transactions(db, user.id)[1]
+
+    assert client.get(f"/transactions/{txn.id}").json() == jsonable_encoder(txn)
+
+
+def test_chat_history_matches_response_model(client, db, user):
+    db.add_all([
+        ChatHistory(user_id=user.id, message="Am I over budget?", intent="budget_check",
+                    response="No.", created_at=datetime(2026, 3, 14, 9, 30, 15, 123456)),
+        ChatHistory(user_id=user.id, message="hello", intent=None, response="Hi!", cached=True,
+                    created_at=datetime(2026, 3, 15, 8, 0)),
+    ])
+    db.commit()
+    rows = db.query(ChatHistory).order_by(ChatHistory.created_at.desc()).all()
+
+    body = client.get("/chatbot/history").json()
+
+    assert body == _serialized(list[ChatHistoryItem], rows)
+    assert body[0]["intent"] is None and body[0]["created_at"] == "2026-03-15T08:00:00"
+
+
+@pytest.mark.parametrize("fmt, model", [("full", PayoffResponse), ("columnar", PayoffColumnarResponse)])
+def test_payoff_matches_response_model(client, db, user, fmt, model):
+    create_debt(db, user.id, DebtCreate(name="Visa", debt_type="credit_card", balance=Decimal("1500.00"),
+                                        interest_rate=Decimal("19.99"), minimum_payment=Decimal("45.00")))
+    create_debt(db, user.id, DebtCreate(name="Car Loan", debt_type="loan", balance=Decimal("8000"),
+                                        interest_rate=Decimal("6.5"), minimum_payment=Decimal("250")))
+
+    body = client.get("/debts/payoff", params={"extra_payment": "100", "format": fmt}).json()
+    plan = get_payoff_plan(db, user.id, "avalanche", Decimal("100"), fmt=fmt)
+
+    assert body == _serialized(model, plan)
+    assert isinstance(body["total_interest_paid"], str)
+
+
+def test_dumps_encodes_decimals_like_jsonable_encoder():
+    content = {"whole": Decimal("5"), "cents": Decimal("-82.15"), "none": None, "day": date(2026, 1, 2)}
+
+    assert dumps(content) == b'{"whole":5,"cents":-82.15,"none":null,"day":"2026-01-02"}'
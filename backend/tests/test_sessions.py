@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from app.core import auth
+from app.sessions import service as session_service
+from app.sessions.models import Session as SessionModel
+from app.sessions.service import create_session, get_session, purge_expired_sessions
+
+
+def _expire(db, sessions, days_ago=1):
+    for session in sessions:
+        session.expires_at = datetime.utcnow() - timedelta(days=days_ago)
+    db.commit()
+
+
+def test_purge_deletes_expired_sessions_in_batches(db, user):
+    expired = [create_session(db, user.id) for _ in range(5)]
+    _expire(db, expired)
+    live = create_session(db, user.id)
+
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    purged = purge_expired_sessions(db, batch_size=2)
+
+    assert purged == 5
+    assert [s.session_id for s in db.query(SessionModel).all()] == [live.session_id]
+    assert sum(s.lstrip().upper().startswith("DELETE") for s in statements) == 3
+    assert purge_expired_sessions(db) == 0
+
+
+def test_live_sessions_are_capped_per_user(db, user, monkeypatch):
+    monkeypatch.setattr(session_service, "MAX_SESSIONS_PER_USER", 3)
+    session_ids = [create_session(db, user.id).session_id for _ in range(5)]
+
+    remaining = {s.session_id for s in db.query(SessionModel).filter_by(user_id=user.id)}
+
+    assert remaining == set(session_ids[-3:])
+    assert get_session(db, session_ids[0]) is None
+    assert get_session(db, session_ids[-1]) is not None
+
+
+def test_expired_sessions_are_evicted_first(db, user, monkeypatch):
+    monkeypatch.setattr(session_service, "MAX_SESSIONS_PER_USER", 2)
+    newer = create_session(db, user.id)
+    older = create_session(db, user.id)
+    _expire(db, [older])
+
+    latest = create_session(db, user.id)
+
+    remaining = {s.session_id for s in db.query(SessionModel).filter_by(user_id=user.id)}
+    assert remaining == {newer.session_id, latest.session_id}
+
+
+def test_evicted_sessions_leave_the_auth_cache(db, user, monkeypatch):
+    monkeypatch.setattr(session_service, "MAX_SESSIONS_PER_USER", 1)
+    first = create_session(db, user.id).session_id
+    auth._sessions.set(first, (user.id, datetime.utcnow() + timedelta(days=1)))
+
+    second = create_session(db, user.id).session_id
+    auth._sessions.set(second, (user.id, datetime.utcnow() + timedelta(days=1)))
+
+    assert auth._sessions.get(first) is None
+    assert auth._sessions.get(second) is not None
+    auth._sessions.clear()
@@ -0,0 +1,103 @@
+import csv
+import io
+import json
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.auth import get_current_user
+from app.core.dependencies import get_db
+from app.transactions import export
+from app.transactions import router as transactions_router
+from app.transactions.service import create_transaction
+from app.users.models import User
+
+ROWS = [
+    (date(2025, 12, 30), "RENT", Decimal("-1450.00"), "Housing", "chequing", "purchase"),
+    (date(2026, 1, 2), "GROCERY STORE", Decimal("-82.15"), "Groceries", None, None),
+    (date(2026, 1, 15), "PAYROLL, ACME \"CORP\"", Decimal("2500.00"), "Income", "chequing", "income"),
+    (date(2026, 2, 1), "COFFEE", Decimal("-4.50"), "Dining", "credit_card", "purchase"),
+    (date(2026, 2, 3), "REFUND", Decimal("5"), "Shopping", "credit_card", "refund"),
+]
+
+
+@pytest.fixture
+def client(db, user, monkeypatch):
+    monkeypatch.setattr(export, "EXPORT_BATCH_SIZE", 2)   # several partitions per export
+    for day, description, amount, category, source, txn_type in ROWS:
+        create_transaction(db, user.id, day, description, amount, category,
+                           source=source, transaction_type=txn_type)
+    other = User(email="other@example.com")
+    db.add(other)
+    db.commit()
+    create_transaction(db, other.id, date(2026, 1, 5), "NOT MINE", Decimal("-9.99"), "Groceries")
+
+    app = FastAPI()
+    app.include_router(transactions_router.router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: user
+    with TestClient(app) as c:
+        yield c
+
+
+def test_csv_export(client):
+    response = client.get("/transactions/export", params={"format": "csv"})
+
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == 'attachment; filename="transactions.csv"'
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == ["id", "date", "description", "amount", "category",
+                       "category_source", "source", "transaction_type"]
+    assert len(rows) == 1 + len(ROWS)
+    assert [r[1:4] for r in rows[1:]] == [
+        ["2025-12-30", "RENT", "-1450.00"],
+        ["2026-01-02", "GROCERY STORE", "-82.15"],
+        ["2026-01-15", "PAYROLL, ACME \"CORP\"", "2500.00"],
+        ["2026-02-01", "COFFEE", "-4.50"],
+        ["2026-02-03", "REFUND", "5.00"],
+    ]
+    assert rows[2][6:] == ["", ""]
+
+
+def test_ndjson_export_with_filters(client):
+    response = client.get("/transactions/export", params={
+        "format": "ndjson", "start_date": "2026-01-01", "end_date": "2026-02-01",
+    })
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    records = [json.loads(line) for line in lines]
+    assert [r["description"] for r in records] == ["GROCERY STORE", "PAYROLL, ACME \"CORP\"", "COFFEE"]
+    assert records[0]["amount"] == -82.15 and records[0]["date"] == "2026-01-02"
+    assert records[0]["source"] is None and records[0]["transaction_type"] is None
+
+    dining = client.get("/transactions/export", params={"format": "ndjson", "category": "Dining"})
+    assert [json.loads(line)["description"] for line in dining.text.splitlines()] == ["COFFEE"]
+
+
+def test_parquet_export(client):
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    response = client.get("/transactions/export", params={"format": "parquet"})
+
+    assert response.headers["content-type"] == "application/vnd.apache.parquet"
+    parquet = pq.ParquetFile(io.BytesIO(response.content))
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read().to_pydict()
+    assert table["description"] == [r[1] for r in ROWS]
+    assert table["date"] == [r[0] for r in ROWS]
+    assert table["amount"] == [r[2].quantize(Decimal("0.01")) for r in ROWS]
+    assert table["source"][1] is None
+
+
+def test_empty_export_still_has_a_header(client, db, user):
+    other = db.query(User).filter_by(email="other@example.com").one()
+    client.app.dependency_overrides[get_current_user] = lambda: User(id=other.id + 1, email="nobody@example.com")
+
+    assert client.get("/transactions/export", params={"format": "csv"}).text.splitlines() == [
+        "id,date,description,amount,category,category_source,source,transaction_type",
+    ]
+    assert client.get("/transactions/export", params={"format": "ndjson"}).text == ""
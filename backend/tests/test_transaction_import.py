@@ -0,0 +1,194 @@
+import io
+import sys
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+from app.categorization.models import CategoryOverride
+from app.categorization.service import categorize_batch, categorize_with_overrides
+from app.core.auth import get_current_user
+from app.core.dependencies import get_db
+from app.ml import categorizer
+from app.transactions import importer
+from app.transactions import router as transactions_router
+from app.transactions.models import Transaction
+from app.transactions.parser.parse_csv import iter_csv_records
+from app.transactions.parser.parse_ofx import detect_ofx_source, iter_ofx_records
+from app.transactions.service import create_transaction
+
+OFX_SGML = """OFXHEADER:100
+DATA:OFXSGML
+
+<OFX><CREDITCARDMSGSRSV1><CCSTMTTRNRS><CCSTMTRS><BANKTRANLIST>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20260302120000[-5:EST]<TRNAMT>-54.20<NAME>COSTCO WHOLESALE #512</STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20260305<TRNAMT>1,000.00<NAME>PAYMENT - THANK YOU</STMTTRN>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20260306<TRNAMT>-12.00<MEMO>A&amp;W RESTAURANT</STMTTRN>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20260307<TRNAMT>abc<NAME>BROKEN</STMTTRN>
+</BANKTRANLIST></CCSTMTRS></CCSTMTTRNRS></CREDITCARDMSGSRSV1></OFX>
+"""
+
+OFX_XML = """<?xml version="1.0"?>
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN><TRNTYPE>DEBIT</TRNTYPE><DTPOSTED>20260110</DTPOSTED><TRNAMT>-9.99</TRNAMT><NAME>NETFLIX.COM</NAME></STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+
+@pytest.fixture
+def client(db, user):
+    app = FastAPI()
+    app.include_router(transactions_router.router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: user
+    with TestClient(app) as c:
+        yield c
+
+
+def _import(client, name, body, statement_type="chequing"):
+    return client.post(
+        "/transactions/import",
+        files={"file": (name, body.encode(), "application/octet-stream")},
+        data={"statement_type": statement_type},
+    )
+
+
+# ── Parsers ───────────────────────────────────────────────────────────────────
+
+def test_csv_with_amount_header():
+    lines = io.StringIO(
+        "Date,Description,Amount\n"
+        "2026-03-02,GROCERY STORE,\"-1,082.15\"\n"
+        "03/05/2026,REFUND,(45.00)\n"
+        "\n"
+        "not a date,COFFEE,-4.50\n"
+        "2026-03-06,,-1.00\n"
+    )
+
+    assert list(iter_csv_records(lines)) == [
+        {"date": date(2026, 3, 2), "description": "GROCERY STORE", "amount": Decimal("-1082.15")},
+        {"date": date(2026, 3, 5), "description": "REFUND", "amount": Decimal("-45.00")},
+        None,
+        None,
+    ]
+
+
+def test_csv_debit_credit_and_headerless_layouts():
+    with_header = io.StringIO("Posted Date,Payee,Withdrawal,Deposit\n2026-03-02,RENT,1450.00,\n2026-03-03,PAYROLL,,2500.00\n")
+    headerless = io.StringIO("03/02/2026,COFFEE,4.50,,995.50\n03/03/2026,E-TRANSFER,,20.00,1015.50\n")
+
+    assert [(r["description"], r["amount"]) for r in iter_csv_records(with_header)] == [
+        ("RENT", Decimal("-1450.00")), ("PAYROLL", Decimal("2500.00")),
+    ]
+    assert [(r["date"], r["amount"]) for r in iter_csv_records(headerless)] == [
+        (date(2026, 3, 2), Decimal("-4.50")), (date(2026, 3, 3), Decimal("20.00")),
+    ]
+
+
+def test_csv_without_usable_header_is_rejected():
+    with pytest.raises(ValueError):
+        list(iter_csv_records(io.StringIO("Foo,Bar\n1,2\n")))
+
+
+def test_ofx_sgml_and_xml():
+    assert detect_ofx_source(OFX_SGML) == "credit_card"
+    assert detect_ofx_source(OFX_XML) == "chequing"
+    assert list(iter_ofx_records(OFX_SGML)) == [
+        {"date": date(2026, 3, 2), "description": "COSTCO WHOLESALE #512", "amount": Decimal("-54.20")},
+        {"date": date(2026, 3, 5), "description": "PAYMENT - THANK YOU", "amount": Decimal("1000.00")},
+        {"date": date(2026, 3, 6), "description": "A&W RESTAURANT", "amount": Decimal("-12.00")},
+        None,
+    ]
+    assert list(iter_ofx_records(OFX_XML)) == [
+        {"date": date(2026, 1, 10), "description": "NETFLIX.COM", "amount": Decimal("-9.99")},
+    ]
+
+
+# ── Import endpoint ───────────────────────────────────────────────────────────
+
+def test_csv_import_counts_and_reimport_skips_duplicates(client, db, user):
+    first = _import(client, "march.csv",
+                    "Date,Description,Amount\n2026-03-02,GROCERY STORE,-82.15\n"
+                    "2026-03-03,PAYROLL,2500.00\nbad,ROW,1\n2026-03-02,GROCERY STORE,-82.15\n")
+    overlapping = _import(client, "march-april.csv",
+                          "Date,Description,Amount\n2026-03-03,PAYROLL,2500.00\n2026-04-01,RENT,-1450.00\n")
+    repeat = _import(client, "march.csv",
+                     "Date,Description,Amount\n2026-03-02,GROCERY STORE,-82.15\n"
+                     "2026-03-03,PAYROLL,2500.00\nbad,ROW,1\n2026-03-02,GROCERY STORE,-82.15\n")
+
+    assert first.json() | {"message": None} == {
+        "message": None, "format": "csv", "rows_read": 4, "rows_rejected": 1,
+        "transactions_created": 2, "transactions_skipped": 1,
+    }
+    assert (overlapping.json()["transactions_created"], overlapping.json()["transactions_skipped"]) == (1, 1)
+    assert repeat.status_code == 409
+    rows = {t.description: t for t in db.query(Transaction).filter_by(user_id=user.id)}
+    assert sorted(rows) == ["GROCERY STORE", "PAYROLL", "RENT"]
+    assert (rows["PAYROLL"].source, rows["PAYROLL"].transaction_type) == ("chequing", "income")
+    assert rows["GROCERY STORE"].amount == Decimal("-82.15")
+
+
+def test_ofx_import_uses_the_declared_account_type(client, db, user):
+    response = _import(client, "visa.qfx", OFX_SGML, statement_type="chequing")
+
+    assert response.json()["transactions_created"] == 3
+    assert response.json()["rows_rejected"] == 1
+    types = {t.description: (t.source, t.transaction_type) for t in db.query(Transaction)}
+    assert types["COSTCO WHOLESALE #512"] == ("credit_card", "purchase")
+    assert types["PAYMENT - THANK YOU"] == ("credit_card", "cc_payment")
+
+
+def test_import_rejects_unsupported_files(client):
+    assert _import(client, "statement.xlsx", "x").status_code == 400
+    assert _import(client, "s.csv", "x", statement_type="savings").status_code == 400
+
+
+def test_merge_skips_only_duplicate_rows(db, user):
+    create_transaction(db, user.id, date(2026, 3, 2), "GROCERY STORE", Decimal("-82.15"), "Groceries")
+    importer._create_staging(db, is_postgres=False)
+    importer._insert_chunk(db, [
+        (user.id, date(2026, 3, 2), "GROCERY STORE", Decimal("-82.15"), "Groceries", "rule", "chequing", "purchase"),
+    ])
+    assert importer._merge_staging(db) == 0
+
+    db.execute(text(f"DELETE FROM {importer._STAGING_TABLE}"))
+    importer._insert_chunk(db, [
+        (user.id, date(2026, 3, 3), "NO CATEGORY", Decimal("-1.00"), None, "rule", "chequing", "purchase"),
+    ])
+    with pytest.raises(IntegrityError):   # NOT NULL violations are not silently dropped
+        importer._merge_staging(db)
+    db.rollback()
+
+
+# ── Batch categorization ──────────────────────────────────────────────────────
+
+def test_categorize_batch_matches_single_row_path(db, user, tmp_path, monkeypatch):
+    monkeypatch.setattr(categorizer, "MODELS_DIR", str(tmp_path))
+    monkeypatch.setitem(sys.modules, "lightgbm", None)   # logistic regression is confident on tiny data
+    training = {"Groceries": "GROCERY STORE", "Dining": "COFFEE SHOP", "Transport": "UBER TRIP"}
+    for category, description in training.items():
+        for i in range(12):
+            create_transaction(db, user.id, date(2026, 1, 1 + i), f"{description} {i}", Decimal("-5.00"),
+                               category, category_source="rule")
+    assert categorizer.train_model(db, user.id)["success"]
+
+    db.add_all([
+        CategoryOverride(user_id=user.id, description_pattern="costco", category="Groceries"),
+        CategoryOverride(user_id=user.id, description_pattern="uber", category="", transaction_type="transfer"),
+    ])
+    db.commit()
+    descriptions = [
+        "COSTCO WHOLESALE #512", "UBER TRIP 4", "GROCERY STORE 9", "COFFEE SHOP 2",
+        "NETFLIX.COM", "COSTCO WHOLESALE #512", "SOMETHING ELSE ENTIRELY",
+    ]
+
+    batch = categorize_batch(db, user.id, descriptions)
+
+    assert batch == [categorize_with_overrides(db, user.id, d) for d in descriptions]
+    assert batch[0] == ("Groceries", "manual", 1.0)
+    assert batch[1][1] != "manual"   # type-only override does not set a category
+    assert batch[2][:2] == ("Groceries", "ml")
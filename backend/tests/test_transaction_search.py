@@ -0,0 +1,148 @@
+import os
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+
+from app.core.auth import get_current_user
+from app.core.dependencies import get_db
+from app.database.base import Base
+from app.transactions import router as transactions_router
+from app.transactions.models import Transaction
+from app.transactions.search import _rank_and_match, search_transactions
+from app.users.models import User
+
+
+def _add(db, user_id, description, day=1):
+    db.add(Transaction(
+        user_id=user_id,
+        date=date(2025, 1, day),
+        description=description,
+        amount=Decimal("-10.00"),
+        category="Uncategorized",
+        category_source="rule",
+        source="chequing",
+        transaction_type="purchase",
+    ))
+
+
+def test_search_matches_substring_case_insensitively(db, user):
+    _add(db, user.id, "COSTCO WHOLESALE #512", 1)
+    _add(db, user.id, "Costco Gas", 2)
+    _add(db, user.id, "TIM HORTONS", 3)
+    db.commit()
+
+    page = search_transactions(db, user.id, "costco")
+
+    assert sorted(hit["description"] for hit in page["results"]) == ["COSTCO WHOLESALE #512", "Costco Gas"]
+    assert page["next_cursor"] is None
+
+
+def test_search_escapes_like_wildcards(db, user):
+    _add(db, user.id, "100% JUICE BAR", 1)
+    _add(db, user.id, "1000 ISLANDS DELI", 2)
+    db.commit()
+
+    page = search_transactions(db, user.id, "100%")
+
+    assert [hit["description"] for hit in page["results"]] == ["100% JUICE BAR"]
+
+
+def test_search_is_scoped_to_user(db, user):
+    other = User(email="other@example.com")
+    db.add(other)
+    db.commit()
+    _add(db, user.id, "NETFLIX.COM", 1)
+    _add(db, other.id, "NETFLIX.COM", 1)
+    db.commit()
+
+    page = search_transactions(db, user.id, "netflix")
+
+    assert [hit["user_id"] for hit in page["results"]] == [user.id]
+
+
+def test_search_keyset_pagination_visits_every_match_once(db, user):
+    for day in range(1, 26):
+        _add(db, user.id, f"UBER TRIP {day}", day)
+    db.commit()
+
+    seen, cursor = [], None
+    while True:
+        page = search_transactions(db, user.id, "uber", limit=10, cursor=cursor)
+        seen.extend(hit["id"] for hit in page["results"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == 25
+    assert len(set(seen)) == 25
+    assert seen == sorted(seen, reverse=True)
+
+
+def test_blank_query_is_rejected(db, user):
+    _add(db, user.id, "COSTCO WHOLESALE #512")
+    db.commit()
+    app = FastAPI()
+    app.include_router(transactions_router.router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: user
+
+    with TestClient(app) as client:
+        blank = client.get("/transactions/search", params={"q": "   "})
+        padded = client.get("/transactions/search", params={"q": "  costco "})
+
+    assert blank.status_code == 422
+    assert [r["description"] for r in padded.json()["results"]] == ["COSTCO WHOLESALE #512"]
+
+
+def test_postgres_fuzzy_match_compares_words_not_whole_descriptions():
+    rank, match = _rank_and_match("cotsco", is_postgres=True)
+    sql = str(select(rank.label("rank")).where(match).compile(dialect=postgresql.dialect(paramstyle="named")))
+
+    assert "word_similarity(" in sql
+    assert "transactions.description %> " in sql
+    assert "similarity(transactions.description" not in sql
+
+
+# ── PostgreSQL (pg_trgm) — runs only against a scratch database ──────────────
+
+@pytest.fixture
+def pg_db():
+    url = os.getenv("TEST_POSTGRES_URL")   # tables are created and dropped here
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL not set")
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+
+
+def test_postgres_finds_misspelt_merchant_in_long_description(pg_db):
+    owner = User(email="fuzzy@example.com")
+    pg_db.add(owner)
+    pg_db.commit()
+    _add(pg_db, owner.id, "COSTCO WHOLESALE #512 TORONTO ON", 1)
+    _add(pg_db, owner.id, "POS PURCHASE COSTCO GAS W1234 MISSISSAUGA", 2)
+    _add(pg_db, owner.id, "TIM HORTONS #2231 TORONTO ON", 3)
+    pg_db.commit()
+
+    fuzzy = search_transactions(pg_db, owner.id, "cotsco")["results"]
+    literal = search_transactions(pg_db, owner.id, "costco")["results"]
+
+    assert sorted(hit["description"] for hit in fuzzy) == [
+        "COSTCO WHOLESALE #512 TORONTO ON", "POS PURCHASE COSTCO GAS W1234 MISSISSAUGA",
+    ]
+    assert all(0 < hit["rank"] < 1000 for hit in fuzzy)
+    assert all(hit["rank"] >= 1000 for hit in literal)